@@ -0,0 +1,461 @@
+import csv
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Maze import *
+from Search import instrument_search
+
+
+class GraphLoader:
+    """ Class that loads input files into graphs, following the benchmark options. Instances are sent
+    to the benchmark worker processes, so they only hold picklable options.
+    """
+
+    def __init__(self, graph_class=MazeGraph, use_mmap=False, cache_path=None):
+        """ Class constructor
+
+        Args:
+            graph_class (type, optional): MazeGraph or CompactMazeGraph. Defaults to MazeGraph.
+            use_mmap (bool, optional): Read inputs with MazeReader.map_file. Defaults to False.
+            cache_path (string, optional): Folder of the graph files cache (see 'load_cached_graph').
+                Defaults to None, for no cache.
+        """
+        self.graph_class = graph_class
+        self.use_mmap = use_mmap
+        self.cache_path = cache_path
+
+    def load(self, input_file):
+        """ Loads the graph of an input file
+
+        Args:
+            input_file (string): The path to the input file
+
+        Returns:
+            MazeGraph: The input graph
+        """
+        if self.cache_path:
+            return self.load_cached_graph(input_file)
+        reader = MazeReader()
+        maze_as_lines = reader.map_file(input_file) if self.use_mmap else reader.read_from_file(input_file)
+        return self.graph_class(maze_as_lines)
+
+    def load_timed(self, input_file, rounds=1):
+        """ Loads the graph of an input file several times, timing the parse and graph-build phases apart.
+        Graphs loaded from the cache only have a build phase.
+
+        Args:
+            input_file (string): The path to the input file
+            rounds (int, optional): Number of loads. Defaults to 1.
+
+        Returns:
+            tuple(MazeGraph, dict[str, list[int]]): The last graph loaded and the nanoseconds taken by each
+                phase in each round
+        """
+        samples = {"parse": [], "build": []}
+        reader = MazeReader()
+        for i in range(rounds):
+            if self.cache_path:
+                start = time.perf_counter_ns()
+                maze_as_graph = self.load_cached_graph(input_file)
+                samples["build"].append(time.perf_counter_ns() - start)
+                continue
+            start = time.perf_counter_ns()
+            maze_as_lines = reader.map_file(input_file) if self.use_mmap else reader.read_from_file(input_file)
+            parsed = time.perf_counter_ns()
+            maze_as_graph = self.graph_class(maze_as_lines)
+            built = time.perf_counter_ns()
+            samples["parse"].append(parsed - start)
+            samples["build"].append(built - parsed)
+        return (maze_as_graph, samples)
+
+    def load_cached_graph(self, input_file):
+        """ Loads the graph of an input file from the cache folder. The graph is built and saved first
+        if its cache file is missing, older than the input file or invalid.
+
+        Args:
+            input_file (string): The path to the input file
+
+        Returns:
+            CompactMazeGraph: The input graph
+        """
+        cache_file = os.path.join(self.cache_path, os.path.basename(input_file) + '.graph')
+        if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= os.path.getmtime(input_file):
+            try:
+                return CompactMazeGraph.load(cache_file)
+            except ValueError as e:
+                print("Rebuilding graph cache {}: {}".format(cache_file, e))
+
+        # Workers may build the same file at once: each one writes its own copy and renames it in place
+        os.makedirs(self.cache_path, exist_ok=True)
+        maze_as_graph = CompactMazeGraph(MazeReader().map_file(input_file))
+        maze_as_graph.get_heuristic_values()
+        temporary_file = "{}.{}.tmp".format(cache_file, os.getpid())
+        maze_as_graph.save(temporary_file, include_heuristics=True)
+        os.replace(temporary_file, cache_file)
+        return maze_as_graph
+
+
+class BenchmarkSettings:
+    """ Class holding how each (algorithm, input file) pair is measured. Unless a fixed number of
+    repetitions is given, searches are repeated until the relative standard error of the mean search time
+    drops to 'target_error', or until 'max_time' seconds were spent, within the repetition limits.
+    """
+
+    def __init__(self, warmup=3, repetitions=None, min_repetitions=10, max_repetitions=1000, max_time=1.0,
+                 target_error=0.01, load_rounds=3, statistics=False, trace_memory=False):
+        """ Class constructor
+
+        Args:
+            warmup (int, optional): Untimed searches run before measuring. Defaults to 3.
+            repetitions (int, optional): Fixed number of timed searches. Defaults to None, for adaptive.
+            min_repetitions (int, optional): Least number of adaptive timed searches. Defaults to 10.
+            max_repetitions (int, optional): Largest number of adaptive timed searches. Defaults to 1000.
+            max_time (float, optional): Seconds after which adaptive measuring stops. Defaults to 1.0.
+            target_error (float, optional): Relative standard error that stops adaptive measuring. Defaults to 0.01.
+            load_rounds (int, optional): Number of timed parse and graph-build rounds per input. Defaults to 3.
+            statistics (bool, optional): Run one extra, untimed, instrumented search per pair and report its
+                counters (see Search.SearchStatistics). Defaults to False.
+            trace_memory (bool, optional): Also record the memory peaks of that search with tracemalloc.
+                Defaults to False.
+        """
+        self.warmup = warmup
+        self.repetitions = repetitions
+        self.min_repetitions = min_repetitions
+        self.max_repetitions = max_repetitions
+        self.max_time = max_time
+        self.target_error = target_error
+        self.load_rounds = load_rounds
+        self.statistics = statistics
+        self.trace_memory = trace_memory
+
+
+def summarize_samples(samples):
+    """ Summarizes timing samples
+
+    Args:
+        samples (list[int]): Measured times in nanoseconds
+
+    Returns:
+        dict: Number of samples and their min, median, 95th and 99th percentiles, mean and standard
+            deviation, in nanoseconds
+    """
+    if not samples:
+        return {"count": 0}
+    if len(samples) == 1:
+        (p95, p99) = (samples[0], samples[0])
+    else:
+        percentiles = statistics.quantiles(samples, n=100, method='inclusive')
+        (p95, p99) = (percentiles[94], percentiles[98])
+    return {"count": len(samples), "min": min(samples), "median": statistics.median(samples), "p95": p95, "p99": p99,
+            "mean": statistics.fmean(samples), "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0}
+
+
+def _relative_standard_error(samples):
+    """ Returns the standard error of the samples mean relative to the mean
+    """
+    mean = statistics.fmean(samples)
+    if mean == 0:
+        return 0.0
+    return statistics.stdev(samples) / math.sqrt(len(samples)) / mean
+
+
+# State of each benchmark worker process
+_worker_graph_loader = None
+_worker_graphs = {} # Input file -> (graph, load phases samples), so each worker loads each graph once
+
+
+def _initialize_worker(graph_loader, free_cores):
+    """ Initializes a benchmark worker process, pinning it to a core of its own when the platform allows it
+
+    Args:
+        graph_loader (GraphLoader): Loader of the input graphs
+        free_cores (multiprocessing.Queue): Cores not taken by other workers yet
+    """
+    global _worker_graph_loader
+    _worker_graph_loader = graph_loader
+    core = free_cores.get()
+    if core is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {core})
+
+
+def _run_benchmark_task(alg_type, algorithm, input_file, settings):
+    """ Measures one algorithm over one input, inside a worker process. Searcher construction and search
+    are timed apart on every repetition.
+
+    Args:
+        alg_type (str): Algorithm name
+        algorithm (type): Searcher class
+        input_file (string): The path to the input file
+        settings (BenchmarkSettings): How to measure
+
+    Returns:
+        dict: Algorithm name, input file, board dimension, number of timed searches, statistics of each
+            phase (see 'summarize_samples'), average construction plus search time in seconds, the
+            path found with its length and, if asked by the settings, the search statistics
+    """
+    if input_file not in _worker_graphs:
+        _worker_graphs[input_file] = _worker_graph_loader.load_timed(input_file, settings.load_rounds)
+    (maze_as_graph, load_samples) = _worker_graphs[input_file]
+
+    for i in range(settings.warmup):
+        algorithm(maze_as_graph).do_search()
+
+    construct_samples = []
+    search_samples = []
+    repetitions = settings.repetitions or settings.max_repetitions
+    deadline = time.perf_counter_ns() + int(settings.max_time * 1e9)
+    path = None
+    for i in range(repetitions):
+        start = time.perf_counter_ns()
+        searcher = algorithm(maze_as_graph)
+        constructed = time.perf_counter_ns()
+        path = searcher.do_search()
+        searched = time.perf_counter_ns()
+        del searcher
+        construct_samples.append(constructed - start)
+        search_samples.append(searched - constructed)
+
+        if settings.repetitions is None and len(search_samples) >= settings.min_repetitions:
+            if searched >= deadline or _relative_standard_error(search_samples) <= settings.target_error:
+                break
+
+    phases = {"parse": summarize_samples(load_samples["parse"]), "build": summarize_samples(load_samples["build"]),
+              "construct": summarize_samples(construct_samples), "search": summarize_samples(search_samples)}
+    avg_time = (sum(construct_samples) + sum(search_samples)) / len(search_samples) / 1e9
+    result = {"alg": alg_type, "input": input_file, "dim": (maze_as_graph.number_of_rows, maze_as_graph.number_of_columns),
+              "repetitions": len(search_samples), "phases": phases, "avg_time": avg_time,
+              "path_length": len(path) if path is not None else None, "path": path}
+
+    # Counting (and tracing memory) slows the search down, so it runs apart from the timed searches
+    if settings.statistics or settings.trace_memory:
+        (path, search_statistics) = instrument_search(algorithm, maze_as_graph, settings.trace_memory)
+        result["statistics"] = search_statistics.as_dict()
+    return result
+
+
+class BenchmarkRunner:
+    """ Class that times every (algorithm, input file) pair, spreading the pairs over a pool of worker
+    processes. Each worker is pinned to a core of its own, so pairs timed at the same time do not share
+    a core, and keeps the graphs it loaded for the next pairs.
+    """
+
+    def __init__(self, algorithms, input_files, graph_loader, settings=None, workers=None):
+        """ Class constructor
+
+        Args:
+            algorithms (dict[str, type]): Searcher classes by name
+            input_files (list[string]): Paths to the input files
+            graph_loader (GraphLoader): Loader of the input graphs
+            settings (BenchmarkSettings, optional): How to measure each pair. Defaults to BenchmarkSettings().
+            workers (int, optional): Number of worker processes, at most one per available core.
+                Defaults to every available core.
+        """
+        self.algorithms = algorithms
+        self.input_files = input_files
+        self.graph_loader = graph_loader
+        self.settings = settings if settings is not None else BenchmarkSettings()
+
+        if hasattr(os, 'sched_getaffinity'):
+            self.cores = sorted(os.sched_getaffinity(0))
+        else:
+            self.cores = [None] * (os.cpu_count() or 1)
+        if workers is None or workers > len(self.cores):
+            workers = len(self.cores)
+        number_of_tasks = len(algorithms) * len(input_files)
+        self.workers = max(1, min(workers, number_of_tasks))
+
+    def run(self):
+        """ Runs the benchmark
+
+        Returns:
+            list[dict]: One result per (algorithm, input file) pair, as returned by '_run_benchmark_task',
+                in algorithm and input file order
+        """
+        tasks = [(alg_type, algorithm, input_file) for alg_type, algorithm in self.algorithms.items()
+                 for input_file in self.input_files]
+        # Larger inputs are submitted first, so they do not end up alone at the end of the run
+        submission_order = sorted(range(len(tasks)), key=lambda index: -os.path.getsize(tasks[index][2]))
+
+        free_cores = multiprocessing.Queue()
+        for core in self.cores[:self.workers]:
+            free_cores.put(core)
+
+        results = [None] * len(tasks)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_initialize_worker,
+                                 initargs=(self.graph_loader, free_cores)) as executor:
+            futures = {index: executor.submit(_run_benchmark_task, *tasks[index], self.settings)
+                       for index in submission_order}
+            for index, future in futures.items():
+                results[index] = future.result()
+        return results
+
+
+# Phases whose median is compared against a baseline. Parse and build are shared by every algorithm of an input
+COMPARED_PHASES = ("parse", "build", "construct", "search")
+
+
+def write_results(results, filename):
+    """ Writes benchmark results to a JSON file, or to a CSV file with one line per phase if the
+    filename ends with '.csv', the search statistics repeated on each line. Paths are left out.
+
+    Args:
+        results (list[dict]): Results returned by BenchmarkRunner.run
+        filename (string): The path to the output file
+    """
+    if filename.endswith('.csv'):
+        statistics_names = ["count", "min", "median", "p95", "p99", "mean", "stddev"]
+        counter_names = []
+        for result in results:
+            for name in result.get("statistics", {}):
+                if name not in counter_names and name != "path_length":
+                    counter_names.append(name)
+        with open(filename, 'w', newline='') as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow(["alg", "input", "rows", "columns", "repetitions", "path_length", "phase"] +
+                            [name + ("" if name == "count" else "_ns") for name in statistics_names] + counter_names)
+            for result in results:
+                counters = result.get("statistics", {})
+                for phase, phase_statistics in result["phases"].items():
+                    writer.writerow([result["alg"], result["input"], result["dim"][0], result["dim"][1],
+                                     result["repetitions"], result["path_length"], phase] +
+                                    [phase_statistics.get(name, "") for name in statistics_names] +
+                                    ["" if counters.get(name) is None else counters[name] for name in counter_names])
+        return
+
+    with open(filename, 'w') as output_file:
+        json.dump([{key: value for key, value in result.items() if key != "path"} for result in results],
+                  output_file, indent=2)
+
+
+def read_results(filename):
+    """ Reads benchmark results written by 'write_results' in JSON format
+
+    Args:
+        filename (string): The path to the results file
+
+    Returns:
+        list[dict]: The results
+    """
+    with open(filename) as input_file:
+        return json.load(input_file)
+
+
+def compare_results(results, baseline_results, threshold=0.1):
+    """ Compares the median time of each phase of each (algorithm, input file) pair against a baseline
+
+    Args:
+        results (list[dict]): Current results
+        baseline_results (list[dict]): Baseline results
+        threshold (float, optional): Relative slowdown of the median reported as a regression. Defaults to 0.1.
+
+    Returns:
+        list[dict]: One entry per phase found in both results, with the algorithm, input file, phase,
+            baseline and current medians in nanoseconds, their ratio and whether it is a regression
+    """
+    baseline_by_pair = {(result["alg"], result["input"]): result for result in baseline_results}
+    comparison = []
+    for result in results:
+        baseline = baseline_by_pair.get((result["alg"], result["input"]))
+        if baseline is None:
+            continue
+        for phase in COMPARED_PHASES:
+            current_median = result["phases"].get(phase, {}).get("median")
+            baseline_median = baseline["phases"].get(phase, {}).get("median")
+            if not current_median or not baseline_median:
+                continue
+            ratio = current_median / baseline_median
+            comparison.append({"alg": result["alg"], "input": result["input"], "phase": phase,
+                               "baseline_median": baseline_median, "median": current_median, "ratio": ratio,
+                               "regression": ratio > 1 + threshold})
+    return comparison
+
+
+def summarize_sweep(results):
+    """ Groups the results of a size sweep by algorithm
+
+    Args:
+        results (list[dict]): Results returned by BenchmarkRunner.run, with memory statistics for the
+            search memory peaks
+
+    Returns:
+        dict[str, list[tuple(int, float, int)]]: (number of cells, median search time in nanoseconds,
+            search memory peak in bytes or None) points of each algorithm, by number of cells
+    """
+    points = {}
+    for result in results:
+        number_of_cells = result["dim"][0] * result["dim"][1]
+        memory_peak = result.get("statistics", {}).get("search_memory_peak")
+        points.setdefault(result["alg"], []).append((number_of_cells, result["phases"]["search"]["median"], memory_peak))
+    for alg_points in points.values():
+        alg_points.sort()
+    return points
+
+
+# Colors of the algorithms lines in the sweep plot
+PLOT_COLORS = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b", "#e377c2", "#7f7f7f")
+
+
+def write_sweep_plot(results, filename):
+    """ Writes an SVG plot of the search time and memory peak versus the number of cells of a size sweep,
+    both axes in log scale, one line per algorithm. The plot is drawn by hand, so no plotting library is
+    needed.
+
+    Args:
+        results (list[dict]): Results returned by BenchmarkRunner.run
+        filename (string): The path to the output file
+    """
+    points = summarize_sweep(results)
+    (panel_width, panel_height, margin) = (420, 300, 70)
+    elements = []
+
+    def log_range(values):
+        (low, high) = (math.log10(min(values)), math.log10(max(values)))
+        return (low, high) if high > low else (low - 0.5, high + 0.5)
+
+    for (panel, (title, index, scale)) in enumerate((("search time (ms)", 1, 1e-6), ("search memory peak (KiB)", 2, 1 / 1024))):
+        left = margin + panel * (panel_width + margin)
+        top = margin // 2
+        # Points without a value (or a zero one, out of a log scale) are left out
+        series = {alg: [(point[0], point[index] * scale) for point in alg_points if point[index]]
+                  for (alg, alg_points) in points.items()}
+        all_points = [point for alg_series in series.values() for point in alg_series]
+        elements.append('<rect x="{}" y="{}" width="{}" height="{}" fill="none" stroke="black"/>'.format(
+            left, top, panel_width, panel_height))
+        elements.append('<text x="{}" y="{}" text-anchor="middle">{}</text>'.format(left + panel_width // 2, top - 8, title))
+        elements.append('<text x="{}" y="{}" text-anchor="middle">cells</text>'.format(
+            left + panel_width // 2, top + panel_height + 40))
+        if not all_points:
+            continue
+        (x_low, x_high) = log_range([x for (x, y) in all_points])
+        (y_low, y_high) = log_range([y for (x, y) in all_points])
+
+        def to_svg(x, y):
+            return (left + (math.log10(x) - x_low) / (x_high - x_low) * panel_width,
+                    top + panel_height - (math.log10(y) - y_low) / (y_high - y_low) * panel_height)
+
+        # Ticks at the powers of ten inside each axis range
+        for exponent in range(math.ceil(x_low), math.floor(x_high) + 1):
+            (x, y) = to_svg(10 ** exponent, 10 ** y_low)
+            elements.append('<text x="{:.1f}" y="{:.1f}" text-anchor="middle" font-size="11">1e{}</text>'.format(x, y + 16, exponent))
+        for exponent in range(math.ceil(y_low), math.floor(y_high) + 1):
+            (x, y) = to_svg(10 ** x_low, 10 ** exponent)
+            elements.append('<text x="{:.1f}" y="{:.1f}" text-anchor="end" font-size="11">1e{}</text>'.format(x - 4, y + 4, exponent))
+
+        for (alg_index, (alg, alg_series)) in enumerate(series.items()):
+            color = PLOT_COLORS[alg_index % len(PLOT_COLORS)]
+            coordinates = " ".join("{:.1f},{:.1f}".format(*to_svg(x, y)) for (x, y) in alg_series)
+            elements.append('<polyline points="{}" fill="none" stroke="{}" stroke-width="2"/>'.format(coordinates, color))
+            if panel == 0:
+                elements.append('<text x="{}" y="{}" fill="{}" font-size="12">{}</text>'.format(
+                    left + 8, top + 16 + 14 * alg_index, color, alg))
+
+    with open(filename, 'w') as output_file:
+        output_file.write('<svg xmlns="http://www.w3.org/2000/svg" width="{}" height="{}" font-family="sans-serif">\n'.format(
+            2 * (panel_width + margin) + margin, panel_height + margin + 50))
+        output_file.write("\n".join(elements))
+        output_file.write("\n</svg>\n")
@@ -0,0 +1,203 @@
+import random
+
+# Random byte -> board character tables, used to draw many cells with one bytes.translate call
+_COIN_TABLE = bytes(b'*'[0] if value < 128 else b'-'[0] for value in range(256)) # Free with probability 1/2
+_SWAP_TABLE = bytes.maketrans(b'*-', b'-*')
+_FREE_SELECT_TABLE = bytes(0xFF if value == ord('*') else 0 for value in range(256)) # '*' -> all bits set
+
+
+def _perfect_rows(number_of_rows, number_of_columns, generator):
+    """ Yields the rows of a perfect maze (exactly one path between any two free positions), carved by the
+    binary tree algorithm: every cell opens the passage to its north or to its east neighbour, at random.
+    Cells are the positions at odd rows and columns, and the positions between them are passages. Each
+    board row is drawn with a few slice assignments, from one random byte per cell. The algorithm is biased:
+    the first cell row and the last cell column are straight corridors.
+    """
+    number_of_cell_rows = (number_of_rows - 1) // 2
+    number_of_cell_columns = (number_of_columns - 1) // 2
+    last_cell_column = 2 * number_of_cell_columns - 1
+    wall_row = b'-' * number_of_columns
+    yield wall_row
+    for cell_row in range(number_of_cell_rows):
+        if cell_row == 0:
+            east = bytearray(b'*' * number_of_cell_columns)
+        else:
+            east = bytearray(generator.randbytes(number_of_cell_columns).translate(_COIN_TABLE))
+        east[-1] = b'-'[0]
+        if cell_row > 0:
+            north_row = bytearray(wall_row)
+            north_row[1:last_cell_column + 1:2] = east.translate(_SWAP_TABLE) # Cells not opened east open north
+            yield bytes(north_row)
+        board_row = bytearray(wall_row)
+        board_row[1:last_cell_column + 1:2] = b'*' * number_of_cell_columns
+        board_row[2:last_cell_column + 2:2] = east
+        yield bytes(board_row)
+    for board_row in range(2 * number_of_cell_rows, number_of_rows):
+        yield wall_row
+
+
+def _room_rows(number_of_rows, number_of_columns, generator, room_size=8, loop_probability=0.25):
+    """ Yields the rows of a board of open rooms, 'room_size - 1' positions wide, in a grid. The rooms are
+    joined by doors as the cells of a binary tree perfect maze, and every other wall between two rooms
+    gets a door with probability 'loop_probability', so there are many paths between two positions.
+    """
+    room_size = min(room_size, number_of_rows - 1, number_of_columns - 1) # At least one room
+    number_of_room_rows = (number_of_rows - 1) // room_size
+    number_of_room_columns = (number_of_columns - 1) // room_size
+    wall_row = b'-' * number_of_columns
+    inner_row = bytearray(wall_row)
+    for room_column in range(number_of_room_columns):
+        start = room_column * room_size + 1
+        inner_row[start:start + room_size - 1] = b'*' * (room_size - 1)
+
+    yield wall_row
+    for room_row in range(number_of_room_rows):
+        # Each room opens north, east or both. The first room row only opens east, the last room column only north
+        north_doors = []
+        east_doors = {} # Row offset in the room -> columns of the east doors at that offset
+        for room_column in range(number_of_room_columns):
+            can_open_east = room_column < number_of_room_columns - 1
+            opens_east = can_open_east and (room_row == 0 or generator.random() < 0.5)
+            opens_north = room_row > 0 and (not opens_east or generator.random() < loop_probability)
+            if can_open_east and not opens_east and generator.random() < loop_probability:
+                opens_east = True
+            if opens_north:
+                north_doors.append(room_column * room_size + generator.randrange(1, room_size))
+            if opens_east:
+                east_doors.setdefault(generator.randrange(room_size - 1), []).append((room_column + 1) * room_size)
+
+        if room_row > 0:
+            north_row = bytearray(wall_row)
+            for column in north_doors:
+                north_row[column] = b'*'[0]
+            yield bytes(north_row)
+        for offset in range(room_size - 1):
+            row = bytearray(inner_row)
+            for column in east_doors.get(offset, ()):
+                row[column] = b'*'[0]
+            yield bytes(row)
+    for board_row in range(number_of_room_rows * room_size, number_of_rows):
+        yield wall_row
+
+
+def _corridor_rows(number_of_rows, number_of_columns, generator):
+    """ Yields the rows of a board of one-wide horizontal corridors, each wall row between two of them
+    having a single opening at a random column. Nearly every free position has two neighbours, and paths
+    wind through most of the board.
+    """
+    wall_row = b'-' * number_of_columns
+    corridor_row = b'-' + b'*' * (number_of_columns - 2) + b'-'
+    yield wall_row
+    for board_row in range(1, number_of_rows - 1):
+        if board_row % 2 == 1:
+            yield corridor_row
+        elif board_row + 1 < number_of_rows - 1:
+            opening = generator.randrange(1, number_of_columns - 1)
+            yield wall_row[:opening] + b'*' + wall_row[opening + 1:]
+        else:
+            yield wall_row
+    yield wall_row
+
+
+def _unsolvable_rows(number_of_rows, number_of_columns, generator):
+    """ Yields the rows of a perfect maze cut in two by a wall row in the middle of the board, so the exit,
+    placed in the lower half, can not be reached from the start, placed in the upper half
+    """
+    cut_row = 2 * ((number_of_rows - 1) // 4) # The passages row above the middle cell row
+    for (board_row, row) in enumerate(_perfect_rows(number_of_rows, number_of_columns, generator)):
+        yield b'-' * number_of_columns if board_row == cut_row else row
+
+
+TOPOLOGIES = {"perfect": _perfect_rows, "rooms": _room_rows, "corridors": _corridor_rows,
+              "unsolvable": _unsolvable_rows}
+
+
+def iter_maze_rows(number_of_rows, number_of_columns, topology="perfect", seed=0, max_cost=1):
+    """ Yields the rows of a generated maze, in the input file format. The start ('#') is the first free
+    position of the board and the exit ('$') the last one. Rows are produced one at a time, only the rows
+    after the last free position seen are held back, so boards of any size take little memory.
+
+        Args:
+            number_of_rows (int): Number of board rows, at least 5
+            number_of_columns (int): Number of board columns, at least 5
+            topology (str, optional): A name in TOPOLOGIES. Defaults to "perfect".
+            seed (int, optional): Seed of the random choices. The same arguments always give the same maze.
+                Defaults to 0.
+            max_cost (int, optional): Highest terrain cost, see 'add_terrain'. Defaults to 1, for an
+                unweighted board.
+
+        Returns:
+            iterator[bytes]: The board rows, without line breaks. Raises ValueError for boards too small or
+                with less than two free positions, and KeyError for unknown topologies.
+    """
+    if number_of_rows < 5 or number_of_columns < 5:
+        raise ValueError("Generated boards must be at least 5x5, not {}x{}".format(number_of_rows, number_of_columns))
+    rows = _place_endpoints(TOPOLOGIES[topology](number_of_rows, number_of_columns, random.Random(seed)), topology)
+    if max_cost > 1:
+        rows = add_terrain(rows, max_cost, seed)
+    return rows
+
+
+def _place_endpoints(rows, topology):
+    """ Marks the first free position of the rows as the start and the last one as the exit
+    """
+    for row in rows:
+        if b'*' in row:
+            start = row.index(b'*')
+            pending = [row[:start] + b'#' + row[start + 1:]] # The last row with free positions, then the rows after it
+            break
+        yield row
+    else:
+        raise ValueError("The {} board has no free position".format(topology))
+    for row in rows:
+        if b'*' in row:
+            yield from pending
+            pending = [row]
+        else:
+            pending.append(row)
+
+    last_free_row = pending[0]
+    end = last_free_row.rfind(b'*')
+    if end == -1:
+        raise ValueError("The {} board has less than two free positions".format(topology))
+    pending[0] = last_free_row[:end] + b'$' + last_free_row[end + 1:]
+    yield from pending
+
+
+def add_terrain(rows, max_cost=9, seed=0):
+    """ Yields board rows with every '*' position turned into a random terrain digit from '1' to 'max_cost'
+    (see Maze.MazeGraph.get_cell_costs). Walls and the start and exit are kept. Each row is handled as three
+    big integers, taking the digits where the '*' mask bits are set and the row elsewhere.
+
+        Args:
+            rows (iterable[bytes]): Board rows, without line breaks
+            max_cost (int, optional): Highest cost, from 1 to 9. Defaults to 9.
+            seed (int, optional): Seed of the random costs. Defaults to 0.
+
+        Yields:
+            bytes: The weighted rows
+    """
+    digit_table = bytes(ord('1') + value % max_cost for value in range(256))
+    generator = random.Random(seed)
+    for row in rows:
+        digits = int.from_bytes(generator.randbytes(len(row)).translate(digit_table), 'big')
+        free_mask = int.from_bytes(row.translate(_FREE_SELECT_TABLE), 'big')
+        yield ((digits & free_mask) | (int.from_bytes(row, 'big') & ~free_mask)).to_bytes(len(row), 'big')
+
+
+def write_maze(filename, number_of_rows, number_of_columns, topology="perfect", seed=0, max_cost=1):
+    """ Generates a maze and writes it to an input file, see 'iter_maze_rows'
+
+        Args:
+            filename (string): The path to the output file
+            number_of_rows (int): Number of board rows
+            number_of_columns (int): Number of board columns
+            topology (str, optional): A name in TOPOLOGIES. Defaults to "perfect".
+            seed (int, optional): Seed of the random choices. Defaults to 0.
+            max_cost (int, optional): Highest terrain cost. Defaults to 1, for an unweighted board.
+    """
+    with open(filename, 'wb') as output_file:
+        output_file.write("{} {}\n".format(number_of_rows, number_of_columns).encode('ascii'))
+        for row in iter_maze_rows(number_of_rows, number_of_columns, topology, seed, max_cost):
+            output_file.write(row)
+            output_file.write(b'\n')
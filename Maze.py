@@ -1,13 +1,294 @@
-import curses
-import time
+import math
+import re
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+
+# Bits of each board position in the flags returned by 'build_adjacence_flags'
+FREE_CELL = 1
+UP_ADJACENCE = 2
+RIGHT_ADJACENCE = 4
+DOWN_ADJACENCE = 8
+LEFT_ADJACENCE = 16
+
+_FREE_CELL_TABLE = bytes(0 if code == ord('-') else 1 for code in range(256))
+
+# Terrain: the digits '1' to '9' are free positions costing that much to enter. Other free positions cost 1
+# and walls 0. Cost layers are kept by position in one byte each, see MazeGraph.get_cell_costs
+MAXIMUM_CELL_COST = 9
+_CELL_COST_TABLE = bytes(0 if code == ord('-') else code - ord('0') if ord('1') <= code <= ord('9') else 1
+                         for code in range(256))
+_COST_TO_CELL_TABLE = bytes.maketrans(bytes(range(MAXIMUM_CELL_COST + 1)), b'-*23456789')
+_TERRAIN_PATTERN = re.compile(rb'[2-9]') # Terrain digits costing more than a move, found on weighted boards only
+
+# Binary graph file format written by MazeGraph.save and mapped by CompactMazeGraph.load. After the header come,
+# each padded to 4 bytes: the free-cell mask packed in bits, the CSR adjacence offsets (int32, one per board
+# position plus one), the CSR adjacence targets (int32), the connected component labels (int32, one per board
+# position, -1 for walls), the cell costs (one byte per board position, only with the GRAPH_FILE_WEIGHTED flag)
+# and the saved heuristics, each one a 16 bytes name, an int32 target position and one int32 value per board
+# position. The checksum is the CRC32 of everything after the header. Integers are little-endian; vertexes are
+# identified by board position.
+GRAPH_FILE_MAGIC = b'MAZG'
+GRAPH_FILE_VERSION = 2 # Version 2 added the component labels
+GRAPH_FILE_HEADER_FORMAT = '<4sHHIIiiIIII' # magic, version, flags, rows, columns, root, target,
+                                          # vertexes, adjacences, heuristics, checksum
+GRAPH_FILE_WEIGHTED = 1 # Header flag of files with a cell costs section
+GRAPH_FILE_HEURISTIC_HEADER_FORMAT = '<16si' # heuristic name, target position
+
+_MASK_TO_BIT_TABLE = bytes.maketrans(b'\x00\x01', b'01')
+_BIT_TO_CELL_TABLE = bytes.maketrans(b'01', b'-*')
+
+
+def build_adjacence_flags(board, number_of_rows, number_of_columns):
+    """ Computes, for every board position at once, whether it is free and which of its four
+    neighbours are free too. The board is turned into a free-cell mask packed in a big integer with one
+    byte per position, and each direction is derived by shifting the mask against itself, so the
+    whole board is processed by a handful of C-level integer operations instead of a Python loop.
+
+    Args:
+        board (bytes): The board characters, flattened in row-major order
+        number_of_rows (int): Number of board rows
+        number_of_columns (int): Number of board columns
+
+    Returns:
+        bytes: One byte of flags per position (FREE_CELL, UP_ADJACENCE, RIGHT_ADJACENCE,
+               DOWN_ADJACENCE and LEFT_ADJACENCE)
+    """
+    number_of_cells = number_of_rows * number_of_columns
+    if number_of_cells == 0:
+        return b''
+    mask = int.from_bytes(board.translate(_FREE_CELL_TABLE), 'little')
+    not_first_column = int.from_bytes((b'\x00' + b'\x01' * (number_of_columns - 1)) * number_of_rows, 'little')
+    not_last_column = int.from_bytes((b'\x01' * (number_of_columns - 1) + b'\x00') * number_of_rows, 'little')
+    row_shift = 8 * number_of_columns
+
+    up = mask & (mask << row_shift)
+    right = mask & (mask >> 8) & not_last_column
+    down = mask & (mask >> row_shift)
+    left = mask & (mask << 8) & not_first_column
+
+    flags = mask | (up << 1) | (right << 2) | (down << 3) | (left << 4)
+    flags = flags & ((1 << (8 * number_of_cells)) - 1)
+    return flags.to_bytes(number_of_cells, 'little')
+
+
+def iter_adjacence_flags(board, number_of_rows, number_of_columns, band_size=1 << 22):
+    """ Computes the same flags as 'build_adjacence_flags' in bands of whole rows, so the temporary
+    integers stay bounded on very large boards. Each band is computed together with the rows just above
+    and below it, whose flags are discarded.
+
+    Args:
+        board (bytes): The board characters, flattened in row-major order
+        number_of_rows (int): Number of board rows
+        number_of_columns (int): Number of board columns
+        band_size (int, optional): Approximate number of positions per band. Defaults to 4M.
+
+    Yields:
+        tuple(int, bytes): The first position of the band and its flags
+    """
+    band_rows = max(1, band_size // max(1, number_of_columns))
+    for first_row in range(0, number_of_rows, band_rows):
+        last_row = min(number_of_rows, first_row + band_rows)
+        extended_first_row = max(0, first_row - 1)
+        extended_last_row = min(number_of_rows, last_row + 1)
+        band_flags = build_adjacence_flags(board[extended_first_row * number_of_columns:extended_last_row * number_of_columns],
+                                           extended_last_row - extended_first_row, number_of_columns)
+        skipped = (first_row - extended_first_row) * number_of_columns
+        yield (first_row * number_of_columns, band_flags[skipped:skipped + (last_row - first_row) * number_of_columns])
+
+
+def label_components(free_cell_mask, number_of_rows, number_of_columns):
+    """ Labels the connected components of the free positions of a board. Each row is split into runs of
+    free positions, each run is joined (with union-find) to the runs it touches in the row above, and labels
+    are written a whole run at a time, so the work done in Python grows with the number of runs instead
+    of the number of positions.
+
+    Args:
+        free_cell_mask (bytes): One byte per board position, in row-major order, 1 if free and 0 if a wall
+        number_of_rows (int): Number of board rows
+        number_of_columns (int): Number of board columns
+
+    Returns:
+        array[int]: The component label of each board position, -1 for walls. Labels are numbered from 0
+            in the board order of each component first position.
+    """
+    run_pattern = re.compile(rb'\x01+')
+    run_starts = []
+    run_ends = []
+    run_parent = [] # Union-find forest over the runs
+    previous_runs = [] # (first column, last column + 1, run) of the runs in the row above
+    for row in range(number_of_rows):
+        row_start = row * number_of_columns
+        current_runs = []
+        first_candidate = 0 # First run above that may touch the current run
+        for match in run_pattern.finditer(free_cell_mask, row_start, row_start + number_of_columns):
+            (start, end) = (match.start() - row_start, match.end() - row_start)
+            run = len(run_parent)
+            run_parent.append(run)
+            run_starts.append(match.start())
+            run_ends.append(match.end())
+            while first_candidate < len(previous_runs) and previous_runs[first_candidate][1] <= start:
+                first_candidate = first_candidate + 1
+            candidate = first_candidate
+            while candidate < len(previous_runs) and previous_runs[candidate][0] < end:
+                # Joins the roots of both runs, halving the paths on the way
+                (root, other_root) = (run, previous_runs[candidate][2])
+                while run_parent[root] != root:
+                    run_parent[root] = run_parent[run_parent[root]]
+                    root = run_parent[root]
+                while run_parent[other_root] != other_root:
+                    run_parent[other_root] = run_parent[run_parent[other_root]]
+                    other_root = run_parent[other_root]
+                if root != other_root:
+                    run_parent[max(root, other_root)] = min(root, other_root)
+                candidate = candidate + 1
+            current_runs.append((start, end, run))
+        previous_runs = current_runs
+
+    labels = array('i', [-1]) * (number_of_rows * number_of_columns)
+    root_labels = {}
+    for run in range(len(run_parent)):
+        root = run
+        while run_parent[root] != root:
+            root = run_parent[root]
+        label = root_labels.setdefault(root, len(root_labels))
+        labels[run_starts[run]:run_ends[run]] = array('i', [label]) * (run_ends[run] - run_starts[run])
+    return labels
+
+
+def _pack_bits(free_cell_mask):
+    """ Packs a free-cell mask (one byte per position) into one bit per position, little-endian
+
+    Args:
+        free_cell_mask (bytes): The mask, as returned by MazeGraph.get_free_cell_mask
+
+    Returns:
+        bytes: The packed mask
+    """
+    bits = int(free_cell_mask.translate(_MASK_TO_BIT_TABLE)[::-1] or b'0', 2)
+    return bits.to_bytes((len(free_cell_mask) + 7) // 8, 'little')
+
+
+def _unpack_board(packed_mask, number_of_cells):
+    """ Rebuilds a board of walls ('-') and free positions ('*') from a mask packed by '_pack_bits'
+
+    Args:
+        packed_mask (bytes): The packed mask
+        number_of_cells (int): Number of board positions
+
+    Returns:
+        bytearray: The flattened board
+    """
+    bits = int.from_bytes(packed_mask, 'little')
+    digits = format(bits, 'b').zfill(number_of_cells)[::-1][:number_of_cells]
+    return bytearray(digits.encode('ascii').translate(_BIT_TO_CELL_TABLE))
+
+
+def _padding(size):
+    """ Returns the zero bytes that align a section of the graph file to 4 bytes
+    """
+    return bytes(-size % 4)
+
+
+def _int32_section(buffer):
+    """ Returns a little-endian int32 section of the graph file as a sequence of ints. The section is
+    used in place on little-endian machines and copied otherwise.
+    """
+    if sys.byteorder == 'little':
+        return buffer.cast('i')
+    values = array('i', buffer.tobytes())
+    values.byteswap()
+    return values
+
+
+def _graph_file_structs():
+    """ Returns the structs of the graph file header and heuristic headers. struct, like zlib and mmap, is
+    only imported by the graph file functions, so building a graph from a board does not load them.
+    """
+    import struct
+    return (struct.Struct(GRAPH_FILE_HEADER_FORMAT), struct.Struct(GRAPH_FILE_HEURISTIC_HEADER_FORMAT))
+
+
+def _int32_bytes(values):
+    """ Returns a sequence of ints as little-endian int32 bytes
+    """
+    values = array('i', values)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def euclidean_distance(row_difference, column_difference):
+    """ Euclidean distance heuristic, rounded up
+
+    Args:
+        row_difference (int): Absolute difference between the rows of two positions
+        column_difference (int): Absolute difference between the columns of two positions
+
+    Returns:
+        int: The heuristic value
+    """
+    return math.ceil(math.sqrt(row_difference ** 2 + column_difference ** 2))
+
+
+def manhattan_distance(row_difference, column_difference):
+    """ Manhattan distance heuristic. Exact on boards without walls, as moves are only horizontal or vertical
+
+    Args:
+        row_difference (int): Absolute difference between the rows of two positions
+        column_difference (int): Absolute difference between the columns of two positions
+
+    Returns:
+        int: The heuristic value
+    """
+    return row_difference + column_difference
+
+
+def octile_distance(row_difference, column_difference):
+    """ Octile distance heuristic (diagonal moves costing sqrt(2)), rounded up
+
+    Args:
+        row_difference (int): Absolute difference between the rows of two positions
+        column_difference (int): Absolute difference between the columns of two positions
+
+    Returns:
+        int: The heuristic value
+    """
+    (longest, shortest) = (max(row_difference, column_difference), min(row_difference, column_difference))
+    return math.ceil(longest + (math.sqrt(2) - 1) * shortest)
+
+
+def zero_distance(row_difference, column_difference):
+    """ Heuristic of zero, turning A* into Dijkstra's algorithm
+
+    Args:
+        row_difference (int): Absolute difference between the rows of two positions
+        column_difference (int): Absolute difference between the columns of two positions
+
+    Returns:
+        int: 0
+    """
+    return 0
+
+
+# Heuristics known by name in MazeGraph.get_heuristic_values
+HEURISTICS = {"euclidean": euclidean_distance, "manhattan": manhattan_distance, "octile": octile_distance,
+              "zero": zero_distance}
+
+# Heuristic name for the exact number of moves left, read from MazeGraph.get_distance_field
+DISTANCE_FIELD_HEURISTIC = "distance"
+
 
 class MazeVertex:
     """ Class used to represent each free-to-walk position in the maze board
     and it's connections as graph vertexes with adjacences list.
     """
 
-    def __init__(self, id, label, adjacence_list=[], parent=None):
-        """ Class constructor
+    def __init__(self, id, label, adjacence_list=[]):
+        """ Class constructor. Search state (parents, g and h values) is kept by the searchers, so vertexes
+        are never changed by a search.
 
         Args:
             id (int): The numeric identifier for the vertex
@@ -17,9 +298,6 @@ class MazeVertex:
         self.id = id
         self.label = label
         self.adjacence_list = []
-        self.parent = parent # Parent of a given path - used in Best-First Search and A* Search
-        self.h = None # Value used for heuristic informed searches - Best-First Search and A* Search
-        self.g = None # Value used for heuristic informed search - A* Search
     
     def add_adjacence(self, neighbour_id):
         """ Method to add the id of a adjacent vertex to this vertex adjacence list
@@ -68,11 +346,15 @@ class MazeGraph:
     as all graph information is built from the characters matrix returned from a MazeReader
     "read_from_file" method.
     """
+    HEURISTIC_CACHE_SIZE = 16 # Number of (target, heuristic) values arrays kept by get_heuristic_values
+    DISTANCE_FIELD_CACHE_SIZE = 8 # Number of target distance fields kept by get_distance_field
+
     def __init__(self, maze_as_list_of_lines):
         """ Class constructor
 
         Args:
-            maze_as_list_of_lines (list[list[str]]): A list of lines, each line being a list of strings with lenght 1.
+            maze_as_list_of_lines (list[list[str]] or MazeBoardView): A list of lines, each line being a list of
+                strings with lenght 1, or a board mapped by MazeReader.map_file.
         """
         self.maze_text_info = maze_as_list_of_lines
         self.vertexes_list = []
@@ -80,6 +362,16 @@ class MazeGraph:
         self.root_id = -1 # Vertex id of the maze's starting point
         self.target_id = -1 # Vertex id of the maze's target point
         self.last_added_id = -1 
+        self.heuristic_cache = OrderedDict() # (target id, heuristic) -> heuristic values, least recently used first
+        self.distance_field_cache = OrderedDict() # target id -> distance field, least recently used first
+        self.free_vertex_ids = [] # Ids of vertexes removed by close_cell, reused by open_cell
+        self.cache_lock = threading.Lock() # Guards the caches, as searches may share the graph between threads
+        self.component_labels = None # Connected component label of each vertex id, see get_component_labels
+        # Views built on first use, under 'cache_lock': "contracted" (see get_contracted_graph) and "hierarchical"
+        # (see get_hierarchical_graph). The dict is shared by reference with the with_endpoints copies
+        self.views = {}
+        self.cell_costs = None # Cost of entering each vertex id, None if every move costs 1. See get_cell_costs
+        self.minimum_cell_cost = 1
 
         self.number_of_rows = len(self.maze_text_info)
         self.number_of_columns = len(self.maze_text_info[0])
@@ -92,11 +384,77 @@ class MazeGraph:
 
         self._build_graph_from_text()
     
+    def _board_as_bytes(self):
+        """ Flattens the character matrix into one byte per board position, in row-major order.
+        Short lines are completed with walls. Boards mapped by MazeReader.map_file are copied
+        straight from the file bytes.
+
+        Returns:
+            bytes: The flattened board
+        """
+        if isinstance(self.maze_text_info, MazeBoardView):
+            return self.maze_text_info.to_board_bytes()
+        number_of_columns = self.number_of_columns
+        padding = b'-' * number_of_columns
+        return b''.join((''.join(line_content).encode('latin-1') + padding)[:number_of_columns]
+                        for line_content in self.maze_text_info)
+
     def _build_graph_from_text(self):
         """ Private function, automatically called from the constructor. Builds all graph information
             by parsing the string matrix passed to the constructor. At the end of this method execution,
             the properties 'vertexes_list', 'vertex_id_label_mapping', 'root_id' and 'target_id' must be
             properly fullfiled.
+            The free positions and their neighbours are found for the whole board at once (see
+            'build_adjacence_flags'), leaving only the vertexes creation to the Python loop.
+        """
+        number_of_columns = self.number_of_columns
+        board = self._board_as_bytes()
+        adjacence_flags = build_adjacence_flags(board, self.number_of_rows, number_of_columns)
+
+        # Vertexes ids follow the board order, so a position id is the number of free positions before it
+        free_cells = [match.start() for match in re.finditer(rb'[^-]', board)]
+        cell_ids = array('i', [-1]) * len(board)
+        for vertex_id, cell in enumerate(free_cells):
+            cell_ids[cell] = vertex_id
+
+        for vertex_id, cell in enumerate(free_cells):
+            vertex = MazeVertex(vertex_id, divmod(cell, number_of_columns))
+            adjacences = vertex.adjacence_list
+            cell_flags = adjacence_flags[cell]
+            if cell_flags & UP_ADJACENCE:
+                adjacences.append(cell_ids[cell - number_of_columns])
+            if cell_flags & RIGHT_ADJACENCE:
+                adjacences.append(vertex_id + 1)
+            if cell_flags & DOWN_ADJACENCE:
+                adjacences.append(cell_ids[cell + number_of_columns])
+            if cell_flags & LEFT_ADJACENCE:
+                adjacences.append(vertex_id - 1)
+            self.vertexes_list.append(vertex)
+        self.last_added_id = len(free_cells) - 1
+
+        # As in the cell by cell parsing, the last '#' and '$' found on the board are used
+        root_cell = board.rfind(b'#')
+        target_cell = board.rfind(b'$')
+        if root_cell != -1:
+            self.root_id = cell_ids[root_cell]
+        if target_cell != -1:
+            self.target_id = cell_ids[target_cell]
+        self._set_board_cell_costs(board)
+
+        # Create a mapping thus allowing vertexes to be found by label
+        self.vertexes_label_to_id_mapping = {vertex.get_label(): vertex.get_id() for vertex in self.vertexes_list}
+
+        # Ensures the board has a starting and ending point
+        if (self.root_id == -1):
+            print("ERROR: Maze has no starting point.")
+            exit(-1)
+        if (self.target_id == -1):
+            print("ERROR: Maze has no ending point.")
+            exit(-1)
+
+    def _build_graph_from_text_cell_by_cell(self):
+        """ Reference implementation of '_build_graph_from_text', visiting each board position and
+            each of its neighbours from Python. Kept to validate and benchmark the default builder.
         """
 
         # Parse each board postition type
@@ -120,6 +478,7 @@ class MazeGraph:
             adjacences = self._find_vertex_adjacences_from_text(vertex_row, vertex_column)
             for adjacence in adjacences:
                 vertex.add_adjacence(adjacence)
+        self._set_board_cell_costs(self._board_as_bytes())
         
         # Ensures the board has a starting and ending point
         if (self.root_id == -1):
@@ -180,80 +539,1553 @@ class MazeGraph:
         Returns:
             list[int]: A list of the adjacences ids
         """
-        vertex_id = self.vertex_id_label_mapping[vertex_label]
-        return self.vertexes_list[vertex_id].get_adjacence_list()
+        vertex_id = self.get_vertex_id_by_label(vertex_label)
+        return self.get_vertex_adjacence_by_id(vertex_id)
 
-    def add_solution(self, list_of_positions):
-        self.solution_path = list_of_positions
+    def get_vertex_label_by_id(self, vertex_id):
+        """ Returns the board position of a vertex
 
-    def print_maze(self):
-        curses.wrapper(self._wraped_print_maze)
+        Args:
+            vertex_id (int): The vertex id
 
-    def _wraped_print_maze(self, stdscr):
-    
-        start_pos = self.vertexes_list[self.root_id].get_label()
-        end_pos = self.vertexes_list[self.target_id].get_label()
-
-        curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)     # Walls
-        curses.init_pair(2, curses.COLOR_WHITE, curses.COLOR_WHITE)     # Paths
-        curses.init_pair(3, curses.COLOR_WHITE, curses.COLOR_BLUE)      # Start
-        curses.init_pair(4, curses.COLOR_WHITE, curses.COLOR_RED)       # End
-        curses.init_pair(5, curses.COLOR_WHITE, curses.COLOR_YELLOW)    # Visited
-        
-        stdscr.clear()
-        stdscr.nodelay(1)
-
-        for line_index, line in zip(range(len(self.maze_text_info)),self.maze_text_info):
-            for column_index, column in zip(range(len(line)),line):
-                if column == '-':
-                    color = curses.color_pair(1)
-                elif column == '*':
-                    color = curses.color_pair(2)
-                elif column == '#':
-                    color = curses.color_pair(3)
-                elif column == '$':
-                    color = curses.color_pair(4) 
-                stdscr.addstr(line_index, column_index, ' ', color)
-        stdscr.refresh()
-        time.sleep(0.5)
-
-        for walked in self.solution_path:
-            stdscr.addstr(walked[0], walked[1], ' ', curses.color_pair(5))
-            stdscr.addstr(start_pos[0], start_pos[1], ' ', curses.color_pair(3))
-            stdscr.addstr(end_pos[0], end_pos[1], ' ', curses.color_pair(4))
-            stdscr.refresh()
-            time.sleep(0.01)
-        stdscr.nodelay(0)
-        stdscr.getch()
+        Returns:
+            tuple(int, int): The vertex label (row, column)
+        """
+        return self.vertexes_list[vertex_id].get_label()
 
-class MazeReader:
-    """ A class to read mazes from input files into a format the MazeGraph class can parse.
-    """
-    def __init__(self):
-        pass
+    def get_vertex_id_by_label(self, vertex_label):
+        """ Returns the id of the vertex at a given board position
 
-    def read_from_file(self, filename):
-        """ Given a filename, returns the maze in a representation compatible with MazeGraph class
+        Args:
+            vertex_label (tuple(int, int)): The vertex label (row, column)
+
+        Returns:
+            int: The vertex id. Raises KeyError if the position is not a free vertex
+        """
+        return self.vertexes_label_to_id_mapping[vertex_label]
+
+    def get_vertex_ids(self):
+        """ Returns every vertex id in the graph, in board (row-major) order unless cells were opened
+        after the graph was built
+
+        Returns:
+            iterable[int]: The vertexes ids
+        """
+        if self.free_vertex_ids:
+            free_vertex_ids = set(self.free_vertex_ids)
+            return (vertex_id for vertex_id in range(len(self.vertexes_list)) if vertex_id not in free_vertex_ids)
+        return range(len(self.vertexes_list))
+
+    def get_number_of_vertexes(self):
+        """ Returns the number of vertexes (free board positions) in the graph
+
+        Returns:
+            int: Number of vertexes
+        """
+        return len(self.vertexes_list) - len(self.free_vertex_ids)
+
+    def get_id_space_size(self):
+        """ Returns an exclusive upper bound for the vertexes ids. Searchers use it to size their
+        per-vertex buffers (visited flags, heuristic values, ...).
+
+        Returns:
+            int: Upper bound for vertex ids
+        """
+        return len(self.vertexes_list)
+
+    def get_component_labels(self):
+        """ Returns the connected component label of every vertex. Labels are computed on first use, so
+        building the graph does not pay for them, and again after cells are opened or closed.
+
+        Returns:
+            array[int]: Component labels indexed by vertex id, -1 for ids that are not vertexes
+        """
+        component_labels = self.component_labels
+        if component_labels is None:
+            board_labels = label_components(self.get_free_cell_mask(), self.number_of_rows, self.number_of_columns)
+            component_labels = self._get_vertex_component_labels(board_labels)
+            self.component_labels = component_labels
+        return component_labels
+
+    def _get_vertex_component_labels(self, board_labels):
+        """ Maps component labels indexed by board position to labels indexed by vertex id. Removed vertexes
+        are walls on the board, so they get -1.
 
         Args:
-            filename (string): The path to input file
+            board_labels (array[int]): Component labels indexed by board position
 
         Returns:
-            list[list[string]]: A two dimensional matrix of characters
+            array[int]: Component labels indexed by vertex id
+        """
+        number_of_columns = self.number_of_columns
+        return array('i', [board_labels[row * number_of_columns + column]
+                           for (row, column) in (vertex.get_label() for vertex in self.vertexes_list)])
+
+    def are_connected(self, vertex_id, other_vertex_id):
+        """ Tells in O(1) if there is a path between two vertexes
+
+        Args:
+            vertex_id (int): A vertex id
+            other_vertex_id (int): Another vertex id
+
+        Returns:
+            bool: Whether both vertexes are in the same connected component
+        """
+        component_labels = self.get_component_labels()
+        return component_labels[vertex_id] == component_labels[other_vertex_id] != -1
+
+    def get_contracted_graph(self):
+        """ Returns the corridor-contracted view of the graph, built on the first call and again after cells
+        are opened or closed. The view does not depend on the starting and ending points, so copies made by
+        with_endpoints share it.
+
+        Returns:
+            ContractedMazeGraph: The contracted view
+        """
+        contracted_graph = self.views.get("contracted")
+        if contracted_graph is None:
+            with self.cache_lock:
+                contracted_graph = self.views.get("contracted")
+                if contracted_graph is None:
+                    contracted_graph = ContractedMazeGraph(self)
+                    self.views["contracted"] = contracted_graph
+        return contracted_graph
+
+    def get_hierarchical_graph(self, cluster_size=16):
+        """ Returns the hierarchical abstraction of the graph, built on the first call (or when another
+        cluster size is asked for) and kept up to date by open_cell and close_cell, which only search the
+        changed clusters again. Copies made by with_endpoints share it.
+
+        Args:
+            cluster_size (int, optional): Number of rows and columns of each cluster. Defaults to 16.
+
+        Returns:
+            HierarchicalMazeGraph: The abstraction
+        """
+        hierarchical_graph = self.views.get("hierarchical")
+        if hierarchical_graph is None or hierarchical_graph.cluster_size != cluster_size:
+            with self.cache_lock:
+                hierarchical_graph = self.views.get("hierarchical")
+                if hierarchical_graph is None or hierarchical_graph.cluster_size != cluster_size:
+                    hierarchical_graph = HierarchicalMazeGraph(self, cluster_size)
+                    self.views["hierarchical"] = hierarchical_graph
+        return hierarchical_graph
+
+    def get_cell_costs(self):
+        """ Returns the cost of entering every vertex, given by the terrain digits of the board. Boards
+        without digits are unweighted: every move costs 1 and no cost layer is kept. AStarSearch and
+        DijkstraSearch use the costs; the other searchers count moves.
+
+        Returns:
+            bytearray: Costs indexed by vertex id, 0 for ids that are not vertexes, or None if every move costs 1
+        """
+        return self.cell_costs
+
+    def get_path_cost(self, path):
+        """ Returns the cost of walking a path: the sum of the costs of the positions entered
+
+        Args:
+            path (list[tuple(int, int)]): Labels of the path vertexes, the start first
+
+        Returns:
+            int: The path cost, its number of moves on unweighted boards
+        """
+        if self.cell_costs is None:
+            return len(path) - 1
+        return sum(self.cell_costs[self.get_vertex_id_by_label(label)] for label in path[1:])
+
+    def _set_board_cell_costs(self, board):
+        """ Private method, called by the graph builders with the board bytes, that keeps the cost layer if
+            the board has terrain digits. Unweighted boards only cost one search of the bytes.
+        """
+        if _TERRAIN_PATTERN.search(board) is not None:
+            self._set_cell_costs(board.translate(_CELL_COST_TABLE))
+
+    def _set_cell_costs(self, board_costs):
+        """ Private method that keeps the cost layer of a weighted board, and its lowest cost
+
+        Args:
+            board_costs (bytes): Cost of entering each board position, 0 for walls
+        """
+        if max(board_costs, default=0) <= 1:
+            self.cell_costs = None
+            self.minimum_cell_cost = 1
+            return
+        self.cell_costs = self._get_vertex_cell_costs(board_costs)
+        self.minimum_cell_cost = min(cost for cost in range(1, MAXIMUM_CELL_COST + 1) if cost in board_costs)
+
+    def _get_vertex_cell_costs(self, board_costs):
+        """ Private method that maps cell costs indexed by board position to costs indexed by vertex id.
+            It runs as the graph is built, when vertex ids still follow the board order, so removing the
+            walls (cost 0) leaves the costs by vertex id.
+        """
+        return bytearray(board_costs.replace(b'\x00', b''))
+
+    def _get_board_cell_costs(self):
+        """ Returns the cost of entering each board position, in row-major order
+        """
+        return self._board_as_bytes().translate(_CELL_COST_TABLE)
+
+    def _set_cell_cost(self, vertex_id, cost):
+        """ Private method that changes the cost of a vertex opened or closed on a weighted board. Opened
+            positions cost 1, so the lowest cost stays a lower bound of every cost.
+        """
+        cell_costs = self.cell_costs
+        if cell_costs is None:
+            return
+        if vertex_id == len(cell_costs):
+            cell_costs.append(cost)
+        else:
+            cell_costs[vertex_id] = cost
+        if cost:
+            self.minimum_cell_cost = min(self.minimum_cell_cost, cost)
+
+    def with_endpoints(self, root_id, target_id):
+        """ Returns a graph with other starting and ending points, so searchers can solve any query. It is
+        a shallow copy sharing the board, the adjacences and the caches, so it costs next to nothing. Cells
+        must not be opened or closed while such copies are in use.
+
+        Args:
+            root_id (int): The starting point vertex id
+            target_id (int): The ending point vertex id
+
+        Returns:
+            MazeGraph: The graph copy
         """
+        import copy
+        self.get_component_labels() # Computed once here, as the copies could not share it afterwards
+        graph = copy.copy(self)
+        graph.root_id = root_id
+        graph.target_id = target_id
+        return graph
+
+    def open_cell(self, vertex_label):
+        """ Turns a wall into a free position, linking it to its free neighbours. Only the new vertex and
+        its neighbours are updated, and distance fields, component labels and the contracted view are dropped
+        as they may have changed. The hierarchical abstraction, if built, only updates the changed clusters.
+
+        Args:
+            vertex_label (tuple(int, int)): The board position (row, column)
+
+        Returns:
+            list[int]: Ids of the vertexes whose adjacences changed, the new vertex first. Empty if the
+                position was already free. Raises KeyError if the position is outside the board.
+        """
+        (row, column) = vertex_label
+        if not (0 <= row < self.number_of_rows and 0 <= column < self.number_of_columns):
+            raise KeyError(vertex_label)
         try:
-            with open(filename) as input_file:
-                content = input_file.readlines()
-        except Exception as e:
-            print("Could not open input file: {}".format(e.args))
-            exit(-1)
+            self.get_vertex_id_by_label(vertex_label)
+            return []
+        except KeyError:
+            pass
 
-        maze_board = []
-        for line_content in content[1:]:
-            line_content = line_content.rstrip('\n')
-            maze_line = []
-            for block in line_content:
-                maze_line.append(block)
-            maze_board.append(maze_line)
+        self._set_board_cell(row, column, '*')
+        vertex_id = self._add_vertex(vertex_label)
+        self._set_cell_cost(vertex_id, 1)
+        changed_ids = [vertex_id] + self._find_vertex_adjacences(vertex_id)
+        for changed_id in changed_ids:
+            self._set_vertex_adjacences(changed_id, self._find_vertex_adjacences(changed_id))
+        self.distance_field_cache.clear()
+        self.component_labels = None
+        self.views.pop("contracted", None)
+        if "hierarchical" in self.views:
+            self.views["hierarchical"].update_cell(vertex_label)
+        return changed_ids
 
-        return maze_board
+    def close_cell(self, vertex_label):
+        """ Turns a free position into a wall, unlinking it from its neighbours. Only the removed vertex and
+        its neighbours are updated, and distance fields, component labels and the contracted view are dropped
+        as they may have changed. The hierarchical abstraction, if built, only updates the changed clusters.
+
+        Args:
+            vertex_label (tuple(int, int)): The board position (row, column)
+
+        Returns:
+            list[int]: Ids of the vertexes whose adjacences changed, the removed vertex first. Raises
+                KeyError if the position is not a free vertex, and ValueError for the maze's starting
+                and ending points.
+        """
+        vertex_id = self.get_vertex_id_by_label(vertex_label)
+        if vertex_id == self.root_id or vertex_id == self.target_id:
+            raise ValueError("The maze's starting and ending points can not be closed")
+
+        neighbour_ids = list(self.get_vertex_adjacence_by_id(vertex_id))
+        self._set_board_cell(vertex_label[0], vertex_label[1], '-')
+        self._remove_vertex(vertex_id)
+        self._set_cell_cost(vertex_id, 0)
+        self._set_vertex_adjacences(vertex_id, [])
+        for neighbour_id in neighbour_ids:
+            self._set_vertex_adjacences(neighbour_id, self._find_vertex_adjacences(neighbour_id))
+        self.distance_field_cache.clear()
+        self.component_labels = None
+        self.views.pop("contracted", None)
+        if "hierarchical" in self.views:
+            self.views["hierarchical"].update_cell(vertex_label)
+        return [vertex_id] + neighbour_ids
+
+    def _find_vertex_adjacences(self, vertex_id):
+        """ Private method that finds the free neighbours of a vertex, in the order used by the graph
+            builders: up, right, down, left
+
+        Args:
+            vertex_id (int): The vertex id
+
+        Returns:
+            list[int]: The adjacences ids
+        """
+        (row, column) = self.get_vertex_label_by_id(vertex_id)
+        adjacences = []
+        for neighbour_label in ((row - 1, column), (row, column + 1), (row + 1, column), (row, column - 1)):
+            try:
+                adjacences.append(self.get_vertex_id_by_label(neighbour_label))
+            except KeyError:
+                pass
+        return adjacences
+
+    def _set_board_cell(self, row, column, character):
+        """ Private method that changes one position of the character matrix. Mapped boards are read-only,
+            so they are copied to a list of lines first.
+        """
+        if not isinstance(self.maze_text_info, list):
+            self.maze_text_info = [list(bytes(line_content).decode('latin-1')) for line_content in self.maze_text_info]
+        line_content = self.maze_text_info[row]
+        if len(line_content) <= column:
+            line_content.extend('-' * (column + 1 - len(line_content)))
+        line_content[column] = character
+
+    def _add_vertex(self, vertex_label):
+        """ Private method that creates a vertex with no adjacences, reusing the id of a removed vertex if
+            there is one. Heuristic values are indexed by vertex id, so the new vertex value is set in
+            each cached array.
+
+        Returns:
+            int: The new vertex id
+        """
+        if self.free_vertex_ids:
+            vertex = self.vertexes_list[self.free_vertex_ids.pop()]
+            vertex.label = vertex_label
+        else:
+            vertex = MazeVertex(len(self.vertexes_list), vertex_label)
+            self.vertexes_list.append(vertex)
+            self.last_added_id = vertex.get_id()
+        vertex_id = vertex.get_id()
+        self.vertexes_label_to_id_mapping[vertex_label] = vertex_id
+
+        for ((target_id, heuristic), values) in self.heuristic_cache.items():
+            heuristic_function = HEURISTICS[heuristic] if isinstance(heuristic, str) else heuristic
+            (target_row, target_column) = self.get_vertex_label_by_id(target_id)
+            value = heuristic_function(abs(target_row - vertex_label[0]), abs(target_column - vertex_label[1]))
+            if vertex_id < len(values):
+                values[vertex_id] = value
+            else:
+                values.append(value)
+        return vertex_id
+
+    def _remove_vertex(self, vertex_id):
+        """ Private method that removes a vertex. Its id is kept for the next added vertex, so the ids of
+            the other vertexes do not change.
+        """
+        del self.vertexes_label_to_id_mapping[self.get_vertex_label_by_id(vertex_id)]
+        self.free_vertex_ids.append(vertex_id)
+
+    def _set_vertex_adjacences(self, vertex_id, adjacences):
+        """ Private method that replaces the adjacences of a vertex
+        """
+        self.vertexes_list[vertex_id].adjacence_list = adjacences
+
+    def get_heuristic_values(self, target_id=None, heuristic="euclidean"):
+        """ Returns the heuristic value of every vertex towards a target. Values are computed once per
+        (target, heuristic) pair and cached in the graph, evicting the least recently used pair when
+        more than HEURISTIC_CACHE_SIZE pairs were requested. The returned array is shared between
+        callers and must not be modified.
+
+        Args:
+            target_id (int, optional): The target vertex id. Defaults to the maze's target point.
+            heuristic (str or callable, optional): A name in HEURISTICS, DISTANCE_FIELD_HEURISTIC for the exact
+                distances of get_distance_field, or a function receiving the absolute row and column
+                differences between two positions. Defaults to "euclidean".
+
+        Returns:
+            array[int]: Heuristic values indexed by vertex id
+        """
+        if target_id is None:
+            target_id = self.target_id
+        if heuristic == DISTANCE_FIELD_HEURISTIC:
+            return self.get_distance_field(target_id)
+        key = (target_id, heuristic)
+        with self.cache_lock:
+            values = self.heuristic_cache.get(key)
+            if values is not None:
+                self.heuristic_cache.move_to_end(key)
+                return values
+
+        # Computed out of the lock, so other threads are not held up. Two threads missing the same
+        # pair at once both compute it, and the last one to finish is cached
+        heuristic_function = HEURISTICS[heuristic] if isinstance(heuristic, str) else heuristic
+        values = self._compute_heuristic_values(target_id, heuristic_function)
+        with self.cache_lock:
+            self.heuristic_cache[key] = values
+            if len(self.heuristic_cache) > self.HEURISTIC_CACHE_SIZE:
+                self.heuristic_cache.popitem(last=False)
+        return values
+
+    def _compute_heuristic_values(self, target_id, heuristic_function):
+        """ Computes the heuristic value of every vertex towards a target
+
+        Args:
+            target_id (int): The target vertex id
+            heuristic_function (callable): Function of the absolute row and column differences
+
+        Returns:
+            array[int]: Heuristic values indexed by vertex id
+        """
+        (target_row, target_column) = self.get_vertex_label_by_id(target_id)
+        return array('i', [heuristic_function(abs(target_row - row), abs(target_column - column))
+                           for (row, column) in (vertex.get_label() for vertex in self.vertexes_list)])
+
+    def get_distance_field(self, target_id=None):
+        """ Returns the number of moves from every vertex to a target, found by a BFS from the target.
+        Fields are cached in the graph like heuristic values, evicting the least recently used target
+        when more than DISTANCE_FIELD_CACHE_SIZE targets were requested. The returned array is shared
+        between callers and must not be modified.
+
+        Args:
+            target_id (int, optional): The target vertex id. Defaults to the maze's target point.
+
+        Returns:
+            array[int]: Distances indexed by vertex id, -1 for ids that can not reach the target
+        """
+        if target_id is None:
+            target_id = self.target_id
+        with self.cache_lock:
+            distance = self.distance_field_cache.get(target_id)
+            if distance is not None:
+                self.distance_field_cache.move_to_end(target_id)
+                return distance
+
+        distance = array('i', [-1]) * self.get_id_space_size()
+        queue = array('i', [0]) * self.get_number_of_vertexes()
+        queue[0] = target_id
+        distance[target_id] = 0
+        head = 0
+        tail = 1
+        while head < tail:
+            vertex_id = queue[head]
+            head = head + 1
+            neighbor_distance = distance[vertex_id] + 1
+            for neighbor_id in self.get_vertex_adjacence_by_id(vertex_id):
+                if distance[neighbor_id] == -1:
+                    distance[neighbor_id] = neighbor_distance
+                    queue[tail] = neighbor_id
+                    tail = tail + 1
+
+        with self.cache_lock:
+            self.distance_field_cache[target_id] = distance
+            if len(self.distance_field_cache) > self.DISTANCE_FIELD_CACHE_SIZE:
+                self.distance_field_cache.popitem(last=False)
+        return distance
+
+    def get_next_step(self, vertex_id, target_id=None):
+        """ Returns the vertex to move to from a given vertex, along a shortest path to a target
+
+        Args:
+            vertex_id (int): The current vertex id
+            target_id (int, optional): The target vertex id. Defaults to the maze's target point.
+
+        Returns:
+            int: The next vertex id, or None if the vertex is the target or can not reach it
+        """
+        distance = self.get_distance_field(target_id)
+        next_distance = distance[vertex_id] - 1
+        if next_distance < 0:
+            return None
+        for neighbor_id in self.get_vertex_adjacence_by_id(vertex_id):
+            if distance[neighbor_id] == next_distance:
+                return neighbor_id
+
+    def get_shortest_path(self, start_id=None, target_id=None):
+        """ Returns a shortest path between two vertexes, following the distance field of the target.
+        Once the field is cached each path costs O(path length).
+
+        Args:
+            start_id (int, optional): The start vertex id. Defaults to the maze's starting point.
+            target_id (int, optional): The target vertex id. Defaults to the maze's target point.
+
+        Returns:
+            list[tuple(int, int)]: Labels of the path from the start to the target, or None if the target
+                can not be reached
+        """
+        if start_id is None:
+            start_id = self.root_id
+        if not self.are_connected(start_id, self.target_id if target_id is None else target_id):
+            return None
+        distance = self.get_distance_field(target_id)
+        if distance[start_id] == -1:
+            return None
+        path = [self.get_vertex_label_by_id(start_id)]
+        vertex_id = start_id
+        while distance[vertex_id] > 0:
+            next_distance = distance[vertex_id] - 1
+            for neighbor_id in self.get_vertex_adjacence_by_id(vertex_id):
+                if distance[neighbor_id] == next_distance:
+                    vertex_id = neighbor_id
+                    break
+            path.append(self.get_vertex_label_by_id(vertex_id))
+        return path
+
+    def get_free_cell_mask(self):
+        """ Returns the board as a free-cell mask, in row-major order
+
+        Returns:
+            bytes: One byte per board position, 1 if the position is free and 0 if it is a wall
+        """
+        return self._board_as_bytes().translate(_FREE_CELL_TABLE)
+
+    def save(self, filename, include_heuristics=False):
+        """ Saves the built graph to a binary graph file (see GRAPH_FILE_HEADER_FORMAT), so it can be reloaded
+        with CompactMazeGraph.load without parsing the board again.
+
+        Args:
+            filename (string): The path to the graph file
+            include_heuristics (bool, optional): Also save the cached heuristic values of named heuristics.
+                Defaults to False.
+        """
+        import zlib
+        (header_struct, heuristic_header_struct) = _graph_file_structs()
+        number_of_cells = self.number_of_rows * self.number_of_columns
+        (offsets, targets) = self._get_board_adjacences()
+        packed_mask = _pack_bits(self.get_free_cell_mask())
+
+        sections = [packed_mask, _padding(len(packed_mask)), _int32_bytes(offsets), _int32_bytes(targets),
+                    _int32_bytes(self._get_board_component_labels())]
+        flags = 0
+        if self.cell_costs is not None:
+            board_costs = self._get_board_cell_costs()
+            sections.extend([board_costs, _padding(len(board_costs))])
+            flags = flags | GRAPH_FILE_WEIGHTED
+        number_of_heuristics = 0
+        if include_heuristics:
+            for ((target_id, heuristic), values) in self.heuristic_cache.items():
+                if isinstance(heuristic, str):
+                    target_position = self._get_board_position(target_id)
+                    sections.append(heuristic_header_struct.pack(heuristic.encode('ascii'), target_position))
+                    sections.append(_int32_bytes(self._get_board_heuristic_values(values)))
+                    number_of_heuristics = number_of_heuristics + 1
+
+        checksum = 0
+        for section in sections:
+            checksum = zlib.crc32(section, checksum)
+        header = header_struct.pack(GRAPH_FILE_MAGIC, GRAPH_FILE_VERSION, flags, self.number_of_rows, self.number_of_columns,
+                                    self._get_board_position(self.root_id), self._get_board_position(self.target_id),
+                                    self.get_number_of_vertexes(), len(targets), number_of_heuristics, checksum)
+        with open(filename, 'wb') as output_file:
+            output_file.write(header)
+            for section in sections:
+                output_file.write(section)
+
+    def _get_board_position(self, vertex_id):
+        """ Returns the board position (row * number_of_columns + column) of a vertex
+
+        Args:
+            vertex_id (int): The vertex id
+
+        Returns:
+            int: The board position
+        """
+        (row, column) = self.get_vertex_label_by_id(vertex_id)
+        return row * self.number_of_columns + column
+
+    def _get_board_adjacences(self):
+        """ Returns the adjacences in CSR form over board positions, as stored by CompactMazeGraph
+
+        Returns:
+            tuple(array[int], array[int]): Adjacence offsets (one per board position plus one) and targets
+        """
+        number_of_cells = self.number_of_rows * self.number_of_columns
+        offsets = array('i', [0]) * (number_of_cells + 1)
+        targets = array('i')
+        next_cell = 0 # First position whose offset is still unset
+        # Opened cells may break the board order of the ids, and sorting ids already in order is linear
+        for vertex_id in sorted(self.get_vertex_ids(), key=self._get_board_position):
+            cell = self._get_board_position(vertex_id)
+            offsets[next_cell:cell + 1] = array('i', [len(targets)]) * (cell + 1 - next_cell)
+            next_cell = cell + 1
+            targets.extend(self._get_board_position(neighbour_id) for neighbour_id in self.get_vertex_adjacence_by_id(vertex_id))
+        offsets[next_cell:] = array('i', [len(targets)]) * (number_of_cells + 1 - next_cell)
+        return (offsets, targets)
+
+    def _get_board_component_labels(self):
+        """ Returns the component labels indexed by board position, walls getting -1
+        """
+        return label_components(self.get_free_cell_mask(), self.number_of_rows, self.number_of_columns)
+
+    def _get_board_heuristic_values(self, values):
+        """ Maps heuristic values indexed by vertex id to values indexed by board position. Walls get 0.
+
+        Args:
+            values (array[int]): Heuristic values indexed by vertex id
+
+        Returns:
+            array[int]: Heuristic values indexed by board position
+        """
+        board_values = array('i', [0]) * (self.number_of_rows * self.number_of_columns)
+        for vertex_id in self.get_vertex_ids():
+            board_values[self._get_board_position(vertex_id)] = values[vertex_id]
+        return board_values
+
+    def get_board_cell(self, row, column):
+        """ Returns the input character at a given board position
+
+        Args:
+            row (int): Row index
+            column (int): Column index
+
+        Returns:
+            str: One of '-', '*', '#' or '$'
+        """
+        cell = self.maze_text_info[row][column]
+        return cell if isinstance(cell, str) else chr(cell)
+
+    def add_solution(self, list_of_positions):
+        self.solution_path = list_of_positions
+
+    def print_maze(self, fps=30, cells_per_second=100):
+        """ Shows the board and the solution path in the terminal, see Render.MazeViewer
+
+        Args:
+            fps (int, optional): Frames drawn per second. Defaults to 30.
+            cells_per_second (int, optional): Path positions walked per second. Defaults to 100.
+        """
+        from Render import MazeViewer # Only loaded, with curses, when a board is shown
+        MazeViewer(self, self.solution_path, fps, cells_per_second).show()
+
+
+class CompactMazeGraph(MazeGraph):
+    """ Memory-compact version of MazeGraph. Instead of one MazeVertex object per free position,
+    the board is kept as a flat byte buffer and the adjacences in CSR (compressed sparse row) form:
+    the neighbours of vertex 'v' are 'adjacence_targets[adjacence_offsets[v]:adjacence_offsets[v + 1]]'.
+    Vertex ids are the flat board indexes (row * number_of_columns + column), so ids and labels are
+    converted with plain arithmetic. The reading interface is the same as MazeGraph's.
+    """
+    WALL = ord('-')
+
+    def __init__(self, maze_as_list_of_lines):
+        """ Class constructor
+
+        Args:
+            maze_as_list_of_lines (list[list[str]]): A list of lines, each line being a list of strings with lenght 1.
+        """
+        self.board = bytearray() # One byte per board position, holding the input character
+        self.adjacence_offsets = array('i') # Start of each vertex adjacences in 'adjacence_targets'
+        self.adjacence_targets = array('i') # Adjacences ids of every vertex, concatenated
+        self.adjacence_overrides = {} # Adjacences of the vertexes changed by open_cell and close_cell
+        self.number_of_vertexes = 0
+        super().__init__(maze_as_list_of_lines)
+
+    def _build_graph_from_text(self):
+        """ Private function, automatically called from the constructor. Fills 'board', the CSR
+            adjacence arrays, 'root_id' and 'target_id'. The character matrix is released afterwards.
+        """
+        number_of_rows = self.number_of_rows
+        number_of_columns = self.number_of_columns
+        number_of_cells = number_of_rows * number_of_columns
+
+        board = self._board_as_bytes()
+        if not isinstance(board, bytearray):
+            board = bytearray(board)
+        self.board = board
+
+        # As in MazeGraph, the last '#' and '$' found on the board are used
+        self.root_id = board.rfind(b'#')
+        self.target_id = board.rfind(b'$')
+        self._set_board_cell_costs(board)
+
+        # Adjacences are stored in the same order MazeGraph uses: up, right, down, left.
+        # Walls have no adjacences, so each run of walls shares the offset of the next free position
+        # The flags are computed in bands of rows to bound memory on very large boards
+        offsets = array('i', [0]) * (number_of_cells + 1)
+        targets = array('i')
+        next_cell = 0 # First position whose offset is still unset
+        free_cell_pattern = re.compile(rb'[^-]')
+        for (band_start, adjacence_flags) in iter_adjacence_flags(board, number_of_rows, number_of_columns):
+            for match in free_cell_pattern.finditer(board, band_start, band_start + len(adjacence_flags)):
+                cell = match.start()
+                cell_flags = adjacence_flags[cell - band_start]
+                offsets[next_cell:cell + 1] = array('i', [len(targets)]) * (cell + 1 - next_cell)
+                next_cell = cell + 1
+                self.number_of_vertexes = self.number_of_vertexes + 1
+                if cell_flags & UP_ADJACENCE:
+                    targets.append(cell - number_of_columns)
+                if cell_flags & RIGHT_ADJACENCE:
+                    targets.append(cell + 1)
+                if cell_flags & DOWN_ADJACENCE:
+                    targets.append(cell + number_of_columns)
+                if cell_flags & LEFT_ADJACENCE:
+                    targets.append(cell - 1)
+        offsets[next_cell:] = array('i', [len(targets)]) * (number_of_cells + 1 - next_cell)
+        self.adjacence_offsets = offsets
+        self.adjacence_targets = targets
+        self.last_added_id = number_of_cells - 1
+
+        # The character matrix is not needed anymore
+        self.maze_text_info = None
+
+        # Ensures the board has a starting and ending point
+        if (self.root_id == -1):
+            print("ERROR: Maze has no starting point.")
+            exit(-1)
+        if (self.target_id == -1):
+            print("ERROR: Maze has no ending point.")
+            exit(-1)
+
+    def get_vertex_adjacence_by_id(self, vertex_id):
+        """ Search the vertex list of adjacences by id
+
+        Args:
+            vertex_id (int): The vertex id to search
+
+        Returns:
+            array[int]: The adjacences ids
+        """
+        if self.adjacence_overrides and vertex_id in self.adjacence_overrides:
+            return self.adjacence_overrides[vertex_id]
+        return self.adjacence_targets[self.adjacence_offsets[vertex_id]:self.adjacence_offsets[vertex_id + 1]]
+
+    def get_vertex_label_by_id(self, vertex_id):
+        """ Returns the board position of a vertex
+
+        Args:
+            vertex_id (int): The vertex id
+
+        Returns:
+            tuple(int, int): The vertex label (row, column)
+        """
+        return divmod(vertex_id, self.number_of_columns)
+
+    def get_vertex_id_by_label(self, vertex_label):
+        """ Returns the id of the vertex at a given board position
+
+        Args:
+            vertex_label (tuple(int, int)): The vertex label (row, column)
+
+        Returns:
+            int: The vertex id. Raises KeyError if the position is not a free vertex
+        """
+        (row, column) = vertex_label
+        if not (0 <= row < self.number_of_rows and 0 <= column < self.number_of_columns):
+            raise KeyError(vertex_label)
+        vertex_id = row * self.number_of_columns + column
+        if self.board[vertex_id] == self.WALL:
+            raise KeyError(vertex_label)
+        return vertex_id
+
+    def get_vertex_ids(self):
+        """ Returns every vertex id in the graph, in board (row-major) order
+
+        Returns:
+            iterable[int]: The vertexes ids
+        """
+        return (match.start() for match in re.finditer(rb'[^-]', self.board))
+
+    def get_number_of_vertexes(self):
+        """ Returns the number of vertexes (free board positions) in the graph
+
+        Returns:
+            int: Number of vertexes
+        """
+        return self.number_of_vertexes
+
+    def get_id_space_size(self):
+        """ Returns an exclusive upper bound for the vertexes ids. As ids are board indexes,
+        walls are part of the id space.
+
+        Returns:
+            int: Upper bound for vertex ids
+        """
+        return len(self.board)
+
+    def _compute_heuristic_values(self, target_id, heuristic_function):
+        """ Computes the heuristic value of every board position towards a target, walls included, as
+        vertexes ids are board positions. The heuristic only depends on the absolute differences to the
+        target, so each distinct row is computed once and copied wherever it repeats.
+
+        Args:
+            target_id (int): The target vertex id
+            heuristic_function (callable): Function of the absolute row and column differences
+
+        Returns:
+            array[int]: Heuristic values indexed by vertex id
+        """
+        (target_row, target_column) = self.get_vertex_label_by_id(target_id)
+        column_differences = [abs(target_column - column) for column in range(self.number_of_columns)]
+        rows_values = {}
+        board_values = array('i')
+        for row in range(self.number_of_rows):
+            row_difference = abs(target_row - row)
+            row_values = rows_values.get(row_difference)
+            if row_values is None:
+                row_values = array('i', [heuristic_function(row_difference, column_difference)
+                                         for column_difference in column_differences])
+                rows_values[row_difference] = row_values
+            board_values.extend(row_values)
+        return board_values
+
+    def get_free_cell_mask(self):
+        """ Returns the board as a free-cell mask, in row-major order
+
+        Returns:
+            bytes: One byte per board position, 1 if the position is free and 0 if it is a wall
+        """
+        return bytes(self.board.translate(_FREE_CELL_TABLE))
+
+    def _get_board_position(self, vertex_id):
+        """ Vertexes ids are board positions already
+        """
+        return vertex_id
+
+    def _set_board_cell(self, row, column, character):
+        """ Private method that changes one position of the board
+        """
+        self.board[row * self.number_of_columns + column] = ord(character)
+
+    def _add_vertex(self, vertex_label):
+        """ Private method that creates a vertex with no adjacences. Ids are board positions, so the
+            cached heuristic values stay valid.
+
+        Returns:
+            int: The new vertex id
+        """
+        self.number_of_vertexes = self.number_of_vertexes + 1
+        return vertex_label[0] * self.number_of_columns + vertex_label[1]
+
+    def _remove_vertex(self, vertex_id):
+        """ Private method that removes a vertex, whose position is already a wall on the board
+        """
+        self.number_of_vertexes = self.number_of_vertexes - 1
+
+    def _set_vertex_adjacences(self, vertex_id, adjacences):
+        """ Private method that replaces the adjacences of a vertex. The CSR arrays may be mapped from a
+            read-only graph file and can not grow in place, so changed vertexes are kept apart.
+        """
+        self.adjacence_overrides[vertex_id] = array('i', adjacences)
+
+    def _get_board_adjacences(self):
+        """ Returns the CSR adjacence arrays, which are already indexed by board position, merging the
+        changed vertexes if cells were opened or closed
+        """
+        if not self.adjacence_overrides:
+            return (self.adjacence_offsets, self.adjacence_targets)
+        number_of_cells = len(self.board)
+        offsets = array('i', [0]) * (number_of_cells + 1)
+        targets = array('i')
+        for vertex_id in range(number_of_cells):
+            offsets[vertex_id] = len(targets)
+            targets.extend(self.get_vertex_adjacence_by_id(vertex_id))
+        offsets[number_of_cells] = len(targets)
+        return (offsets, targets)
+
+    def _get_vertex_component_labels(self, board_labels):
+        """ Component labels are already indexed by board position
+        """
+        return board_labels
+
+    def _get_board_component_labels(self):
+        """ Component labels are already indexed by board position
+        """
+        return self.get_component_labels()
+
+    def _get_vertex_cell_costs(self, board_costs):
+        """ Cell costs are already indexed by board position
+        """
+        return bytearray(board_costs)
+
+    def _get_board_cell_costs(self):
+        """ Returns the cost of entering each board position, read from the board bytes
+        """
+        return self.board.translate(_CELL_COST_TABLE)
+
+    def _get_board_heuristic_values(self, values):
+        """ Heuristic values are already indexed by board position
+        """
+        return values
+
+    @classmethod
+    def load(cls, filename, verify=True):
+        """ Loads a graph saved by MazeGraph.save. The file is memory-mapped and its adjacence, component and
+        heuristic sections are used in place, so loading costs little more than unpacking the board mask.
+
+        Args:
+            filename (string): The path to the graph file
+            verify (bool, optional): Check the file checksum. Defaults to True.
+
+        Returns:
+            CompactMazeGraph: The loaded graph. Raises ValueError if the file is not a valid graph file.
+        """
+        import mmap
+        import zlib
+        (header_struct, heuristic_header_struct) = _graph_file_structs()
+        with open(filename, 'rb') as input_file:
+            mapped_file = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(mapped_file)
+
+        if len(buffer) < header_struct.size:
+            raise ValueError("{} is too short to be a graph file".format(filename))
+        (magic, version, flags, number_of_rows, number_of_columns, root_id, target_id, number_of_vertexes,
+         number_of_adjacences, number_of_heuristics, checksum) = header_struct.unpack_from(buffer, 0)
+        if magic != GRAPH_FILE_MAGIC:
+            raise ValueError("{} is not a graph file".format(filename))
+        if version != GRAPH_FILE_VERSION:
+            raise ValueError("{} has graph file version {}, expected {}".format(filename, version, GRAPH_FILE_VERSION))
+
+        number_of_cells = number_of_rows * number_of_columns
+        mask_size = (number_of_cells + 7) // 8
+        offsets_start = header_struct.size + mask_size + len(_padding(mask_size))
+        targets_start = offsets_start + 4 * (number_of_cells + 1)
+        components_start = targets_start + 4 * number_of_adjacences
+        costs_start = components_start + 4 * number_of_cells
+        heuristics_start = costs_start
+        if flags & GRAPH_FILE_WEIGHTED:
+            heuristics_start = costs_start + number_of_cells + len(_padding(number_of_cells))
+        heuristic_size = heuristic_header_struct.size + 4 * number_of_cells
+        if len(buffer) != heuristics_start + number_of_heuristics * heuristic_size:
+            raise ValueError("{} size does not match its header".format(filename))
+        if verify and zlib.crc32(buffer[header_struct.size:]) != checksum:
+            raise ValueError("{} checksum does not match its content".format(filename))
+
+        graph = cls.__new__(cls)
+        graph.maze_text_info = None
+        graph.vertexes_list = []
+        graph.vertex_id_label_mapping = {}
+        graph.root_id = root_id
+        graph.target_id = target_id
+        graph.last_added_id = number_of_cells - 1
+        graph.heuristic_cache = OrderedDict()
+        graph.distance_field_cache = OrderedDict()
+        graph.free_vertex_ids = []
+        graph.cache_lock = threading.Lock()
+        graph.adjacence_overrides = {}
+        graph.number_of_rows = number_of_rows
+        graph.number_of_columns = number_of_columns
+        graph.number_of_vertexes = number_of_vertexes
+        graph.mapped_file = mapped_file
+
+        if flags & GRAPH_FILE_WEIGHTED:
+            # The costs give the terrain digits back, and are 0 (a wall) wherever the mask is
+            graph.board = bytearray(buffer[costs_start:costs_start + number_of_cells]).translate(_COST_TO_CELL_TABLE)
+        else:
+            graph.board = _unpack_board(buffer[header_struct.size:header_struct.size + mask_size], number_of_cells)
+        graph.board[root_id] = ord('#')
+        graph.board[target_id] = ord('$')
+        graph.adjacence_offsets = _int32_section(buffer[offsets_start:targets_start])
+        graph.adjacence_targets = _int32_section(buffer[targets_start:components_start])
+        graph.component_labels = _int32_section(buffer[components_start:costs_start])
+        graph.cell_costs = None
+        graph.minimum_cell_cost = 1
+        if flags & GRAPH_FILE_WEIGHTED:
+            graph._set_cell_costs(graph._get_board_cell_costs())
+        graph.views = {}
+
+        for index in range(number_of_heuristics):
+            start = heuristics_start + index * heuristic_size
+            (name, heuristic_target_id) = heuristic_header_struct.unpack_from(buffer, start)
+            values = _int32_section(buffer[start + heuristic_header_struct.size:start + heuristic_size])
+            graph.heuristic_cache[(heuristic_target_id, name.rstrip(b'\x00').decode('ascii'))] = values
+
+        return graph
+
+    def get_board_cell(self, row, column):
+        """ Returns the input character at a given board position
+
+        Args:
+            row (int): Row index
+            column (int): Column index
+
+        Returns:
+            str: One of '-', '*', '#' or '$'
+        """
+        return chr(self.board[row * self.number_of_columns + column])
+
+
+class ContractedMazeGraph:
+    """ Corridor-contracted view of a maze graph. Junctions, dead ends and isolated vertexes (every vertex
+    whose degree is not 2) are kept as nodes, and each corridor of degree 2 vertexes between two nodes
+    becomes one weighted edge, whose cost is its number of moves. Mazes made of long one-wide corridors
+    shrink to a few nodes. Rings of degree 2 vertexes with no node get one of their vertexes as node.
+
+    Nodes do not depend on the starting and ending points: searchers attach points lying inside a
+    corridor to both corridor ends (see 'get_corridor_position'), so one view serves every query.
+    Corridor vertexes are stored once, in CSR form: the inner vertexes of corridor 'c', from its first
+    end to its second, are 'corridor_vertex_ids[corridor_offsets[c]:corridor_offsets[c + 1]]'.
+    """
+
+    def __init__(self, maze_graph):
+        """ Class constructor
+
+        Args:
+            maze_graph: The maze graph to contract. The view must be built again after its cells change,
+                see MazeGraph.get_contracted_graph.
+        """
+        self.maze_graph = maze_graph
+        self.node_vertex_ids = array('i') # Vertex id of each node
+        self.node_adjacences = [] # (neighbour node, cost, corridor) entries of each node, see 'get_node_adjacences'
+        self.corridor_ends = array('i') # First and second end nodes of each corridor
+        self.corridor_offsets = array('i', [0]) # Start of each corridor inner vertexes in 'corridor_vertex_ids'
+        self.corridor_vertex_ids = array('i') # Inner vertexes ids of every corridor, concatenated
+        id_space_size = maze_graph.get_id_space_size()
+        self.vertex_node = array('i', [-1]) * id_space_size # Node of each vertex id, -1 for other ids
+        self.vertex_corridor = array('i', [-1]) * id_space_size # Corridor of each inner corridor vertex id, else -1
+        self._contract()
+
+    def _contract(self):
+        """ Private method, automatically called from the constructor. Picks the nodes, then walks every
+            corridor leaving them.
+        """
+        maze_graph = self.maze_graph
+        expand = maze_graph.get_vertex_adjacence_by_id
+        vertex_node = self.vertex_node
+        vertex_ids = list(maze_graph.get_vertex_ids())
+        for vertex_id in vertex_ids:
+            if len(expand(vertex_id)) != 2:
+                self._add_node(vertex_id)
+
+        for node in range(len(self.node_vertex_ids)):
+            self._walk_corridors(node)
+
+        # Degree 2 vertexes still outside corridors form rings with no node
+        for vertex_id in vertex_ids:
+            if vertex_node[vertex_id] == -1 and self.vertex_corridor[vertex_id] == -1:
+                self._walk_corridors(self._add_node(vertex_id))
+
+    def _add_node(self, vertex_id):
+        """ Private method that turns a vertex into a node
+
+            Returns:
+                int: The new node
+        """
+        node = len(self.node_vertex_ids)
+        self.node_vertex_ids.append(vertex_id)
+        self.node_adjacences.append([])
+        self.vertex_node[vertex_id] = node
+        return node
+
+    def _walk_corridors(self, node):
+        """ Private method that adds the corridors leaving a node which were not walked from their other
+            end yet. Corridors are walked from their lowest (node, first step) end, so each one is added once.
+        """
+        expand = self.maze_graph.get_vertex_adjacence_by_id
+        vertex_node = self.vertex_node
+        vertex_corridor = self.vertex_corridor
+        corridor_vertex_ids = self.corridor_vertex_ids
+        node_vertex_id = self.node_vertex_ids[node]
+        for first_id in expand(node_vertex_id):
+            if vertex_corridor[first_id] != -1:
+                continue # Walked from its other end
+            end = vertex_node[first_id]
+            if end != -1 and end < node:
+                continue # Edge between two nodes, added from its lowest node
+
+            corridor = len(self.corridor_ends) // 2
+            previous_id = node_vertex_id
+            vertex_id = first_id
+            while vertex_node[vertex_id] == -1:
+                corridor_vertex_ids.append(vertex_id)
+                vertex_corridor[vertex_id] = corridor
+                (next_id, other_id) = expand(vertex_id)
+                (previous_id, vertex_id) = (vertex_id, next_id if next_id != previous_id else other_id)
+            end = vertex_node[vertex_id]
+            cost = len(corridor_vertex_ids) - self.corridor_offsets[corridor] + 1
+            self.corridor_offsets.append(len(corridor_vertex_ids))
+            self.corridor_ends.append(node)
+            self.corridor_ends.append(end)
+            # Negative (~corridor) entries walk the corridor from its second end
+            self.node_adjacences[node].append((end, cost, corridor))
+            self.node_adjacences[end].append((node, cost, ~corridor))
+
+    def get_number_of_nodes(self):
+        """ Returns the number of nodes in the view
+
+        Returns:
+            int: Number of nodes
+        """
+        return len(self.node_vertex_ids)
+
+    def get_number_of_corridors(self):
+        """ Returns the number of corridors (weighted edges) in the view
+
+        Returns:
+            int: Number of corridors
+        """
+        return len(self.corridor_ends) // 2
+
+    def get_node_vertex_id(self, node):
+        """ Returns the vertex id of a node
+
+        Args:
+            node (int): The node
+
+        Returns:
+            int: The vertex id
+        """
+        return self.node_vertex_ids[node]
+
+    def get_node_adjacences(self, node):
+        """ Returns the corridors leaving a node
+
+        Args:
+            node (int): The node
+
+        Returns:
+            list[tuple(int, int, int)]: (neighbour node, cost, corridor) entries. The corridor is ~corridor
+                (a negative value) when the node is its second end.
+        """
+        return self.node_adjacences[node]
+
+    def get_corridor_vertex_ids(self, corridor):
+        """ Returns the inner vertexes of a corridor, in walking order
+
+        Args:
+            corridor (int): The corridor, or ~corridor to walk it from its second end
+
+        Returns:
+            array[int]: The inner vertexes ids, the corridor ends excluded
+        """
+        index = corridor if corridor >= 0 else ~corridor
+        corridor_vertex_ids = self.corridor_vertex_ids[self.corridor_offsets[index]:self.corridor_offsets[index + 1]]
+        if corridor < 0:
+            corridor_vertex_ids.reverse()
+        return corridor_vertex_ids
+
+    def get_corridor_position(self, vertex_id):
+        """ Tells how to reach a vertex from the nodes: a node is reached from itself, and an inner corridor
+        vertex from both corridor ends
+
+        Args:
+            vertex_id (int): The vertex id
+
+        Returns:
+            list[tuple(int, int, int, int)]: (node, cost, corridor, position) entries, one per way in. 'cost'
+                is the number of moves from the node to the vertex, and the vertex is at index 'position' of
+                get_corridor_vertex_ids(corridor). Corridor and position are None for a node.
+        """
+        node = self.vertex_node[vertex_id]
+        if node != -1:
+            return [(node, 0, None, None)]
+        corridor = self.vertex_corridor[vertex_id]
+        start = self.corridor_offsets[corridor]
+        length = self.corridor_offsets[corridor + 1] - start
+        position = self.corridor_vertex_ids[start:start + length].index(vertex_id)
+        return [(self.corridor_ends[2 * corridor], position + 1, corridor, position),
+                (self.corridor_ends[2 * corridor + 1], length - position, ~corridor, length - 1 - position)]
+
+
+class HierarchicalMazeGraph:
+    """ Abstract graph for hierarchical path finding (HPA*). The board is split into square clusters of
+    'cluster_size' positions. Where two clusters touch, every run of free position pairs facing each other
+    across the border is an entrance, crossed through its middle pair, or through both end pairs if it is
+    at least ENTRANCE_SPLIT_LENGTH long. The positions of these pairs are the abstract nodes: pairs are
+    linked by a move costing 1, and the nodes of a cluster by their distance inside the cluster, found once
+    by a BFS limited to the cluster. Searchers link the start and the exit to the nodes of their clusters
+    the same way, search the small abstract graph and refine each abstract edge inside one cluster.
+
+    Distances are cached per cluster: when a cell is opened or closed, only its cluster is searched again,
+    along with the clusters next to it when the cell is on a cluster border, as their entrances may change.
+    """
+    ENTRANCE_SPLIT_LENGTH = 6
+    # Directions of the next cluster across a border
+    EAST = "east"
+    SOUTH = "south"
+
+    def __init__(self, maze_graph, cluster_size=16):
+        """ Class constructor
+
+        Args:
+            maze_graph: The maze graph to abstract
+            cluster_size (int, optional): Number of rows and columns of each cluster. Defaults to 16.
+        """
+        self.maze_graph = maze_graph
+        self.cluster_size = cluster_size
+        self.number_of_cluster_rows = -(-maze_graph.number_of_rows // cluster_size)
+        self.number_of_cluster_columns = -(-maze_graph.number_of_columns // cluster_size)
+        number_of_clusters = self.number_of_cluster_rows * self.number_of_cluster_columns
+        self.border_transitions = {} # (cluster, next cluster, direction) -> (vertex id, next vertex id) pairs crossing their border
+        self.transitions = {} # Node -> nodes one move away in other clusters
+        self.cluster_nodes = [[] for cluster in range(number_of_clusters)] # Node vertex ids of each cluster
+        self.cluster_edges = [{} for cluster in range(number_of_clusters)] # Node -> (node, distance) entries, by cluster
+        self.cluster_paths = [{} for cluster in range(number_of_clusters)] # (node, node) -> refined path, filled by queries
+
+        for cluster in range(number_of_clusters):
+            for border in self._get_next_clusters(cluster):
+                self._find_transitions(border)
+        for cluster in range(number_of_clusters):
+            self._update_cluster(cluster)
+
+    def get_cluster(self, vertex_id):
+        """ Returns the cluster of a vertex
+
+        Args:
+            vertex_id (int): The vertex id
+
+        Returns:
+            int: The cluster, numbered in row-major order
+        """
+        (row, column) = self.maze_graph.get_vertex_label_by_id(vertex_id)
+        return (row // self.cluster_size) * self.number_of_cluster_columns + column // self.cluster_size
+
+    def get_number_of_nodes(self):
+        """ Returns the number of abstract nodes
+
+        Returns:
+            int: Number of nodes
+        """
+        return sum(len(nodes) for nodes in self.cluster_nodes)
+
+    def get_node_adjacences(self, node):
+        """ Returns the abstract edges leaving a node
+
+        Args:
+            node (int): The node vertex id
+
+        Returns:
+            list[tuple(int, int)]: (node, cost) entries, the nodes of the same cluster first
+        """
+        return self.cluster_edges[self.get_cluster(node)].get(node, []) + [(next_node, 1) for next_node in self.transitions.get(node, ())]
+
+    def get_entry_edges(self, vertex_id):
+        """ Links a vertex to the nodes of its cluster, as searchers do for the start and the exit
+
+        Args:
+            vertex_id (int): The vertex id
+
+        Returns:
+            dict[int, int]: Distance inside the cluster from the vertex to each node it reaches
+        """
+        cluster = self.get_cluster(vertex_id)
+        distance = self._search_cluster(vertex_id, cluster)[0]
+        return {node: distance[node] for node in self.cluster_nodes[cluster] if node in distance}
+
+    def get_cluster_distance(self, vertex_id, other_vertex_id):
+        """ Returns the distance between two vertexes of a cluster, walking inside the cluster
+
+        Returns:
+            int: The distance, or None if the cluster does not link them
+        """
+        return self._search_cluster(vertex_id, self.get_cluster(vertex_id))[0].get(other_vertex_id)
+
+    def get_cluster_path(self, vertex_id, other_vertex_id):
+        """ Refines an abstract edge: returns a shortest path between two vertexes of a cluster, walking
+        inside the cluster, or across the border if they are the two positions of a transition
+
+        Returns:
+            list[int]: Vertex ids of the path, both ends included, or None if the cluster does not link them
+        """
+        if other_vertex_id in self.transitions.get(vertex_id, ()):
+            return [vertex_id, other_vertex_id]
+        cluster = self.get_cluster(vertex_id)
+        cluster_paths = self.cluster_paths[cluster]
+        path = cluster_paths.get((vertex_id, other_vertex_id))
+        if path is not None:
+            return path
+
+        parent = self._search_cluster(vertex_id, cluster)[1]
+        if other_vertex_id not in parent:
+            return None
+        path = []
+        vertex_path_id = other_vertex_id
+        while vertex_path_id is not None:
+            path.append(vertex_path_id)
+            vertex_path_id = parent[vertex_path_id]
+        path.reverse()
+        # Paths between nodes are kept until the cluster changes, those from the start or to the exit are not
+        if vertex_id in self.cluster_edges[cluster] and other_vertex_id in self.cluster_edges[cluster]:
+            cluster_paths[(vertex_id, other_vertex_id)] = path
+        return path
+
+    def update_cell(self, vertex_label):
+        """ Updates the abstraction after a cell was opened or closed: the cluster of the cell is searched
+        again, and if the cell is on the cluster border, the entrances of that border and the clusters
+        whose nodes changed too
+
+        Args:
+            vertex_label (tuple(int, int)): The board position (row, column)
+        """
+        (row, column) = vertex_label
+        cluster_size = self.cluster_size
+        cluster = (row // cluster_size) * self.number_of_cluster_columns + column // cluster_size
+        changed_clusters = {cluster}
+        if row % cluster_size in (0, cluster_size - 1) or column % cluster_size in (0, cluster_size - 1):
+            for border in self._get_borders(cluster):
+                old_transitions = self.border_transitions.get(border, [])
+                if self._find_transitions(border) != old_transitions:
+                    changed_clusters.update(border[:2])
+        for changed_cluster in changed_clusters:
+            self._update_cluster(changed_cluster)
+
+    def _get_next_clusters(self, cluster):
+        """ Private method that returns the (cluster, next cluster, direction) borders with the clusters after a
+            cluster, to its right (EAST) and below it (SOUTH)
+        """
+        (cluster_row, cluster_column) = divmod(cluster, self.number_of_cluster_columns)
+        borders = []
+        if cluster_column + 1 < self.number_of_cluster_columns:
+            borders.append((cluster, cluster + 1, self.EAST))
+        if cluster_row + 1 < self.number_of_cluster_rows:
+            borders.append((cluster, cluster + self.number_of_cluster_columns, self.SOUTH))
+        return borders
+
+    def _get_borders(self, cluster):
+        """ Private method that returns the (cluster, next cluster, direction) borders of a cluster, on its four sides
+        """
+        (cluster_row, cluster_column) = divmod(cluster, self.number_of_cluster_columns)
+        borders = self._get_next_clusters(cluster)
+        if cluster_column > 0:
+            borders.append((cluster - 1, cluster, self.EAST))
+        if cluster_row > 0:
+            borders.append((cluster - self.number_of_cluster_columns, cluster, self.SOUTH))
+        return borders
+
+    def _get_vertex_id(self, row, column):
+        """ Private method that returns the vertex id at a board position, or None for a wall
+        """
+        try:
+            return self.maze_graph.get_vertex_id_by_label((row, column))
+        except KeyError:
+            return None
+
+    def _find_transitions(self, border):
+        """ Private method that finds the entrances of a (cluster, next cluster, direction) border,
+            replacing its transitions
+
+            Returns:
+                list[tuple(int, int)]: The border (vertex id, next vertex id) transition pairs
+        """
+        cluster_size = self.cluster_size
+        (cluster_row, cluster_column) = divmod(border[0], self.number_of_cluster_columns)
+        if border[2] == self.EAST:
+            # Vertical border: pairs of positions in the last column of the cluster and the first of the next
+            column = cluster_column * cluster_size + cluster_size - 1
+            first_row = cluster_row * cluster_size
+            positions = [((row, column), (row, column + 1))
+                         for row in range(first_row, min(first_row + cluster_size, self.maze_graph.number_of_rows))]
+        else:
+            row = cluster_row * cluster_size + cluster_size - 1
+            first_column = cluster_column * cluster_size
+            positions = [((row, column), (row + 1, column))
+                         for column in range(first_column, min(first_column + cluster_size, self.maze_graph.number_of_columns))]
+
+        # Runs of consecutive pairs with both positions free
+        runs = []
+        run = []
+        for (position, next_position) in positions:
+            pair = (self._get_vertex_id(*position), self._get_vertex_id(*next_position))
+            if pair[0] is not None and pair[1] is not None:
+                run.append(pair)
+            elif run:
+                runs.append(run)
+                run = []
+        if run:
+            runs.append(run)
+
+        border_transitions = []
+        for run in runs:
+            if len(run) >= self.ENTRANCE_SPLIT_LENGTH:
+                border_transitions.extend([run[0], run[-1]])
+            else:
+                border_transitions.append(run[len(run) // 2])
+
+        for (vertex_id, next_vertex_id) in self.border_transitions.get(border, []):
+            self.transitions[vertex_id].remove(next_vertex_id)
+            self.transitions[next_vertex_id].remove(vertex_id)
+        for (vertex_id, next_vertex_id) in border_transitions:
+            self.transitions.setdefault(vertex_id, []).append(next_vertex_id)
+            self.transitions.setdefault(next_vertex_id, []).append(vertex_id)
+        self.border_transitions[border] = border_transitions
+        return border_transitions
+
+    def _update_cluster(self, cluster):
+        """ Private method that gathers the nodes of a cluster from its borders transitions and finds the
+            distances between them
+        """
+        nodes = set()
+        for border in self._get_borders(cluster):
+            for pair in self.border_transitions.get(border, ()):
+                nodes.add(pair[0] if border[0] == cluster else pair[1])
+        nodes = sorted(nodes)
+        self.cluster_nodes[cluster] = nodes
+
+        edges = {}
+        for node in nodes:
+            distance = self._search_cluster(node, cluster)[0]
+            edges[node] = [(other_node, distance[other_node]) for other_node in nodes
+                           if other_node != node and other_node in distance]
+        self.cluster_edges[cluster] = edges
+        self.cluster_paths[cluster] = {}
+
+    def _search_cluster(self, vertex_id, cluster):
+        """ Private method that runs a BFS from a vertex, not leaving its cluster
+
+            Returns:
+                tuple(dict[int, int], dict[int, int]): Distance and parent of each vertex id reached
+        """
+        maze_graph = self.maze_graph
+        cluster_size = self.cluster_size
+        (cluster_row, cluster_column) = divmod(cluster, self.number_of_cluster_columns)
+        (first_row, first_column) = (cluster_row * cluster_size, cluster_column * cluster_size)
+        distance = {vertex_id: 0}
+        parent = {vertex_id: None}
+        queue = [vertex_id]
+        for current_id in queue:
+            neighbor_distance = distance[current_id] + 1
+            for neighbor_id in maze_graph.get_vertex_adjacence_by_id(current_id):
+                if neighbor_id in distance:
+                    continue
+                (row, column) = maze_graph.get_vertex_label_by_id(neighbor_id)
+                if first_row <= row < first_row + cluster_size and first_column <= column < first_column + cluster_size:
+                    distance[neighbor_id] = neighbor_distance
+                    parent[neighbor_id] = current_id
+                    queue.append(neighbor_id)
+        return (distance, parent)
+
+
+class MazeBoardView:
+    """ Read-only view of a board stored in a memory-mapped input file. Rows are served as zero-copy
+    memoryview slices of the file, so no per-position string is ever created. Indexing the view
+    ('view[row][column]') returns the byte value of a position.
+    """
+
+    def __init__(self, mapped_file, first_row_offset, row_stride, number_of_rows, number_of_columns):
+        """ Class constructor
+
+        Args:
+            mapped_file (mmap.mmap): The mapped input file
+            first_row_offset (int): Offset of the first board row in the file
+            row_stride (int): Distance in bytes between the start of two consecutive rows (line break included)
+            number_of_rows (int): Number of board rows
+            number_of_columns (int): Number of board columns
+        """
+        self.mapped_file = mapped_file
+        self.buffer = memoryview(mapped_file)
+        self.first_row_offset = first_row_offset
+        self.row_stride = row_stride
+        self.number_of_rows = number_of_rows
+        self.number_of_columns = number_of_columns
+
+    def __len__(self):
+        return self.number_of_rows
+
+    def __getitem__(self, row):
+        """ Returns one board row
+
+        Args:
+            row (int): Row index
+
+        Returns:
+            memoryview: The row bytes, without the line break
+        """
+        if not 0 <= row < self.number_of_rows:
+            raise IndexError(row)
+        start = self.first_row_offset + row * self.row_stride
+        return self.buffer[start:start + self.number_of_columns]
+
+    def to_board_bytes(self):
+        """ Copies the board into a flat buffer, one byte per position in row-major order
+
+        Returns:
+            bytearray: The flattened board
+        """
+        number_of_columns = self.number_of_columns
+        board = bytearray(self.number_of_rows * number_of_columns)
+        for row in range(self.number_of_rows):
+            start = self.first_row_offset + row * self.row_stride
+            board[row * number_of_columns:(row + 1) * number_of_columns] = self.buffer[start:start + number_of_columns]
+        return board
+
+
+class MazeReader:
+    """ A class to read mazes from input files into a format the MazeGraph class can parse.
+    """
+    def __init__(self):
+        pass
+
+    def read_from_file(self, filename):
+        """ Given a filename, returns the maze in a representation compatible with MazeGraph class
+
+        Args:
+            filename (string): The path to input file
+
+        Returns:
+            list[list[string]]: A two dimensional matrix of characters
+        """
+        try:
+            with open(filename) as input_file:
+                content = input_file.readlines()
+        except Exception as e:
+            print("Could not open input file: {}".format(e.args))
+            exit(-1)
+
+        return self.read_from_lines(content)
+
+    def read_from_lines(self, content):
+        """ Given the lines of an input file, as read from a file or the standard input, returns the maze in
+        a representation compatible with MazeGraph class
+
+        Args:
+            content (iterable[string]): The input lines, the 'rows columns' header first
+
+        Returns:
+            list[list[string]]: A two dimensional matrix of characters
+        """
+        content = iter(content)
+        next(content, None) # Header
+        maze_board = []
+        for line_content in content:
+            line_content = line_content.rstrip('\n')
+            maze_line = []
+            for block in line_content:
+                maze_line.append(block)
+            maze_board.append(maze_line)
+
+        return maze_board
+
+    def map_file(self, filename):
+        """ Given a filename, maps the file in memory and returns a view of its board. The board size is
+        taken from the 'rows columns' header and every line is checked against it.
+
+        Args:
+            filename (string): The path to input file
+
+        Returns:
+            MazeBoardView: The mapped board, accepted by MazeGraph and CompactMazeGraph
+        """
+        import mmap
+        try:
+            with open(filename, 'rb') as input_file:
+                mapped_file = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception as e:
+            print("Could not open input file: {}".format(e.args))
+            exit(-1)
+
+        header_end = mapped_file.find(b'\n')
+        try:
+            (number_of_rows, number_of_columns) = (int(value) for value in mapped_file[:header_end].split())
+        except ValueError:
+            print("Invalid input file header in {}. Expected 'rows columns'.".format(filename))
+            exit(-1)
+
+        # Rows are laid out at a fixed stride, given by the first row line break ('\n' or '\r\n')
+        first_row_offset = header_end + 1
+        line_break = b'\r\n' if mapped_file[first_row_offset + number_of_columns:first_row_offset + number_of_columns + 1] == b'\r' else b'\n'
+        row_stride = number_of_columns + len(line_break)
+        body_size = len(mapped_file) - first_row_offset
+        expected_size = number_of_rows * row_stride
+        # The last line break is optional
+        if body_size not in (expected_size, expected_size - len(line_break)):
+            print("Input file {} does not match its header size {}x{}.".format(filename, number_of_rows, number_of_columns))
+            exit(-1)
+        for row in range(number_of_rows - 1):
+            line_end = first_row_offset + row * row_stride + number_of_columns
+            if mapped_file[line_end:line_end + len(line_break)] != line_break:
+                print("Input file {} line {} does not have {} columns.".format(filename, row + 2, number_of_columns))
+                exit(-1)
+
+        return MazeBoardView(mapped_file, first_row_offset, row_stride, number_of_rows, number_of_columns)
@@ -0,0 +1,281 @@
+import re
+import struct
+import time
+import zlib
+
+curses = None # Imported by MazeViewer.show, so exporting images works without a terminal library
+
+# Codes of each board position in the rows yielded by 'iter_cell_codes'. Walls and free positions
+# get the values of the free-cell mask, so mask rows are code rows already
+WALL_CODE = 0
+FREE_CODE = 1
+START_CODE = 2
+END_CODE = 3
+PATH_CODE = 4
+
+PALETTE = ((0, 0, 0), (255, 255, 255), (0, 0, 255), (255, 0, 0), (255, 255, 0)) # RGB color of each code
+ANSI_BACKGROUNDS = ('\x1b[40m', '\x1b[47m', '\x1b[44m', '\x1b[41m', '\x1b[43m') # Terminal color of each code
+ANSI_RESET = '\x1b[0m'
+
+# One translation table per RGB channel, mapping cell codes to the channel value
+_CHANNEL_TABLES = tuple(bytes(PALETTE[code][channel] if code < len(PALETTE) else 0 for code in range(256))
+                        for channel in range(3))
+_RUN_PATTERN = re.compile(b'|'.join(re.escape(bytes([code])) + b'+' for code in range(len(PALETTE))))
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_CHUNK_SIZE = 1 << 20 # Compressed bytes gathered before an IDAT chunk is written
+
+
+def iter_cell_codes(maze_graph, solution_path=None):
+    """ Yields the board rows as cell codes, the solution path drawn over the free positions and the
+    starting and ending points over the path. Each row is built from a slice of the free-cell mask,
+    so only the path positions are handled one by one.
+
+        Args:
+            maze_graph: The maze graph
+            solution_path (list[tuple(int, int)], optional): Labels of the path positions. Defaults to None.
+
+        Yields:
+            bytearray: One code per position of a row, from the first row to the last
+    """
+    number_of_columns = maze_graph.number_of_columns
+    free_cell_mask = maze_graph.get_free_cell_mask()
+    marks = {}
+    for (row, column) in solution_path or ():
+        marks.setdefault(row, []).append((column, PATH_CODE))
+    for (vertex_id, code) in ((maze_graph.root_id, START_CODE), (maze_graph.target_id, END_CODE)):
+        (row, column) = maze_graph.get_vertex_label_by_id(vertex_id)
+        marks.setdefault(row, []).append((column, code))
+
+    for row in range(maze_graph.number_of_rows):
+        codes = bytearray(free_cell_mask[row * number_of_columns:(row + 1) * number_of_columns])
+        for (column, code) in marks.get(row, ()):
+            codes[column] = code
+        yield codes
+
+
+def _pixel_row(codes, scale):
+    """ Converts a row of cell codes into RGB pixels, each cell 'scale' pixels wide. Every channel is
+    translated at once and interleaved through extended slices.
+    """
+    pixels = bytearray(3 * scale * len(codes))
+    for (channel, table) in enumerate(_CHANNEL_TABLES):
+        values = codes.translate(table)
+        for repeat in range(scale):
+            pixels[3 * repeat + channel::3 * scale] = values
+    return pixels
+
+
+def write_ppm(maze_graph, output_file, solution_path=None, scale=1):
+    """ Writes the board as a binary PPM (P6) image, one row at a time
+
+        Args:
+            maze_graph: The maze graph
+            output_file: Binary file object
+            solution_path (list[tuple(int, int)], optional): Labels of the path positions. Defaults to None.
+            scale (int, optional): Pixels per cell side. Defaults to 1.
+    """
+    output_file.write("P6\n{} {}\n255\n".format(maze_graph.number_of_columns * scale,
+                                                  maze_graph.number_of_rows * scale).encode('ascii'))
+    for codes in iter_cell_codes(maze_graph, solution_path):
+        pixels = _pixel_row(codes, scale)
+        for repeat in range(scale):
+            output_file.write(pixels)
+
+
+def _write_png_chunk(output_file, kind, data):
+    """ Writes one PNG chunk: length, kind, data and CRC
+    """
+    output_file.write(struct.pack('>I', len(data)))
+    output_file.write(kind)
+    output_file.write(data)
+    output_file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+
+def write_png(maze_graph, output_file, solution_path=None, scale=1, level=6):
+    """ Writes the board as an RGB PNG image. Rows are compressed as they are built and written in
+    IDAT chunks of about PNG_CHUNK_SIZE bytes, so the whole image is never held in memory.
+
+        Args:
+            maze_graph: The maze graph
+            output_file: Binary file object
+            solution_path (list[tuple(int, int)], optional): Labels of the path positions. Defaults to None.
+            scale (int, optional): Pixels per cell side. Defaults to 1.
+            level (int, optional): zlib compression level. Defaults to 6.
+    """
+    output_file.write(PNG_SIGNATURE)
+    # Width, height, 8 bits per channel, RGB color, deflate compression, adaptive filtering, no interlace
+    _write_png_chunk(output_file, b'IHDR', struct.pack('>IIBBBBB', maze_graph.number_of_columns * scale,
+                                                       maze_graph.number_of_rows * scale, 8, 2, 0, 0, 0))
+    compressor = zlib.compressobj(level)
+    pending = bytearray()
+    for codes in iter_cell_codes(maze_graph, solution_path):
+        scanline = b'\x00' + _pixel_row(codes, scale) # Filter type 0 (none)
+        for repeat in range(scale):
+            pending += compressor.compress(scanline)
+        if len(pending) >= PNG_CHUNK_SIZE:
+            _write_png_chunk(output_file, b'IDAT', bytes(pending))
+            pending.clear()
+    pending += compressor.flush()
+    _write_png_chunk(output_file, b'IDAT', bytes(pending))
+    _write_png_chunk(output_file, b'IEND', b'')
+
+
+def iter_ansi_lines(maze_graph, solution_path=None):
+    """ Yields the board as terminal lines colored with ANSI escape codes. Each cell is two spaces
+    wide, so cells look square, and a single escape code is written per run of equal cells.
+
+        Args:
+            maze_graph: The maze graph
+            solution_path (list[tuple(int, int)], optional): Labels of the path positions. Defaults to None.
+
+        Yields:
+            str: One line per board row, without the line break
+    """
+    for codes in iter_cell_codes(maze_graph, solution_path):
+        yield ''.join(ANSI_BACKGROUNDS[run[0]] + '  ' * len(run) for run in _RUN_PATTERN.findall(codes)) + ANSI_RESET
+
+
+def render_ansi(maze_graph, solution_path=None):
+    """ Returns the board as an ANSI colored frame, see 'iter_ansi_lines'
+
+        Returns:
+            str: The frame, one line per board row
+    """
+    return '\n'.join(iter_ansi_lines(maze_graph, solution_path)) + '\n'
+
+
+def export_solution(maze_graph, filename, solution_path=None, scale=1):
+    """ Writes the board and a solution path to a file, picking the format from the file extension:
+    '.png', '.ppm', or an ANSI colored text frame for any other extension
+
+        Args:
+            maze_graph: The maze graph
+            filename (string): The path to the output file
+            solution_path (list[tuple(int, int)], optional): Labels of the path positions. Defaults to None.
+            scale (int, optional): Pixels per cell side of the images. Defaults to 1.
+    """
+    if filename.endswith('.png'):
+        with open(filename, 'wb') as output_file:
+            write_png(maze_graph, output_file, solution_path, scale)
+    elif filename.endswith('.ppm'):
+        with open(filename, 'wb') as output_file:
+            write_ppm(maze_graph, output_file, solution_path, scale)
+    else:
+        with open(filename, 'w') as output_file:
+            for line in iter_ansi_lines(maze_graph, solution_path):
+                output_file.write(line + '\n')
+
+
+class MazeViewer:
+    """ Curses viewer of a maze and its solution path. The board is drawn once into a pad, with one
+    call per run of equal cells, and shown through a viewport, so boards larger than the terminal can
+    be inspected (arrow keys scroll, any other key quits). The path is then animated at a fixed frame
+    rate: each frame only draws the path positions walked since the previous one and pushes the
+    changes with a single screen update. Keys are polled without blocking.
+    """
+
+    def __init__(self, maze_graph, solution_path=None, fps=30, cells_per_second=100):
+        """ Class constructor
+
+        Args:
+            maze_graph: The maze graph
+            solution_path (list[tuple(int, int)], optional): Labels of the path positions. Defaults to None.
+            fps (int, optional): Frames drawn per second. Defaults to 30.
+            cells_per_second (int, optional): Path positions walked per second, 0 to draw the whole path
+                in the first frame. Defaults to 100.
+        """
+        self.maze_graph = maze_graph
+        self.solution_path = solution_path or []
+        self.fps = fps
+        self.cells_per_second = cells_per_second
+        self.pad = None
+        self.top = 0 # Board position shown at the top left corner of the screen
+        self.left = 0
+
+    def show(self):
+        """ Opens the viewer, returning once a key other than the arrows is pressed
+        """
+        global curses
+        import curses
+        curses.wrapper(self._run)
+
+    def _run(self, stdscr):
+        """ Private method run by curses.wrapper
+        """
+        curses.curs_set(0)
+        for (code, background) in ((WALL_CODE, curses.COLOR_BLACK), (FREE_CODE, curses.COLOR_WHITE),
+                                   (START_CODE, curses.COLOR_BLUE), (END_CODE, curses.COLOR_RED),
+                                   (PATH_CODE, curses.COLOR_YELLOW)):
+            curses.init_pair(code + 1, curses.COLOR_WHITE, background)
+        stdscr.nodelay(1)
+        stdscr.clear()
+        stdscr.noutrefresh()
+
+        # The extra row keeps the last cell from moving the cursor out of the pad
+        maze_graph = self.maze_graph
+        self.pad = curses.newpad(maze_graph.number_of_rows + 1, maze_graph.number_of_columns + 1)
+        for (row, codes) in enumerate(iter_cell_codes(maze_graph)):
+            for run in _RUN_PATTERN.finditer(codes):
+                self.pad.addstr(row, run.start(), ' ' * len(run.group()), curses.color_pair(codes[run.start()] + 1))
+
+        marks = {maze_graph.get_vertex_label_by_id(maze_graph.root_id): START_CODE,
+                 maze_graph.get_vertex_label_by_id(maze_graph.target_id): END_CODE}
+        frame_time = 1 / self.fps
+        cells_per_frame = len(self.solution_path)
+        if self.cells_per_second:
+            cells_per_frame = max(1, round(self.cells_per_second * frame_time))
+        walked = 0
+        next_frame = time.perf_counter()
+        while True:
+            key = stdscr.getch()
+            if key != -1 and not self._scroll(stdscr, key):
+                return
+
+            # Draw the positions walked since the previous frame
+            for (row, column) in self.solution_path[walked:walked + cells_per_frame]:
+                self.pad.addstr(row, column, ' ', curses.color_pair(marks.get((row, column), PATH_CODE) + 1))
+                self._follow(stdscr, row, column)
+            walked = min(walked + cells_per_frame, len(self.solution_path))
+
+            (screen_rows, screen_columns) = stdscr.getmaxyx()
+            self.pad.noutrefresh(self.top, self.left, 0, 0, min(screen_rows, maze_graph.number_of_rows - self.top) - 1,
+                                 min(screen_columns, maze_graph.number_of_columns - self.left) - 1)
+            curses.doupdate()
+
+            next_frame = next_frame + frame_time
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_frame = time.perf_counter() # Late frames are not caught up
+
+    def _scroll(self, stdscr, key):
+        """ Private method that moves the viewport half a screen with the arrow keys
+
+            Returns:
+                bool: False if the key is not an arrow
+        """
+        (screen_rows, screen_columns) = stdscr.getmaxyx()
+        moves = {curses.KEY_UP: (-screen_rows // 2, 0), curses.KEY_DOWN: (screen_rows // 2, 0),
+                 curses.KEY_LEFT: (0, -screen_columns // 2), curses.KEY_RIGHT: (0, screen_columns // 2)}
+        if key not in moves:
+            return False
+        self._move_viewport(stdscr, self.top + moves[key][0], self.left + moves[key][1])
+        return True
+
+    def _follow(self, stdscr, row, column):
+        """ Private method that centers the viewport on a position that left it
+        """
+        (screen_rows, screen_columns) = stdscr.getmaxyx()
+        if not (self.top <= row < self.top + screen_rows and self.left <= column < self.left + screen_columns):
+            self._move_viewport(stdscr, row - screen_rows // 2, column - screen_columns // 2)
+
+    def _move_viewport(self, stdscr, top, left):
+        """ Private method that moves the viewport, keeping it inside the board
+        """
+        (screen_rows, screen_columns) = stdscr.getmaxyx()
+        self.top = max(0, min(top, self.maze_graph.number_of_rows - screen_rows))
+        self.left = max(0, min(left, self.maze_graph.number_of_columns - screen_columns))
+        stdscr.erase()
+        stdscr.noutrefresh()
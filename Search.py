@@ -1,102 +1,442 @@
-import math
-from queue import PriorityQueue
+import heapq
+import time
+from array import array
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
 
 from Maze import *
 
+
+# Values of the searchers 'status' attribute after 'do_search'
+STATUS_FOUND = "found"
+STATUS_NOT_FOUND = "not_found"
+STATUS_BUDGET_EXHAUSTED = "budget_exhausted"
+
+
+def _traverse_parents(maze_graph, parent, vertex_id):
+    """ Builds the path from the search root to a vertex by following parent ids
+
+        Args:
+            maze_graph: The searched maze graph
+            parent (dict[int, int] or array[int]): Parent id of each reached vertex id. The root
+                parent is None (-1 in parent arrays)
+            vertex_id (int): Last vertex of the path
+
+        Returns:
+            list[tuple(int, int)]: Labels of the path vertexes, from the root to 'vertex_id'
+    """
+    path = []
+    while vertex_id is not None and vertex_id != -1:
+        path.append(maze_graph.get_vertex_label_by_id(vertex_id))
+        vertex_id = parent[vertex_id]
+    path.reverse()
+    return path
+
+
+class SearchStatistics:
+    """ Class collecting what a search did. Searchers only count when a SearchStatistics object is set in
+    their 'statistics' attribute before 'do_search': they then swap the functions their main loop calls to
+    expand vertexes and grow the open list for counting wrappers, so an uninstrumented search runs exactly
+    the same loop as before. Counters a searcher does not support stay None.
+
+        expanded: vertexes whose adjacences were examined
+        generated: vertexes added to the open list (or frontier, or stack), the start included
+        duplicates: adjacences examined that were not added, as they were already reached or closed
+        peak_open: largest size of the open list (stale heap entries included), frontier or stack
+        peak_closed: largest size of the closed (or visited) set
+        path_length, path_cost: size of the returned labels list and its number of moves, or its cost on
+            weighted boards (None if the list is not a path, as the traces returned by BreadthFirstSearch
+            and DepthFirstSearch)
+        construct_memory_peak, search_memory_peak: tracemalloc peaks in bytes, see 'instrument_search'
+    """
+
+    def __init__(self):
+        self.expanded = None
+        self.generated = None
+        self.duplicates = None
+        self.peak_open = None
+        self.peak_closed = None
+        self.path_length = None
+        self.path_cost = None
+        self.construct_memory_peak = None
+        self.search_memory_peak = None
+        self.examined = 0 # Adjacences examined, used to find 'duplicates'
+
+    def start(self):
+        """ Resets the counters supported by every instrumented searcher
+        """
+        self.expanded = 0
+        self.generated = 0
+        self.peak_open = 0
+        self.examined = 0
+
+    def counting_expand(self, expand):
+        """ Wraps the function a searcher uses to get the adjacences of the vertex being expanded
+
+        Args:
+            expand (callable): Function of a vertex id returning its adjacences
+
+        Returns:
+            callable: The wrapped function
+        """
+        def counted_expand(vertex_id):
+            adjacences = expand(vertex_id)
+            self.expanded = self.expanded + 1
+            self.examined = self.examined + len(adjacences)
+            return adjacences
+        return counted_expand
+
+    def counting_push(self, push):
+        """ Wraps the function a searcher uses to add entries to its open heap
+
+        Args:
+            push (callable): heapq.heappush or an equivalent function of (heap, entry)
+
+        Returns:
+            callable: The wrapped function
+        """
+        def counted_push(heap, entry):
+            push(heap, entry)
+            self.generated = self.generated + 1
+            if len(heap) > self.peak_open:
+                self.peak_open = len(heap)
+        return counted_push
+
+    def finish(self, result, peak_closed, is_path=True):
+        """ Fills the counters known once the search is over
+
+        Args:
+            result (list[tuple(int, int)]): Labels returned by the search, or None
+            peak_closed (int): Largest size of the closed (or visited) set
+            is_path (bool, optional): Whether 'result' is a path from the start to the exit. Defaults to True.
+        """
+        # Searches rejected before starting (see Maze.MazeGraph.are_connected) keep their counters empty
+        if self.expanded is not None:
+            self.peak_closed = peak_closed
+            # Every vertex but the start was generated from an examined adjacence
+            self.duplicates = self.examined - (self.generated - 1)
+        if result is not None:
+            self.path_length = len(result)
+            if is_path and all(abs(row - next_row) + abs(column - next_column) == 1
+                               for (row, column), (next_row, next_column) in zip(result, result[1:])):
+                self.path_cost = len(result) - 1
+
+    def as_dict(self):
+        """ Returns the counters
+
+        Returns:
+            dict: The counters by name
+        """
+        return {name: value for name, value in vars(self).items() if name != "examined"}
+
+
+def instrument_search(algorithm, maze_graph, trace_memory=False, **searcher_arguments):
+    """ Constructs a searcher and runs it with a SearchStatistics object, optionally recording the tracemalloc
+    peak of the construction and of the search phases. Meant for analysis runs, not for timing.
+
+    Args:
+        algorithm (type): Searcher class
+        maze_graph: The maze graph to search
+        trace_memory (bool, optional): Record memory peaks with tracemalloc. Defaults to False.
+        **searcher_arguments: Extra arguments for the searcher constructor
+
+    Returns:
+        tuple(list[tuple(int, int)], SearchStatistics): The search result and its statistics
+    """
+    statistics = SearchStatistics()
+    import tracemalloc # Loaded only when measuring, as it takes longer to import than the rest of the module
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        if trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        searcher = algorithm(maze_graph, **searcher_arguments)
+        if trace_memory:
+            statistics.construct_memory_peak = tracemalloc.get_traced_memory()[1] - baseline
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        searcher.statistics = statistics
+        result = searcher.do_search()
+        if trace_memory:
+            statistics.search_memory_peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    if statistics.path_length is None and result is not None:
+        statistics.path_length = len(result)
+    if statistics.path_cost is not None and maze_graph.get_cell_costs() is not None:
+        statistics.path_cost = maze_graph.get_path_cost(result)
+    return (result, statistics)
+
+
+class SearchBudgetExhausted(Exception):
+    """ Raised inside a search loop when its SearchBudget runs out. Searchers catch it and return a
+    partial result, so it only reaches callers charging a budget themselves.
+    """
+
+    def __init__(self, limit):
+        super().__init__("Search budget exhausted: {}".format(limit))
+        self.limit = limit # "expanded", "time" or "memory"
+
+
+class SearchBudget:
+    """ Class limiting what a search may spend: expanded vertexes, wall-clock time and memory growth.
+    Searchers given a budget charge it once per expansion, the same way they count statistics, and stop
+    with status STATUS_BUDGET_EXHAUSTED once a limit is passed, returning the path to the reached vertex
+    closest to the exit (or the trace so far, for trace searches). Time and memory are only read every
+    CHECK_INTERVAL expansions. Memory is what tracemalloc traces if it is running, else the growth of
+    the process peak resident size, and is not checked where neither is available.
+    """
+    CHECK_INTERVAL = 256
+
+    def __init__(self, max_expanded=None, max_time=None, max_memory=None):
+        """ Class constructor. Limits left as None are not checked.
+
+        Args:
+            max_expanded (int, optional): Number of vertexes the search may expand. Defaults to None.
+            max_time (float, optional): Seconds the search may run. Defaults to None.
+            max_memory (int, optional): Bytes the search may allocate. Defaults to None.
+        """
+        self.max_expanded = max_expanded
+        self.max_time = max_time
+        self.max_memory = max_memory
+        self.expanded = 0
+        self.deadline = None
+        self.memory_baseline = None
+        self.exhausted_limit = None # Name of the limit passed by the last search, if any
+
+    def start(self):
+        """ Starts charging a new search
+        """
+        self.expanded = 0
+        self.exhausted_limit = None
+        self.deadline = time.perf_counter_ns() + int(self.max_time * 1e9) if self.max_time is not None else None
+        self.memory_baseline = self._get_memory_usage() if self.max_memory is not None else None
+
+    def charge(self):
+        """ Charges one expansion. Raises SearchBudgetExhausted once a limit is passed.
+        """
+        self.expanded = self.expanded + 1
+        if self.max_expanded is not None and self.expanded > self.max_expanded:
+            self._exhaust("expanded")
+        if self.expanded % self.CHECK_INTERVAL == 0:
+            if self.deadline is not None and time.perf_counter_ns() >= self.deadline:
+                self._exhaust("time")
+            if self.memory_baseline is not None and self._get_memory_usage() - self.memory_baseline > self.max_memory:
+                self._exhaust("memory")
+
+    def charging_expand(self, expand):
+        """ Wraps the function a searcher uses to get the adjacences of the vertex being expanded
+
+        Args:
+            expand (callable): Function of a vertex id returning its adjacences
+
+        Returns:
+            callable: The wrapped function
+        """
+        charge = self.charge
+        def charged_expand(vertex_id):
+            charge()
+            return expand(vertex_id)
+        return charged_expand
+
+    def _exhaust(self, limit):
+        """ Private method that records the passed limit and stops the search
+        """
+        self.exhausted_limit = limit
+        raise SearchBudgetExhausted(limit)
+
+    def _get_memory_usage(self):
+        """ Private method that returns the memory measure the budget limits, in bytes
+        """
+        import tracemalloc
+        if tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        if resource is not None:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return 0
+
+
+def _run_within_budget(searcher, search, get_partial_result, has_found=None, reject_unreachable=True):
+    """ Runs a searcher loop, setting the searcher 'status'. If its budget runs out, the partial
+    result is returned instead.
+
+        Args:
+            searcher: The searcher, with 'maze_graph', 'budget' and 'status' attributes
+            search (callable): The search loop, returning the search result
+            get_partial_result (callable): Builds the result of a stopped search
+            has_found (callable, optional): Tells if the exit was found. Defaults to checking that the
+                result is not None.
+            reject_unreachable (bool, optional): Return None without searching if the start and the exit
+                are in different connected components. Defaults to True.
+
+        Returns:
+            list[tuple(int, int)]: The search result
+    """
+    maze_graph = searcher.maze_graph
+    if reject_unreachable and not maze_graph.are_connected(maze_graph.root_id, maze_graph.target_id):
+        searcher.status = STATUS_NOT_FOUND
+        return None
+    if searcher.budget is not None:
+        searcher.budget.start()
+    try:
+        result = search()
+    except SearchBudgetExhausted:
+        searcher.status = STATUS_BUDGET_EXHAUSTED
+        return get_partial_result()
+    found = has_found() if has_found is not None else result is not None
+    searcher.status = STATUS_FOUND if found else STATUS_NOT_FOUND
+    return result
+
+
+def _closest_reached_path(maze_graph, parent, reached_ids, h):
+    """ Builds the path to the reached vertex with the lowest heuristic value, the best partial answer
+    of a stopped search
+
+        Args:
+            maze_graph: The searched maze graph
+            parent (dict[int, int] or array[int]): Parent id of each reached vertex id
+            reached_ids (iterable[int]): Ids of the reached vertexes
+            h (array[int]): Heuristic values towards the exit, indexed by vertex id
+
+        Returns:
+            list[tuple(int, int)]: Labels of the path from the root, or None if no vertex was reached
+    """
+    best_id = min(reached_ids, key=h.__getitem__, default=None)
+    if best_id is None:
+        return None
+    return _traverse_parents(maze_graph, parent, best_id)
+
+
 class AStarSearch:
-    """ Class representing a Best-First search algorithm
+    """ Class representing an A* search algorithm. On weighted boards (see MazeGraph.get_cell_costs) moves
+    cost the cost of the position entered, and the heuristic, a number of moves, is multiplied by the
+    lowest cell cost so it never overestimates the cost left.
     """
 
-    def __init__(self, maze_graph):
+    def __init__(self, maze_graph, heuristic="euclidean", budget=None):
         """ Class constructor
 
             Args:
                 maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                heuristic (str or callable, optional): Heuristic name or function, see MazeGraph.get_heuristic_values.
+                    Defaults to "euclidean".
+                budget (SearchBudget, optional): Limits of the search. Defaults to None.
         """
         self.maze_graph = maze_graph
-        self.open = PriorityQueue()
-        self.closed = []
+        self.open = [] # Binary heap of (f, vertex id) entries
+        self.open_g = {} # Best g found so far for each vertex id reached by the search
+        self.parent = {} # Parent id of each vertex id reached by the search
+        self.closed = bytearray(self.maze_graph.get_id_space_size()) # closed[vertex_id] == 1 once expanded
         self.path = []
+        self.statistics = None # Optional SearchStatistics
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
 
-        # Get an heuristic value for each vertex.
-        # Current heuristic is the euclidian distance between vertex and target vertex
-        (target_vertex_row, target_vertex_column) = self.maze_graph.vertexes_list[self.maze_graph.target_id].get_label()
-        for current_vertex in self.maze_graph.vertexes_list:
-            (vertex_row, vertex_column) = current_vertex.get_label()
-            diff_x = (target_vertex_row - vertex_row) ** 2
-            diff_y = (target_vertex_column - vertex_column) ** 2
-            current_vertex.h = math.ceil(math.sqrt(diff_x + diff_y))
-
-            # We have a g variable in A* algorithm, that helps us calculate the best choice
-            # between neighbors of a given vertex
-            current_vertex.g = 0
+        # Get an heuristic value for each vertex, indexed by vertex id. Values are cached by the graph,
+        # so only the first searcher for a given target and heuristic pays for them
+        self.h = self.maze_graph.get_heuristic_values(self.maze_graph.target_id, heuristic)
+        self.costs = self.maze_graph.get_cell_costs() # None on unweighted boards
+        # On weighted boards every move costs at least the cheapest cell, so the cached values, which count
+        # moves, are scaled by it as they are read
+        self.h_scale = self.maze_graph.minimum_cell_cost if self.costs is not None else 1
 
     def do_search(self):
-        """ Runs Best-First Search
+        """ Runs A* Search
 
             Returns:
                 list[tuple(int, int)]: list of traversed vertex labels
         """
+        result = _run_within_budget(self, self._a_star_search,
+                                    lambda: _closest_reached_path(self.maze_graph, self.parent, self.parent, self.h))
+        if self.statistics is not None:
+            self.statistics.finish(result, self.closed.count(1))
+        return result
 
-        first = self.maze_graph.vertexes_list[self.maze_graph.root_id]
-        first_vertex = MazeVertex(first.id, first.label, None, None)
-        first_vertex.adjacence_list = first.get_adjacence_list()
-        first_vertex.h = first.h
-        first_vertex.g = first.g
-        self.open.put((self._calculate_f(first_vertex), first_vertex.id, first_vertex))
+    def _a_star_search(self):
+        """ Private method that runs the search loop
 
-        # Step 1: 
-        while self.open.empty() == False:
-            current_vertex = self.open.get()[2]
-            # Step 2: Add current vertex to closed vertexes list 
-            self.closed.append(current_vertex.get_label())
+            Returns:
+                list[tuple(int, int)]: list of traversed vertex labels
+        """
+        maze_graph = self.maze_graph
+        open_heap = self.open
+        open_g = self.open_g
+        parent = self.parent
+        closed = self.closed
+        costs = self.costs
+        h = self.h
+        h_scale = self.h_scale
+        expand = maze_graph.get_vertex_adjacence_by_id
+        push = heapq.heappush
+        if self.statistics is not None:
+            self.statistics.start()
+            expand = self.statistics.counting_expand(expand)
+            push = self.statistics.counting_push(push)
+        if self.budget is not None:
+            expand = self.budget.charging_expand(expand)
 
-            # Step 3: Found way out
-            if current_vertex.id == self.maze_graph.target_id:
+        # We have a g variable in A* algorithm, that helps us calculate the best choice
+        # between neighbors of a given vertex
+        root_id = maze_graph.root_id
+        open_g[root_id] = 0
+        parent[root_id] = None
+        push(open_heap, (self._calculate_f(root_id, 0), root_id))
 
-                #Step 3.1: Traverse path
-                current_path = current_vertex
-                while current_path != None:
-                    self.path.append(current_path.get_label())
-                    current_path = current_path.parent
+        # Step 1: 
+        while open_heap:
+            current_id = heapq.heappop(open_heap)[1]
+            # Entries left behind by a decrease-key are skipped (lazy deletion)
+            if closed[current_id]:
+                continue
+            # Step 2: Add current vertex to closed vertexes set
+            closed[current_id] = 1
 
-                self.path.reverse()                    
+            # Step 3: Found way out
+            if current_id == maze_graph.target_id:
+                self.path = _traverse_parents(maze_graph, parent, current_id)
                 return self.path
 
             # Step 4: Didn't find way out. Looks in adjacences
-            for neighbor_id in current_vertex.get_adjacence_list():
-                neighbor = self.maze_graph.vertexes_list[neighbor_id]
-                path_vertex = MazeVertex(neighbor.id, neighbor.label, None, current_vertex)
-                path_vertex.adjacence_list = neighbor.get_adjacence_list()
-                path_vertex.parent = current_vertex
-                path_vertex.h = neighbor.h
-                path_vertex.g = current_vertex.g + 1
-
-                # Step 4.1: Add neighbor vertex in open vertexes queue
-                if path_vertex.get_label() not in self.closed:
-                    # Check if it is in open queue
-                    q = self.open.queue
-                    to_insert = (self._calculate_f(path_vertex), path_vertex.id, path_vertex)
-                    already_in_open = False
-
-                    for item in q:
-                        (f, vertex_id, parent) = item
-                        if f == to_insert[0] and vertex_id == to_insert[1]:
-                            already_in_open = True
-                            break
-                    if already_in_open == False:
-                        self.open.put(to_insert)
+            if costs is None:
+                neighbor_g = open_g[current_id] + 1
+                for neighbor_id in expand(current_id):
+                    if closed[neighbor_id]:
+                        continue
+                    # Step 4.1: Add neighbor vertex in open vertexes heap, or decrease its key
+                    # if this path to it is shorter than the one known so far
+                    if open_g.get(neighbor_id, neighbor_g + 1) > neighbor_g:
+                        open_g[neighbor_id] = neighbor_g
+                        parent[neighbor_id] = current_id
+                        push(open_heap, (self._calculate_f(neighbor_id, neighbor_g), neighbor_id))
+                continue
+
+            # Weighted board: the move costs the cost of the position entered
+            current_g = open_g[current_id]
+            for neighbor_id in expand(current_id):
+                if closed[neighbor_id]:
+                    continue
+                neighbor_g = current_g + costs[neighbor_id]
+                if open_g.get(neighbor_id, neighbor_g + 1) > neighbor_g:
+                    open_g[neighbor_id] = neighbor_g
+                    parent[neighbor_id] = current_id
+                    push(open_heap, (h[neighbor_id] * h_scale + neighbor_g, neighbor_id))
 
         # Step 5: If target vertex was not found, the search was a failure
         return None
 
-    def _calculate_f(self, vertex):
+    def _calculate_f(self, vertex_id, g):
         """ Private method that calculates F
 
             returns:
                 F: h + g
         """
-        return vertex.h + vertex.g
+        return self.h[vertex_id] + g
 
 
     def print_visited_vertexes(self):
@@ -110,91 +450,220 @@ class AStarSearch:
         print(way_out)
 
 
+class DijkstraSearch(AStarSearch):
+    """ Class representing Dijkstra's algorithm: A* with an heuristic of zero, so vertexes are expanded
+    by cost from the start. It finds the cheapest path on weighted boards, and the shortest one otherwise.
+    """
+
+    def __init__(self, maze_graph, budget=None):
+        """ Class constructor
+
+            Args:
+                maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                budget (SearchBudget, optional): Limits of the search. Defaults to None.
+        """
+        super().__init__(maze_graph, "zero", budget)
+
+
+class AnytimeWeightedAStar:
+    """ Class representing an anytime weighted A* search. A* is run with the heuristic multiplied by
+    'weight', which reaches the exit after few expansions but possibly through a longer path. The search
+    then goes on, reopening vertexes reached through shorter paths and pruning those that can not lead
+    to a path shorter than the best one found, and each time the exit is reached again the path
+    improves. Once no vertex is left, the last path is the shortest one; if the budget runs out first,
+    the last path is returned as it is.
+    """
+
+    def __init__(self, maze_graph, heuristic="euclidean", weight=2.0, budget=None):
+        """ Class constructor
+
+            Args:
+                maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                heuristic (str or callable, optional): Heuristic name or function, see MazeGraph.get_heuristic_values.
+                    It must never overestimate the distance to the exit. Defaults to "euclidean".
+                weight (float, optional): Heuristic weight of the first path. Defaults to 2.0.
+                budget (SearchBudget, optional): Limits of the search. Defaults to None.
+        """
+        self.maze_graph = maze_graph
+        self.weight = weight
+        self.open = [] # Binary heap of (weighted f, g, vertex id) entries
+        self.open_g = {} # Best g found so far for each vertex id reached by the search
+        self.parent = {} # Parent id of each vertex id reached by the search
+        self.path = None # Best path found so far
+        self.solutions = [] # (nanoseconds since the search started, path cost) of each improved path
+        self.optimal = False # Whether 'path' is known to be a shortest path
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
+        self.h = maze_graph.get_heuristic_values(maze_graph.target_id, heuristic)
+
+    def do_search(self):
+        """ Runs the search until the shortest path is known or the budget runs out
+
+            Returns:
+                list[tuple(int, int)]: Labels of the best path found, or None if the exit can not be
+                    reached. If the budget ran out before any path was found, the path to the reached
+                    vertex closest to the exit.
+        """
+        for path in self.iter_paths():
+            pass
+        if self.path is None and self.status == STATUS_BUDGET_EXHAUSTED:
+            return _closest_reached_path(self.maze_graph, self.parent, self.parent, self.h)
+        return self.path
+
+    def iter_paths(self):
+        """ Runs the search, yielding each path as soon as it is found, every one shorter than the last
+
+            Returns:
+                iterator[list[tuple(int, int)]]: Labels of the paths from the start to the exit
+        """
+        maze_graph = self.maze_graph
+        if not maze_graph.are_connected(maze_graph.root_id, maze_graph.target_id):
+            self.status = STATUS_NOT_FOUND
+            return
+        if self.budget is not None:
+            self.budget.start()
+        start = time.perf_counter_ns()
+        try:
+            for path in self._anytime_search():
+                self.path = path
+                self.solutions.append((time.perf_counter_ns() - start, len(path) - 1))
+                yield path
+        except SearchBudgetExhausted:
+            self.status = STATUS_BUDGET_EXHAUSTED
+            return
+        self.optimal = self.path is not None
+        self.status = STATUS_FOUND if self.path is not None else STATUS_NOT_FOUND
+
+    def _anytime_search(self):
+        """ Private generator that runs the search loop, yielding each improved path
+        """
+        maze_graph = self.maze_graph
+        target_id = maze_graph.target_id
+        open_heap = self.open
+        open_g = self.open_g
+        parent = self.parent
+        h = self.h
+        weight = self.weight
+        expand = maze_graph.get_vertex_adjacence_by_id
+        if self.budget is not None:
+            expand = self.budget.charging_expand(expand)
+
+        root_id = maze_graph.root_id
+        open_g[root_id] = 0
+        parent[root_id] = None
+        heapq.heappush(open_heap, (weight * h[root_id], 0, root_id))
+
+        best_cost = None
+        while open_heap:
+            (f, current_g, current_id) = heapq.heappop(open_heap)
+            # Entries left behind when a shorter path to their vertex was found are skipped, as are
+            # vertexes that can not improve the best path any more
+            if current_g != open_g[current_id]:
+                continue
+            if best_cost is not None and current_g + h[current_id] >= best_cost:
+                continue
+
+            if current_id == target_id:
+                best_cost = current_g
+                yield _traverse_parents(maze_graph, parent, current_id)
+                continue
+
+            neighbor_g = current_g + 1
+            for neighbor_id in expand(current_id):
+                if best_cost is not None and neighbor_g + h[neighbor_id] >= best_cost:
+                    continue
+                if open_g.get(neighbor_id, neighbor_g + 1) > neighbor_g:
+                    open_g[neighbor_id] = neighbor_g
+                    parent[neighbor_id] = current_id
+                    heapq.heappush(open_heap, (neighbor_g + weight * h[neighbor_id], neighbor_g, neighbor_id))
+
+
 class BestFirstSearch:
     """ Class representing a Best-First search algorithm
 	"""
 
-    def __init__(self, maze_graph):
+    def __init__(self, maze_graph, heuristic="euclidean", budget=None):
         """ Class constructor
             Args:
                 maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                heuristic (str or callable, optional): Heuristic name or function, see MazeGraph.get_heuristic_values.
+                    Defaults to "euclidean".
+                budget (SearchBudget, optional): Limits of the search. Defaults to None.
         """
         self.maze_graph = maze_graph
-        self.open = PriorityQueue()
-        self.closed = []
+        self.open = [] # Binary heap of (f, vertex id) entries
+        self.parent = {} # Parent id of each vertex id reached by the search
+        self.closed = bytearray(self.maze_graph.get_id_space_size()) # closed[vertex_id] == 1 once expanded
         self.path = []
+        self.statistics = None # Optional SearchStatistics
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
 
-        # Get an heuristic value for each vertex.
-        # Current heuristic is the euclidian distance between vertex and target vertex
-        (target_vertex_row, target_vertex_column) = self.maze_graph.vertexes_list[self.maze_graph.target_id].get_label()
-        for current_vertex in self.maze_graph.vertexes_list:
-            (vertex_row, vertex_column) = current_vertex.get_label()
-            diff_x = (target_vertex_row - vertex_row) ** 2
-            diff_y = (target_vertex_column - vertex_column) ** 2
-            current_vertex.h = math.ceil(math.sqrt(diff_x + diff_y))
+        # Get an heuristic value for each vertex, indexed by vertex id. Values are cached by the graph,
+        # so only the first searcher for a given target and heuristic pays for them
+        self.h = self.maze_graph.get_heuristic_values(self.maze_graph.target_id, heuristic)
 
     def do_search(self):
         """ Runs Best-First Search
             Returns:
                 list[tuple(int, int)]: list of traversed vertex labels
         """
+        result = _run_within_budget(self, self._best_first_search,
+                                    lambda: _closest_reached_path(self.maze_graph, self.parent, self.parent, self.h))
+        if self.statistics is not None:
+            self.statistics.finish(result, self.closed.count(1))
+        return result
 
-        first = self.maze_graph.vertexes_list[self.maze_graph.root_id]
-        first_vertex = MazeVertex(first.id, first.label, None, None)
-        first_vertex.adjacence_list = first.get_adjacence_list()
-        first_vertex.h = first.h
-        self.open.put((self._calculate_f(first_vertex), first_vertex.id, first_vertex))
+    def _best_first_search(self):
+        """ Private method that runs the search loop
+            Returns:
+                list[tuple(int, int)]: list of traversed vertex labels
+        """
+        maze_graph = self.maze_graph
+        open_heap = self.open
+        parent = self.parent
+        closed = self.closed
+        expand = maze_graph.get_vertex_adjacence_by_id
+        push = heapq.heappush
+        if self.statistics is not None:
+            self.statistics.start()
+            expand = self.statistics.counting_expand(expand)
+            push = self.statistics.counting_push(push)
+        if self.budget is not None:
+            expand = self.budget.charging_expand(expand)
+
+        root_id = maze_graph.root_id
+        parent[root_id] = None
+        push(open_heap, (self._calculate_f(root_id), root_id))
 
         # Step 1: 
-        while self.open.empty() == False:
-            current_vertex = self.open.get()[2]
-            # Step 2: Add current vertex to closed vertexes list 
-            self.closed.append(current_vertex.get_label())
+        while open_heap:
+            current_id = heapq.heappop(open_heap)[1]
+            # Step 2: Add current vertex to closed vertexes set
+            closed[current_id] = 1
 
             # Step 3: Found way out
-            if current_vertex.id == self.maze_graph.target_id:
-
-                #Step 3.1: Traverse path
-                current_path = current_vertex
-                while current_path != None:
-                    self.path.append(current_path.get_label())
-                    current_path = current_path.parent
-
-                self.path.reverse()                    
+            if current_id == maze_graph.target_id:
+                self.path = _traverse_parents(maze_graph, parent, current_id)
                 return self.path
 
             # Step 4: Didn't find way out. Looks in adjacences
-            for neighbor_id in current_vertex.get_adjacence_list():
-                neighbor = self.maze_graph.vertexes_list[neighbor_id]
-                path_vertex = MazeVertex(neighbor.id, neighbor.label, None, current_vertex)
-                path_vertex.adjacence_list = neighbor.get_adjacence_list()
-                path_vertex.parent = current_vertex
-                path_vertex.h = neighbor.h
-
-                # Step 4.1: Add neighbor vertex in open vertexes queue
-                if path_vertex.get_label() not in self.closed:
-                    # Check if it is in open queue
-                    q = self.open.queue
-                    to_insert = (self._calculate_f(path_vertex), path_vertex.id, path_vertex)
-                    already_in_open = False
-
-                    for item in q:
-                        (f, vertex_id, parent) = item
-                        if f == to_insert[0] and vertex_id == to_insert[1]:
-                            already_in_open = True
-                            break
-                    if already_in_open == False:
-                        self.open.put(to_insert)
+            for neighbor_id in expand(current_id):
+                # Step 4.1: Add neighbor vertex in open vertexes heap. The key of a vertex only
+                # depends on its heuristic, so a vertex already reached keeps its first parent
+                if neighbor_id not in parent:
+                    parent[neighbor_id] = current_id
+                    push(open_heap, (self._calculate_f(neighbor_id), neighbor_id))
 
         # Step 5: If target vertex was not found, the search was a failure
         return None
 
-    def _calculate_f(self, vertex):
+    def _calculate_f(self, vertex_id):
         """ Private method that calculates F
             returns:
                 F: h 
         """
-        return vertex.h
+        return self.h[vertex_id]
 
 
     def print_visited_vertexes(self):
@@ -209,95 +678,245 @@ class BestFirstSearch:
 
 
 class BreadthFirstSearch:
-    def __init__(self, maze_graph):
+    def __init__(self, maze_graph, shortest_path=False, budget=None):
         """ Class to run BFS over a given MazeGraph object
 
         Args:
             maze_graph (object MazeGraph): Maze to solve
+            shortest_path (bool, optional): If True, do_search returns the shortest path from the start
+                to the exit instead of the exploration trace. Defaults to False.
+            budget (SearchBudget, optional): Limits of the search. Defaults to None.
         """
 
         self.maze_graph = maze_graph
-        self.visited = [False for vertex in maze_graph.vertexes_list]
-        self.queue = []
+        self.shortest_path = shortest_path
+        self.visited = bytearray(maze_graph.get_id_space_size()) # visited[vertex_id] == 1 once enqueued
+        self.parent = array('i', [-1]) * maze_graph.get_id_space_size() # Id of the vertex each vertex was reached from
+        # Each vertex is enqueued at most once, so the queue never wraps around: the dequeued
+        # prefix 'queue[:expanded_count]' is the exploration trace, in order
+        self.queue = array('i', [0]) * maze_graph.get_id_space_size()
+        self.expanded_count = 0
+        self.enqueued_count = 0
+        self.trace = None
         self.found = False
+        self.statistics = None # Optional SearchStatistics
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
 
     def do_search(self):
         """ Runs BFS search
 
+        Returns:
+            list[tuple(int, int)]: List of the traversed vertexes labels, or the shortest path
+                labels if the search was created with 'shortest_path'. If the budget ran out, the
+                trace so far or the path to the reached vertex closest to the exit.
+        """
+        # The trace of a failed search is the whole component of the start, so only path searches are rejected
+        result = _run_within_budget(self, self._get_result, self._get_partial_result, lambda: self.found,
+                                    self.shortest_path)
+        if self.statistics is not None:
+            if self.statistics.expanded is not None:
+                self.statistics.generated = self.enqueued_count
+                self.statistics.peak_open = self._get_peak_frontier_size()
+            self.statistics.finish(result, self.expanded_count, self.shortest_path)
+        return result
+
+    def _get_result(self):
+        """ Private method that runs the search and builds its result
+        """
+        self._breadth_first_search()
+        return self.get_shortest_path() if self.shortest_path else self.get_trace()
+
+    def _get_partial_result(self):
+        """ Private method that builds the result of a search stopped by its budget
+        """
+        if not self.shortest_path:
+            return self.get_trace()
+        maze_graph = self.maze_graph
+        return _closest_reached_path(maze_graph, self.parent, self.queue[:self.enqueued_count],
+                                     maze_graph.get_heuristic_values(maze_graph.target_id, "manhattan"))
+
+    def _breadth_first_search(self):
+        """ Private method that runs the search, filling 'visited', 'parent' and 'queue'
+        """
+        maze_graph = self.maze_graph
+        target_id = maze_graph.target_id
+        visited = self.visited
+        parent = self.parent
+        queue = self.queue
+        expand = maze_graph.get_vertex_adjacence_by_id
+        if self.statistics is not None:
+            self.statistics.start()
+            expand = self.statistics.counting_expand(expand)
+        if self.budget is not None:
+            expand = self.budget.charging_expand(expand)
+
+        head = 0
+        tail = 1
+        queue[0] = maze_graph.root_id
+        visited[maze_graph.root_id] = 1
+
+        if maze_graph.root_id == target_id:
+            # The start is the exit, so the path is the start alone and nothing else is explored
+            self.found = True
+            self.expanded_count = 1
+            self.enqueued_count = 1
+            return
+
+        try:
+            while head < tail and self.found == False:
+                v = queue[head]
+                head = head + 1
+
+                for index in expand(v):
+                    if index == target_id:
+                        self.found = True
+                    if not visited[index]:
+                        visited[index] = 1
+                        parent[index] = v
+                        queue[tail] = index
+                        tail = tail + 1
+        finally:
+            # Also kept when the budget runs out, for the partial result
+            self.expanded_count = head
+            self.enqueued_count = tail
+
+    def _get_peak_frontier_size(self):
+        """ Private method that finds the largest queue size of the last search. Vertexes are enqueued in
+        the order their parents were dequeued, so the queue size after each dequeue can be replayed
+        from the parents positions in the queue.
+
+        Returns:
+            int: Largest number of enqueued vertexes not dequeued yet
+        """
+        queue = self.queue
+        position = {vertex_id: index for index, vertex_id in enumerate(queue[:self.enqueued_count])}
+        peak = 1 # The start, before the first dequeue
+        enqueued = 1
+        for dequeued in range(self.expanded_count):
+            while enqueued < self.enqueued_count and position[self.parent[queue[enqueued]]] == dequeued:
+                enqueued = enqueued + 1
+            peak = max(peak, enqueued - (dequeued + 1))
+        return peak
+
+    def get_trace(self):
+        """ Returns the vertexes expanded by the last search, in order. Labels are only built on
+        the first call.
+
         Returns:
             list[tuple(int, int)]: List of the traversed vertexes labels
         """
-        self.queue.append(self.maze_graph.root_id)
-        self.visited[self.maze_graph.root_id] = True
-        path = []
+        if self.trace is None:
+            get_label = self.maze_graph.get_vertex_label_by_id
+            self.trace = [get_label(vertex_id) for vertex_id in self.queue[:self.expanded_count]]
+        return self.trace
 
-        while len(self.queue) > 0 and self.found == False:
-            v = self.queue.pop(0)
-            path.append(self.maze_graph.vertexes_list[v].get_label())
+    def get_shortest_path(self):
+        """ Returns the shortest path found by the last search, following the parent of each vertex
+        back from the exit.
 
-            for index in self.maze_graph.get_vertex_adjacence_by_id(v):
-                if index == self.maze_graph.target_id:
-                    self.found=True
-                if self.visited[index] == False:
-                    self.queue.append(index)
-                    self.visited[index] = True
-        
-        return path
+        Returns:
+            list[tuple(int, int)]: Labels of the path from the start to the exit, or None if the
+                exit was not reached
+        """
+        target_id = self.maze_graph.target_id
+        if not self.visited[target_id]:
+            return None
+        return _traverse_parents(self.maze_graph, self.parent, target_id)
 
 
 class DepthFirstSearch:
     """ Class representing a depth first search in a given graph.
     """
 
-    def __init__(self, maze_graph):
+    def __init__(self, maze_graph, budget=None):
         """ Class constructor
                         
             Args:
                 maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                budget (SearchBudget, optional): Limits of the search. Defaults to None.
         """
         self.maze_graph = maze_graph
-        self.visited = []
+        self.visited = [] # Labels of the visited vertexes, in visiting order
+        self.visited_mask = bytearray(maze_graph.get_id_space_size()) # visited_mask[vertex_id] == 1 once visited
         self.has_found = False
+        self.statistics = None # Optional SearchStatistics
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
 
     def do_search(self):
         """ Method that starts a depth-first search over a a graph that represents a maze board game.
             The objective is to find the exit of the maze, given the start position and the exit position.
 
             Returns:
-                list[tuple(int, int)]: List of traversed vertexes labels
+                list[tuple(int, int)]: List of traversed vertexes labels, up to where the budget ran out if it did
         """
-        first_vertex = self.maze_graph.vertexes_list[self.maze_graph.root_id]
-
-        self._depth_first_search(first_vertex)
+        _run_within_budget(self, lambda: self._depth_first_search(self.maze_graph.root_id),
+                           lambda: self.visited, lambda: self.has_found, False)
+        if self.statistics is not None:
+            self.statistics.generated = len(self.visited)
+            self.statistics.finish(self.visited, len(self.visited), False)
         return self.visited
 
-    def _depth_first_search(self, maze_vertex):
-        """ Private method that makes a recursion of a depth-first search over a graph that represents
-            a maze board game.  
+    def _depth_first_search(self, vertex_id):
+        """ Private method that runs a depth-first search over a graph that represents a maze board game.
+            The recursion is kept in an explicit stack holding, for each vertex in the current branch,
+            an iterator over its remaining adjacences, so long corridors do not hit the recursion limit.
         
             Args:
-                maze_graph: maze board represented by a graph structure
-                maze_vertex: current visited position in maze, represented by a graph vertex
+                vertex_id: starting position in maze, represented by a graph vertex id
         """
-        # Trivial case 1: has found in another branch
-        if (self.has_found == True):
-            return
+        maze_graph = self.maze_graph
+        target_id = maze_graph.target_id
+        visited_mask = self.visited_mask
+        adjacences = maze_graph.get_vertex_adjacence_by_id
+        if self.statistics is not None:
+            self.statistics.start()
+            adjacences = self._counting_adjacences(adjacences)
+        if self.budget is not None:
+            adjacences = self.budget.charging_expand(adjacences)
 
-        # Saves visited vertex in set (for better search performance)
-        # and 
-        self.visited.append(maze_vertex.get_label())
-
-        # Trivial case 2: found exit
-        if (maze_vertex.id == self.maze_graph.target_id):
+        # Saves visited vertex in the mask (for O(1) checks) and in the ordered trace
+        visited_mask[vertex_id] = 1
+        self.visited.append(maze_graph.get_vertex_label_by_id(vertex_id))
+        if (vertex_id == target_id):
             self.has_found = True
             return
 
-        for next_tile_id in maze_vertex.get_adjacence_list():
-            next_tile_as_vertex = self.maze_graph.vertexes_list[next_tile_id]
+        stack = [iter(adjacences(vertex_id))]
+        while stack:
+            for next_tile_id in stack[-1]:
+                # If the tile was not visited yet, go deeper into it
+                if not visited_mask[next_tile_id]:
+                    visited_mask[next_tile_id] = 1
+                    self.visited.append(maze_graph.get_vertex_label_by_id(next_tile_id))
+
+                    # Found exit
+                    if (next_tile_id == target_id):
+                        self.has_found = True
+                        return
 
-            # If the tile was not visited yet, do another recursion to the next tile
-            if not next_tile_as_vertex.get_label() in self.visited:
-              self._depth_first_search(next_tile_as_vertex)
+                    stack.append(iter(adjacences(next_tile_id)))
+                    if self.statistics is not None and len(stack) > self.statistics.peak_open:
+                        self.statistics.peak_open = len(stack)
+                    break
+            else:
+                # Every adjacence of the vertex on top was explored: backtrack
+                stack.pop()
+
+    def _counting_adjacences(self, adjacences):
+        """ Private method that wraps the function giving the adjacences iterator of each visited vertex,
+            counting expansions and the adjacences actually examined, as the search stops at the exit
+            without examining the remaining adjacences of the vertexes in the current branch.
+        """
+        statistics = self.statistics
+        statistics.peak_open = 1
+        def counted_adjacences(vertex_id):
+            statistics.expanded = statistics.expanded + 1
+            for adjacence in adjacences(vertex_id):
+                statistics.examined = statistics.examined + 1
+                yield adjacence
+        return counted_adjacences
 
     def print_visited_vertexes(self):
         """ Prints all id's of the vertexes representing the way out of the maze 
@@ -307,4 +926,1033 @@ class DepthFirstSearch:
         for visited_vertex in self.do_search():
             way_out = way_out + "{} -> ".format(visited_vertex)
         way_out = way_out + "end!"
-        print(way_out)
\ No newline at end of file
+        print(way_out)
+
+class BidirectionalBFS:
+    """ Class representing a bidirectional breadth-first search: one BFS grows from the maze's starting
+    point and another from its exit, alternately expanding whole levels of the smaller frontier, until
+    they meet in the middle.
+    """
+
+    def __init__(self, maze_graph, budget=None):
+        """ Class constructor
+
+            Args:
+                maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                budget (SearchBudget, optional): Limits of the search. Defaults to None.
+        """
+        self.maze_graph = maze_graph
+        # Index 0 holds the search from the starting point, index 1 the search from the exit
+        self.distance = [array('i', [-1]) * maze_graph.get_id_space_size() for side in range(2)]
+        self.parent = [array('i', [-1]) * maze_graph.get_id_space_size() for side in range(2)]
+        self.path = None
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
+
+    def do_search(self):
+        """ Runs bidirectional BFS
+
+            Returns:
+                list[tuple(int, int)]: Labels of the shortest path from the start to the exit, or None
+                    if the exit can not be reached. If the budget ran out, the path to the vertex reached
+                    from the start that is closest to the exit.
+        """
+        return _run_within_budget(self, self._bidirectional_search, self._get_partial_path)
+
+    def _get_partial_path(self):
+        """ Private method that builds the result of a search stopped by its budget
+        """
+        maze_graph = self.maze_graph
+        reached_ids = (vertex_id for (vertex_id, distance) in enumerate(self.distance[0]) if distance != -1)
+        return _closest_reached_path(maze_graph, self.parent[0], reached_ids,
+                                     maze_graph.get_heuristic_values(maze_graph.target_id, "manhattan"))
+
+    def _bidirectional_search(self):
+        """ Private method that runs the search loop
+        """
+        maze_graph = self.maze_graph
+        root_id = maze_graph.root_id
+        target_id = maze_graph.target_id
+        if root_id == target_id:
+            self.path = [maze_graph.get_vertex_label_by_id(root_id)]
+            return self.path
+
+        self.distance[0][root_id] = 0
+        self.distance[1][target_id] = 0
+        frontiers = [[root_id], [target_id]]
+
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            (frontiers[side], meeting_id) = self._expand_level(side, frontiers[side])
+            if meeting_id != -1:
+                self.path = _join_bidirectional_path(maze_graph, self.parent[0], self.parent[1], meeting_id)
+                return self.path
+
+        return None
+
+    def _expand_level(self, side, frontier):
+        """ Private method that expands every vertex of one level of one of the searches
+
+            Args:
+                side (int): 0 for the search from the start, 1 for the search from the exit
+                frontier (list[int]): Ids of the vertexes in the level
+
+            Returns:
+                tuple(list[int], int): The next level, and the vertex where the searches met with the
+                    shortest total distance (-1 if they did not meet)
+        """
+        maze_graph = self.maze_graph
+        distance = self.distance[side]
+        other_distance = self.distance[1 - side]
+        parent = self.parent[side]
+        expand = maze_graph.get_vertex_adjacence_by_id
+        if self.budget is not None:
+            expand = self.budget.charging_expand(expand)
+
+        next_frontier = []
+        meeting_id = -1
+        meeting_distance = -1
+        for vertex_id in frontier:
+            neighbor_distance = distance[vertex_id] + 1
+            for neighbor_id in expand(vertex_id):
+                if distance[neighbor_id] != -1:
+                    continue
+                distance[neighbor_id] = neighbor_distance
+                parent[neighbor_id] = vertex_id
+                next_frontier.append(neighbor_id)
+                # Keep the meeting point with the shortest total path in this level
+                if other_distance[neighbor_id] != -1:
+                    total_distance = neighbor_distance + other_distance[neighbor_id]
+                    if meeting_id == -1 or total_distance < meeting_distance:
+                        meeting_id = neighbor_id
+                        meeting_distance = total_distance
+
+        return (next_frontier, meeting_id)
+
+
+class BidirectionalAStar:
+    """ Class representing a bidirectional A* search: one A* runs from the maze's starting point towards
+    the exit and another from the exit towards the starting point, alternately expanding one vertex each.
+    The search stops as soon as the smallest f of either side reaches the cost of the best meeting found
+    so far: every path not found yet runs through an open vertex of both sides, so it costs at least
+    that f. Ties between equal f values go to the vertex closest to the side's goal (lowest h).
+    """
+
+    def __init__(self, maze_graph, heuristic="euclidean", budget=None):
+        """ Class constructor
+
+            Args:
+                maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                heuristic (str or callable, optional): Heuristic name or function, see MazeGraph.get_heuristic_values.
+                    Defaults to "euclidean".
+                budget (SearchBudget, optional): Limits of the search. Defaults to None.
+        """
+        self.maze_graph = maze_graph
+        # Index 0 holds the search from the starting point, index 1 the search from the exit
+        self.h = [maze_graph.get_heuristic_values(maze_graph.target_id, heuristic),
+                  maze_graph.get_heuristic_values(maze_graph.root_id, heuristic)]
+        self.open = [[], []] # Binary heaps of (f, h, vertex id) entries
+        self.open_g = [{}, {}] # Best g found so far for each vertex id reached by each search
+        self.parent = [{}, {}] # Parent id of each vertex id reached by each search
+        self.closed = [bytearray(maze_graph.get_id_space_size()) for side in range(2)]
+        self.path = None
+        self.statistics = None # Optional SearchStatistics, counting both sides
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
+
+    def do_search(self):
+        """ Runs bidirectional A* Search
+
+            Returns:
+                list[tuple(int, int)]: Labels of the shortest path from the start to the exit, or None
+                    if the exit can not be reached. If the budget ran out, the path to the vertex reached
+                    from the start that is closest to the exit.
+        """
+        result = _run_within_budget(self, self._bidirectional_search,
+                                    lambda: _closest_reached_path(self.maze_graph, self.parent[0], self.parent[0], self.h[0]))
+        if self.statistics is not None:
+            self.statistics.finish(result, self.closed[0].count(1) + self.closed[1].count(1))
+            if self.statistics.duplicates is not None:
+                self.statistics.duplicates = self.statistics.duplicates + 1 # Both starts were generated without an adjacence
+        return result
+
+    def _bidirectional_search(self):
+        """ Private method that runs the search loop
+        """
+        maze_graph = self.maze_graph
+        expand = maze_graph.get_vertex_adjacence_by_id
+        push = heapq.heappush
+        if self.statistics is not None:
+            self.statistics.start()
+            expand = self.statistics.counting_expand(expand)
+            push = self.statistics.counting_push(push)
+        if self.budget is not None:
+            expand = self.budget.charging_expand(expand)
+        roots = (maze_graph.root_id, maze_graph.target_id)
+        if roots[0] == roots[1]:
+            self.path = [maze_graph.get_vertex_label_by_id(roots[0])]
+            return self.path
+
+        for side in range(2):
+            self.open_g[side][roots[side]] = 0
+            self.parent[side][roots[side]] = None
+            root_h = self.h[side][roots[side]]
+            push(self.open[side], (root_h, root_h, roots[side]))
+
+        best_cost = None
+        meeting_id = -1
+        side = 0
+        while self.open[0] and self.open[1]:
+            # A shorter path would run through an open vertex of each side, costing at least both their f
+            if best_cost is not None and max(self.open[0][0][0], self.open[1][0][0]) >= best_cost:
+                break
+
+            (open_heap, open_g, other_g) = (self.open[side], self.open_g[side], self.open_g[1 - side])
+            (parent, closed, h) = (self.parent[side], self.closed[side], self.h[side])
+
+            current_id = heapq.heappop(open_heap)[2]
+            if not closed[current_id]:
+                closed[current_id] = 1
+                neighbor_g = open_g[current_id] + 1
+                for neighbor_id in expand(current_id):
+                    if closed[neighbor_id]:
+                        continue
+                    if open_g.get(neighbor_id, neighbor_g + 1) > neighbor_g:
+                        open_g[neighbor_id] = neighbor_g
+                        parent[neighbor_id] = current_id
+                        push(open_heap, (h[neighbor_id] + neighbor_g, h[neighbor_id], neighbor_id))
+                        # The neighbour was reached by the other search too: the searches met
+                        if neighbor_id in other_g:
+                            cost = neighbor_g + other_g[neighbor_id]
+                            if best_cost is None or cost < best_cost:
+                                best_cost = cost
+                                meeting_id = neighbor_id
+            side = 1 - side
+
+        if meeting_id == -1:
+            return None
+        self.path = _join_bidirectional_path(maze_graph, self.parent[0], self.parent[1], meeting_id)
+        return self.path
+
+
+def _join_bidirectional_path(maze_graph, forward_parent, backward_parent, meeting_id):
+    """ Joins the two halves of a bidirectional search path at the vertex where they met
+
+        Args:
+            maze_graph: The searched maze graph
+            forward_parent (dict[int, int] or array[int]): Parents in the search from the starting point
+            backward_parent (dict[int, int] or array[int]): Parents in the search from the exit
+            meeting_id (int): Vertex reached by both searches
+
+        Returns:
+            list[tuple(int, int)]: Labels of the path from the starting point to the exit
+    """
+    forward_path = _traverse_parents(maze_graph, forward_parent, meeting_id)
+    backward_path = _traverse_parents(maze_graph, backward_parent, meeting_id)
+    backward_path.reverse()
+    return forward_path + backward_path[1:]
+
+
+class JumpPointSearch:
+    """ Class representing a Jump Point Search over the maze's free-cell mask. JPS is A* on a uniform-cost
+    grid that only opens jump points: from each of them, moves are followed in a straight line as long as
+    every other path to the cells passed by is at least as short. Paths are taken in canonical order
+    (vertical moves first): a vertical jump stops where a horizontal jump finds something, and a
+    horizontal jump stops at the exit or where a wall ending beside it forces a vertical move.
+    """
+
+    def __init__(self, maze_graph, budget=None):
+        """ Class constructor
+
+            Args:
+                maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                budget (SearchBudget, optional): Limits of the search, charged once per expanded jump point.
+                    Defaults to None.
+        """
+        self.maze_graph = maze_graph
+        # The mask gets a border of walls, so jumps never have to check the board limits
+        self.width = maze_graph.number_of_columns + 2
+        free_cell_mask = maze_graph.get_free_cell_mask()
+        number_of_columns = maze_graph.number_of_columns
+        border = bytes(self.width)
+        self.mask = border + b''.join(b'\x00' + free_cell_mask[start:start + number_of_columns] + b'\x00'
+                                      for start in range(0, len(free_cell_mask), number_of_columns)) + border
+        self.goal = self._to_index(maze_graph.get_vertex_label_by_id(maze_graph.target_id))
+        self.open = [] # Binary heap of (f, jump point index) entries
+        self.open_g = {} # Best g found so far for each jump point index
+        self.parent = {} # Parent jump point of each jump point index
+        self.closed = set()
+        self.path = None
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
+
+    def _to_index(self, label):
+        """ Private method that converts a board label into its index in the bordered mask
+        """
+        (row, column) = label
+        return (row + 1) * self.width + column + 1
+
+    def _to_label(self, index):
+        """ Private method that converts an index in the bordered mask into a board label
+        """
+        (row, column) = divmod(index, self.width)
+        return (row - 1, column - 1)
+
+    def _distance(self, index, other_index):
+        """ Private method that returns the Manhattan distance between two mask indexes
+        """
+        (row, column) = divmod(index, self.width)
+        (other_row, other_column) = divmod(other_index, self.width)
+        return abs(row - other_row) + abs(column - other_column)
+
+    def do_search(self):
+        """ Runs Jump Point Search
+
+            Returns:
+                list[tuple(int, int)]: Labels of every vertex in the path from the start to the exit,
+                    or None if the exit can not be reached. If the budget ran out, the path to the
+                    jump point closest to the exit.
+        """
+        return _run_within_budget(self, self._jump_point_search, self._get_partial_path)
+
+    def _get_partial_path(self):
+        """ Private method that builds the result of a search stopped by its budget
+        """
+        return self._expand_path(min(self.parent, key=lambda index: self._distance(index, self.goal)))
+
+    def _jump_point_search(self):
+        """ Private method that runs the search loop
+        """
+        budget = self.budget
+        start = self._to_index(self.maze_graph.get_vertex_label_by_id(self.maze_graph.root_id))
+        self.open_g[start] = 0
+        self.parent[start] = None
+        heapq.heappush(self.open, (self._distance(start, self.goal), start))
+
+        while self.open:
+            current = heapq.heappop(self.open)[1]
+            if current in self.closed:
+                continue
+            self.closed.add(current)
+            if budget is not None:
+                budget.charge()
+
+            if current == self.goal:
+                self.path = self._expand_path(current)
+                return self.path
+
+            for direction in self._successor_directions(current):
+                jump_point = self._jump(current, direction)
+                if jump_point is None or jump_point in self.closed:
+                    continue
+                jump_point_g = self.open_g[current] + self._distance(current, jump_point)
+                if self.open_g.get(jump_point, jump_point_g + 1) > jump_point_g:
+                    self.open_g[jump_point] = jump_point_g
+                    self.parent[jump_point] = current
+                    heapq.heappush(self.open, (jump_point_g + self._distance(jump_point, self.goal), jump_point))
+
+        return None
+
+    def _successor_directions(self, index):
+        """ Private method that prunes the directions to jump to from a jump point, given the direction
+            it was reached from: after a vertical move, the vertical direction and both horizontal ones;
+            after a horizontal move, the horizontal direction and the forced vertical ones.
+
+            Returns:
+                list[int]: Index steps of the directions to jump to
+        """
+        width = self.width
+        parent = self.parent[index]
+        if parent is None:
+            return [-width, 1, width, -1]
+
+        if parent // width == index // width:
+            direction = 1 if index > parent else -1
+            directions = [direction]
+            for vertical in (-width, width):
+                if self.mask[index + vertical] and not self.mask[index + vertical - direction]:
+                    directions.append(vertical)
+            return directions
+
+        direction = width if index > parent else -width
+        return [direction, 1, -1]
+
+    def _jump(self, index, direction):
+        """ Private method that moves in a straight line from a mask index until reaching a jump point
+
+            Args:
+                index (int): Index the jump starts from
+                direction (int): Index step of the jump (1 or -1 horizontally, the mask width vertically)
+
+            Returns:
+                int: The jump point index, or None if a wall was reached first
+        """
+        if direction == 1 or direction == -1:
+            return self._jump_horizontal(index, direction)
+
+        mask = self.mask
+        while True:
+            index = index + direction
+            if not mask[index]:
+                return None
+            if index == self.goal:
+                return index
+            if self._jump_horizontal(index, 1) is not None or self._jump_horizontal(index, -1) is not None:
+                return index
+
+    def _jump_horizontal(self, index, direction):
+        """ Private method that moves horizontally from a mask index until reaching the exit or a
+            cell with a forced vertical neighbour
+
+            Args:
+                index (int): Index the jump starts from
+                direction (int): 1 to move right, -1 to move left
+
+            Returns:
+                int: The jump point index, or None if a wall was reached first
+        """
+        mask = self.mask
+        width = self.width
+        goal = self.goal
+        while True:
+            index = index + direction
+            if not mask[index]:
+                return None
+            if index == goal:
+                return index
+            if (mask[index - width] and not mask[index - width - direction]) or \
+               (mask[index + width] and not mask[index + width - direction]):
+                return index
+
+    def _expand_path(self, index):
+        """ Private method that expands the jump points chain ending at an index into every
+            board position walked through
+
+            Returns:
+                list[tuple(int, int)]: Labels of the path from the start to the index
+        """
+        jump_points = []
+        while index is not None:
+            jump_points.append(index)
+            index = self.parent[index]
+        jump_points.reverse()
+
+        path = [self._to_label(jump_points[0])]
+        for (start, end) in zip(jump_points, jump_points[1:]):
+            if start // self.width == end // self.width:
+                step = 1 if end > start else -1
+            else:
+                step = self.width if end > start else -self.width
+            path.extend(self._to_label(index) for index in range(start + step, end + step, step))
+        return path
+
+
+class ContractedAStarSearch:
+    """ Class representing an A* search over the corridor-contracted view of the maze graph (see
+    MazeGraph.get_contracted_graph). Only junctions and dead ends are expanded, each corridor being
+    crossed in one step at the cost of its number of moves, and the path found is expanded back into
+    every board position walked through. Starting and ending points inside a corridor are attached to
+    both corridor ends. Without an heuristic the search is Dijkstra's algorithm.
+    """
+    GOAL = -1 # Node of the open heap entries that reach the exit
+
+    def __init__(self, maze_graph, heuristic="euclidean", budget=None):
+        """ Class constructor
+
+            Args:
+                maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                heuristic (str or callable, optional): Heuristic name or function, see MazeGraph.get_heuristic_values.
+                    None runs Dijkstra's algorithm. Defaults to "euclidean".
+                budget (SearchBudget, optional): Limits of the search, charged once per expanded node.
+                    Defaults to None.
+        """
+        self.maze_graph = maze_graph
+        self.contracted_graph = maze_graph.get_contracted_graph()
+        self.open = [] # Binary heap of (f, node) entries
+        self.open_g = {} # Best g found so far for each node reached by the search
+        self.parent = {} # (parent node, corridor, position) of each node reached, see '_get_node_path'
+        self.closed = set()
+        self.goal_parent = None # (node, corridor, position) the best path to the exit leaves from
+        self.path = None
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
+
+        # Dijkstra's algorithm is A* with an heuristic of zero
+        self.heuristic = heuristic
+        if heuristic is None:
+            self.h = array('i', [0]) * maze_graph.get_id_space_size()
+        else:
+            self.h = maze_graph.get_heuristic_values(maze_graph.target_id, heuristic)
+
+    def do_search(self):
+        """ Runs A* Search over the contracted graph
+
+            Returns:
+                list[tuple(int, int)]: Labels of every vertex in the path from the start to the exit,
+                    or None if the exit can not be reached. If the budget ran out, the path to the
+                    node closest to the exit.
+        """
+        return _run_within_budget(self, self._contracted_search, self._get_partial_path)
+
+    def _get_partial_path(self):
+        """ Private method that builds the result of a search stopped by its budget
+        """
+        h = self.h
+        if self.heuristic is None:
+            h = self.maze_graph.get_heuristic_values(self.maze_graph.target_id, "manhattan")
+        node_vertex_ids = self.contracted_graph.node_vertex_ids
+        best_node = min(self.parent, key=lambda node: h[node_vertex_ids[node]], default=None)
+        if best_node is None:
+            return None
+        return self._to_labels(self._get_node_path(best_node))
+
+    def _contracted_search(self):
+        """ Private method that runs the search loop
+        """
+        maze_graph = self.maze_graph
+        contracted_graph = self.contracted_graph
+        node_vertex_ids = contracted_graph.node_vertex_ids
+        node_adjacences = contracted_graph.node_adjacences
+        open_heap = self.open
+        open_g = self.open_g
+        parent = self.parent
+        closed = self.closed
+        h = self.h
+        budget = self.budget
+        root_id = maze_graph.root_id
+        target_id = maze_graph.target_id
+        if root_id == target_id:
+            self.path = [maze_graph.get_vertex_label_by_id(root_id)]
+            return self.path
+
+        # The ways out of the start are its node, or both ends of its corridor
+        for (node, cost, corridor, position) in contracted_graph.get_corridor_position(root_id):
+            if open_g.get(node, cost + 1) > cost:
+                open_g[node] = cost
+                parent[node] = (None, corridor, position)
+                heapq.heappush(open_heap, (cost + h[node_vertex_ids[node]], node))
+
+        # The ways into the exit, by node. A start in the exit's corridor may also walk straight to it
+        goal_entries = {}
+        goal_g = None
+        for (node, cost, corridor, position) in contracted_graph.get_corridor_position(target_id):
+            if goal_entries.get(node, (cost + 1,))[0] > cost:
+                goal_entries[node] = (cost, corridor, position)
+            if corridor is not None and corridor == contracted_graph.vertex_corridor[root_id] != -1:
+                goal_g = abs(position - contracted_graph.get_corridor_position(root_id)[0][3])
+                self.goal_parent = (None, corridor, position)
+                heapq.heappush(open_heap, (goal_g, self.GOAL))
+
+        while open_heap:
+            node = heapq.heappop(open_heap)[1]
+            if node == self.GOAL:
+                self.path = self._to_labels(self._get_goal_path())
+                return self.path
+            if node in closed:
+                continue
+            closed.add(node)
+            if budget is not None:
+                budget.charge()
+
+            g = open_g[node]
+            goal_entry = goal_entries.get(node)
+            if goal_entry is not None and (goal_g is None or g + goal_entry[0] < goal_g):
+                goal_g = g + goal_entry[0]
+                self.goal_parent = (node, goal_entry[1], goal_entry[2])
+                heapq.heappush(open_heap, (goal_g, self.GOAL))
+
+            for (neighbor, cost, corridor) in node_adjacences[node]:
+                if neighbor in closed:
+                    continue
+                neighbor_g = g + cost
+                if open_g.get(neighbor, neighbor_g + 1) > neighbor_g:
+                    open_g[neighbor] = neighbor_g
+                    parent[neighbor] = (node, corridor, -1)
+                    heapq.heappush(open_heap, (neighbor_g + h[node_vertex_ids[neighbor]], neighbor))
+
+        return None
+
+    def _get_node_path(self, node):
+        """ Private method that expands the chain of nodes ending at a node into every vertex walked through.
+            Each node's parent entry tells where it was reached from: the parent node through a whole
+            corridor (position -1), or the start, which is the node itself (corridor None) or the inner
+            corridor vertex at 'position', walking the corridor away from the node.
+
+            Returns:
+                list[int]: Ids of the path vertexes, from the start to the node
+        """
+        contracted_graph = self.contracted_graph
+        reversed_path = []
+        while node is not None:
+            reversed_path.append(contracted_graph.node_vertex_ids[node])
+            (parent_node, corridor, position) = self.parent[node]
+            if parent_node is not None:
+                reversed_path.extend(reversed(contracted_graph.get_corridor_vertex_ids(corridor)))
+            elif corridor is not None:
+                reversed_path.extend(contracted_graph.get_corridor_vertex_ids(corridor)[:position + 1])
+            node = parent_node
+        reversed_path.reverse()
+        return reversed_path
+
+    def _get_goal_path(self):
+        """ Private method that builds the path to the exit from 'goal_parent'
+
+            Returns:
+                list[int]: Ids of the path vertexes, from the start to the exit
+        """
+        (node, corridor, position) = self.goal_parent
+        if node is None:
+            # Start and exit in the same corridor
+            corridor_vertex_ids = list(self.contracted_graph.get_corridor_vertex_ids(corridor))
+            start_position = self.contracted_graph.get_corridor_position(self.maze_graph.root_id)[0][3]
+            if start_position <= position:
+                return corridor_vertex_ids[start_position:position + 1]
+            return corridor_vertex_ids[position:start_position + 1][::-1]
+        path = self._get_node_path(node)
+        if corridor is not None:
+            path.extend(self.contracted_graph.get_corridor_vertex_ids(corridor)[:position + 1])
+        return path
+
+    def _to_labels(self, vertex_ids):
+        """ Private method that converts vertex ids into labels
+        """
+        get_label = self.maze_graph.get_vertex_label_by_id
+        return [get_label(vertex_id) for vertex_id in vertex_ids]
+
+
+class HierarchicalAStarSearch:
+    """ Class representing a hierarchical A* search (HPA*) over the cluster abstraction of the maze graph
+    (see MazeGraph.get_hierarchical_graph). The start and the exit are linked to the nodes of their
+    clusters, A* runs over the abstract nodes, and only the abstract edges of the path found are refined
+    into board positions, each by a search inside one cluster. The abstraction is built once per graph,
+    so queries after the first one only search the start and exit clusters and the small abstract graph.
+    Paths are near optimal: they only cross cluster borders at entrances. Moves cost 1, terrain costs
+    are not taken into account.
+    """
+
+    def __init__(self, maze_graph, heuristic="euclidean", cluster_size=16, budget=None):
+        """ Class constructor
+
+            Args:
+                maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                heuristic (str or callable, optional): Heuristic name or function, see MazeGraph.get_heuristic_values.
+                    It is only computed for the abstract nodes reached, so DISTANCE_FIELD_HEURISTIC, which
+                    searches the whole board, is not accepted. Defaults to "euclidean".
+                cluster_size (int, optional): Number of rows and columns of each cluster. Defaults to 16.
+                budget (SearchBudget, optional): Limits of the search, charged once per expanded abstract node.
+                    Defaults to None.
+        """
+        if heuristic == DISTANCE_FIELD_HEURISTIC:
+            raise ValueError("HPA* only computes heuristic values for the abstract nodes it reaches")
+        self.maze_graph = maze_graph
+        self.hierarchical_graph = maze_graph.get_hierarchical_graph(cluster_size)
+        self.open = [] # Binary heap of (f, vertex id) entries
+        self.open_g = {} # Best g found so far for each abstract node reached by the search
+        self.parent = {} # Abstract node each reached node was reached from
+        self.closed = set()
+        self.path = None
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
+        self.heuristic_function = HEURISTICS[heuristic] if isinstance(heuristic, str) else heuristic
+        self.h = {} # Heuristic value of each abstract node reached
+
+    def do_search(self):
+        """ Runs HPA*
+
+            Returns:
+                list[tuple(int, int)]: Labels of every vertex in the path from the start to the exit,
+                    or None if the exit can not be reached. If the budget ran out, the path to the
+                    abstract node closest to the exit.
+        """
+        return _run_within_budget(self, self._abstract_search, self._get_partial_path)
+
+    def _get_partial_path(self):
+        """ Private method that builds the result of a search stopped by its budget
+        """
+        best_id = min(self.closed, key=self.h.__getitem__, default=None)
+        if best_id is None:
+            return None
+        return self._refine(best_id)
+
+    def _abstract_search(self):
+        """ Private method that runs the search loop over the abstract graph
+        """
+        maze_graph = self.maze_graph
+        hierarchical_graph = self.hierarchical_graph
+        get_node_adjacences = hierarchical_graph.get_node_adjacences
+        open_heap = self.open
+        open_g = self.open_g
+        parent = self.parent
+        closed = self.closed
+        h = self.h
+        heuristic_function = self.heuristic_function
+        get_label = maze_graph.get_vertex_label_by_id
+        budget = self.budget
+        root_id = maze_graph.root_id
+        target_id = maze_graph.target_id
+        (target_row, target_column) = get_label(target_id)
+
+        # Temporary edges: the start to the nodes of its cluster, the nodes of the exit cluster to the exit,
+        # and the start straight to the exit when they share a cluster
+        root_edges = list(hierarchical_graph.get_entry_edges(root_id).items())
+        target_edges = hierarchical_graph.get_entry_edges(target_id)
+        if hierarchical_graph.get_cluster(root_id) == hierarchical_graph.get_cluster(target_id):
+            distance = hierarchical_graph.get_cluster_distance(root_id, target_id)
+            if distance is not None:
+                root_edges.append((target_id, distance))
+
+        open_g[root_id] = 0
+        parent[root_id] = None
+        (row, column) = get_label(root_id)
+        h[root_id] = heuristic_function(abs(row - target_row), abs(column - target_column))
+        heapq.heappush(open_heap, (h[root_id], root_id))
+        while open_heap:
+            vertex_id = heapq.heappop(open_heap)[1]
+            if vertex_id == target_id:
+                self.path = self._refine(target_id)
+                return self.path
+            if vertex_id in closed:
+                continue
+            closed.add(vertex_id)
+            if budget is not None:
+                budget.charge()
+
+            g = open_g[vertex_id]
+            adjacences = get_node_adjacences(vertex_id)
+            if vertex_id == root_id:
+                adjacences = adjacences + root_edges
+            if vertex_id in target_edges:
+                adjacences = adjacences + [(target_id, target_edges[vertex_id])]
+            for (neighbor_id, cost) in adjacences:
+                if neighbor_id in closed:
+                    continue
+                neighbor_g = g + cost
+                if open_g.get(neighbor_id, neighbor_g + 1) > neighbor_g:
+                    open_g[neighbor_id] = neighbor_g
+                    parent[neighbor_id] = vertex_id
+                    neighbor_h = h.get(neighbor_id)
+                    if neighbor_h is None:
+                        (row, column) = get_label(neighbor_id)
+                        neighbor_h = heuristic_function(abs(row - target_row), abs(column - target_column))
+                        h[neighbor_id] = neighbor_h
+                    heapq.heappush(open_heap, (neighbor_g + neighbor_h, neighbor_id))
+
+        return None
+
+    def _refine(self, vertex_id):
+        """ Private method that expands the chain of abstract nodes ending at a vertex into every vertex
+            walked through, refining each abstract edge inside its cluster
+
+            Returns:
+                list[tuple(int, int)]: Labels of the path vertexes, from the start to the vertex
+        """
+        hierarchical_graph = self.hierarchical_graph
+        parent = self.parent
+        abstract_path = []
+        while vertex_id is not None:
+            abstract_path.append(vertex_id)
+            vertex_id = parent[vertex_id]
+        abstract_path.reverse()
+
+        path = abstract_path[:1]
+        for (vertex_id, next_vertex_id) in zip(abstract_path, abstract_path[1:]):
+            path.extend(hierarchical_graph.get_cluster_path(vertex_id, next_vertex_id)[1:])
+        get_label = self.maze_graph.get_vertex_label_by_id
+        return [get_label(vertex_id) for vertex_id in path]
+
+
+class BatchSearch:
+    """ Class that answers many (start, exit) queries over one maze graph. Moves cost the same and every
+    adjacence goes both ways, so one BFS tree from a vertex holds the shortest paths from it to every
+    other vertex, and to it from every other vertex. Queries are grouped by their start or by their exit,
+    whichever has fewer distinct vertexes, and each group is answered by a single BFS that stops once
+    all the group's other ends were reached. The BFS buffers are allocated once and only the entries
+    touched by the last tree are reset between groups. The graph itself is never changed, so batches may
+    run on the same graph at the same time, each with a BatchSearch of its own.
+    """
+
+    def __init__(self, maze_graph, budget=None):
+        """ Class constructor
+
+            Args:
+                maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                budget (SearchBudget, optional): Limits of each batch, all trees included. Defaults to None.
+        """
+        self.maze_graph = maze_graph
+        self.distance = array('i', [-1]) * maze_graph.get_id_space_size() # -1 for vertexes not reached
+        self.parent = array('i', [-1]) * maze_graph.get_id_space_size()
+        self.queue = array('i', [0]) * maze_graph.get_id_space_size()
+        self.reached_count = 0 # Size of the queue prefix touched by the last tree
+        self.tree_count = 0 # Number of BFS trees grown by the last batch
+        self.budget = budget
+        self.status = None # STATUS_FOUND if every query of the last batch was answered
+
+    def do_search(self, queries):
+        """ Answers a batch of queries
+
+            Args:
+                queries (list[tuple(tuple(int, int), tuple(int, int))]): (start label, exit label) pairs
+
+            Returns:
+                list[list[tuple(int, int)]]: For each query, in order, the labels of a shortest path from
+                    its start to its exit, or None if either end is not a free position, the exit can
+                    not be reached from the start or the budget ran out before the query was answered
+        """
+        get_id = self.maze_graph.get_vertex_id_by_label
+        are_connected = self.maze_graph.are_connected
+        pairs = []
+        for (start_label, target_label) in queries:
+            try:
+                pair = (get_id(start_label), get_id(target_label))
+            except KeyError:
+                pair = None
+            # Queries between different connected components are answered without growing a tree
+            pairs.append(pair if pair is not None and are_connected(*pair) else None)
+
+        # Grow the trees from the side with fewer distinct vertexes. Paths are read from the tree root, so
+        # the paths of trees grown from an exit go from the exit to the start and are reversed
+        by_target = len({pair[1] for pair in pairs if pair}) < len({pair[0] for pair in pairs if pair})
+        groups = {}
+        for (index, pair) in enumerate(pairs):
+            if pair is not None:
+                (root_id, end_id) = (pair[1], pair[0]) if by_target else pair
+                groups.setdefault(root_id, []).append((index, end_id))
+
+        paths = [None] * len(pairs)
+        self.tree_count = 0
+        def answer_groups():
+            for (root_id, group) in groups.items():
+                self._grow_tree(root_id, {end_id for (index, end_id) in group})
+                self.tree_count = self.tree_count + 1
+                for (index, end_id) in group:
+                    if self.distance[end_id] != -1:
+                        path = _traverse_parents(self.maze_graph, self.parent, end_id)
+                        if by_target:
+                            path.reverse()
+                        paths[index] = path
+            return paths
+        return _run_within_budget(self, answer_groups, lambda: paths, lambda: None not in paths, False)
+
+    def _grow_tree(self, root_id, end_ids):
+        """ Private method that runs a BFS from a vertex, filling 'distance' and 'parent', until every
+            vertex in a set was reached or the whole component of the root was explored
+
+            Args:
+                root_id (int): Root vertex id
+                end_ids (set[int]): Ids of the vertexes the tree must reach
+        """
+        maze_graph = self.maze_graph
+        distance = self.distance
+        parent = self.parent
+        queue = self.queue
+        expand = maze_graph.get_vertex_adjacence_by_id
+        if self.budget is not None:
+            expand = self.budget.charging_expand(expand)
+
+        # Forget the previous tree, touching only the vertexes it reached
+        for vertex_id in queue[:self.reached_count]:
+            distance[vertex_id] = -1
+            parent[vertex_id] = -1
+
+        remaining = len(end_ids)
+        head = 0
+        tail = 1
+        queue[0] = root_id
+        distance[root_id] = 0
+        if root_id in end_ids:
+            remaining = remaining - 1
+
+        try:
+            while head < tail and remaining > 0:
+                vertex_id = queue[head]
+                head = head + 1
+                neighbor_distance = distance[vertex_id] + 1
+                for neighbor_id in expand(vertex_id):
+                    if distance[neighbor_id] == -1:
+                        distance[neighbor_id] = neighbor_distance
+                        parent[neighbor_id] = vertex_id
+                        queue[tail] = neighbor_id
+                        tail = tail + 1
+                        if neighbor_id in end_ids:
+                            remaining = remaining - 1
+        finally:
+            # Also kept when the budget runs out, so the next tree resets every touched entry
+            self.reached_count = tail
+
+
+class LifelongPlanningAStar:
+    """ Class representing a Lifelong Planning A* (LPA*) search. The first search works as A*, keeping a
+    g value (distance from the start) and an rhs value (best distance through a neighbour) per vertex.
+    After cells are opened or closed with MazeGraph.open_cell and close_cell, the ids they return are
+    passed to 'update_vertexes' and the next search only repairs the vertexes whose distances changed
+    and may affect the path, instead of searching from scratch.
+    """
+    INFINITE = 2 ** 31 - 1 # Distance of the vertexes not reached, the largest value an int array holds
+
+    def __init__(self, maze_graph, heuristic="euclidean", budget=None):
+        """ Class constructor
+
+            Args:
+                maze_graph: Object representing a maze board in graph format. Check implementation in "Maze.py"
+                heuristic (str or callable, optional): Heuristic name or function, see MazeGraph.get_heuristic_values.
+                    It must only depend on positions, so DISTANCE_FIELD_HEURISTIC is not accepted.
+                    Defaults to "euclidean".
+                budget (SearchBudget, optional): Limits of each search. A search stopped by the budget is
+                    resumed by the next 'do_search'. Defaults to None.
+        """
+        if heuristic == DISTANCE_FIELD_HEURISTIC:
+            raise ValueError("LPA* keys would go stale, as distance fields change with the board")
+        self.maze_graph = maze_graph
+        self.heuristic = heuristic
+        self.g = array('i', [self.INFINITE]) * maze_graph.get_id_space_size()
+        self.rhs = array('i', [self.INFINITE]) * maze_graph.get_id_space_size()
+        self.open = [] # Binary heap of (key, g key, vertex id) entries
+        self.open_key = {} # Key of the live heap entry of each inconsistent vertex id
+        self.expanded_count = 0 # Vertexes expanded by the last search
+        self.path = None
+        self.budget = budget
+        self.status = None # One of the STATUS_* values once searched
+        self.h = maze_graph.get_heuristic_values(maze_graph.target_id, heuristic)
+
+        self.rhs[maze_graph.root_id] = 0
+        self._update_open(maze_graph.root_id)
+
+    def do_search(self):
+        """ Runs LPA*, reusing the distances of the previous search
+
+            Returns:
+                list[tuple(int, int)]: Labels of the shortest path from the start to the exit, or None
+                    if the exit can not be reached. If the budget ran out, the path to the vertex closest
+                    to the exit whose distance is known, if one can be followed.
+        """
+        self.expanded_count = 0
+        # Component labels are recomputed after each edit, which would cost more than the repair itself
+        self.path = _run_within_budget(self, self._repair, self._get_partial_path, reject_unreachable=False)
+        return self.path
+
+    def _repair(self):
+        """ Private method that expands the inconsistent vertexes until the exit distance is known
+
+            Returns:
+                list[tuple(int, int)]: Labels of the shortest path, or None if the exit can not be reached
+        """
+        maze_graph = self.maze_graph
+        target_id = maze_graph.target_id
+        g = self.g
+        rhs = self.rhs
+        open_heap = self.open
+        open_key = self.open_key
+        budget = self.budget
+
+        while open_heap:
+            (key, g_key, vertex_id) = open_heap[0]
+            if open_key.get(vertex_id) != (key, g_key):
+                heapq.heappop(open_heap) # Stale entry of a vertex that became consistent or got a new key
+                continue
+            if (key, g_key) >= self._calculate_key(target_id) and rhs[target_id] == g[target_id]:
+                break
+            if budget is not None:
+                budget.charge()
+            heapq.heappop(open_heap)
+            del open_key[vertex_id]
+            self.expanded_count = self.expanded_count + 1
+
+            if g[vertex_id] > rhs[vertex_id]:
+                g[vertex_id] = rhs[vertex_id]
+            else:
+                g[vertex_id] = self.INFINITE
+                self._update_vertex(vertex_id)
+            for neighbor_id in maze_graph.get_vertex_adjacence_by_id(vertex_id):
+                self._update_vertex(neighbor_id)
+
+        return self._get_path()
+
+    def update_vertexes(self, vertex_ids):
+        """ Takes into account vertexes whose adjacences changed, as returned by MazeGraph.open_cell and
+        close_cell. The next 'do_search' repairs the path.
+
+            Args:
+                vertex_ids (list[int]): The changed vertexes ids
+        """
+        maze_graph = self.maze_graph
+        growth = maze_graph.get_id_space_size() - len(self.g)
+        if growth > 0:
+            self.g.extend(array('i', [self.INFINITE]) * growth)
+            self.rhs.extend(array('i', [self.INFINITE]) * growth)
+        # Values depend on positions only, but graphs indexing them by vertex id recompute them on changes
+        self.h = maze_graph.get_heuristic_values(maze_graph.target_id, self.heuristic)
+        for vertex_id in vertex_ids:
+            self._update_vertex(vertex_id)
+
+    def _update_vertex(self, vertex_id):
+        """ Private method that recomputes the rhs value of a vertex from its neighbours
+        """
+        if vertex_id != self.maze_graph.root_id:
+            g = self.g
+            best = self.INFINITE
+            for neighbor_id in self.maze_graph.get_vertex_adjacence_by_id(vertex_id):
+                if g[neighbor_id] < best:
+                    best = g[neighbor_id]
+            self.rhs[vertex_id] = best + 1 if best != self.INFINITE else self.INFINITE
+        self._update_open(vertex_id)
+
+    def _update_open(self, vertex_id):
+        """ Private method that keeps a vertex in the open heap if, and only if, it is inconsistent
+        """
+        if self.g[vertex_id] != self.rhs[vertex_id]:
+            key = self._calculate_key(vertex_id)
+            self.open_key[vertex_id] = key
+            heapq.heappush(self.open, key + (vertex_id,))
+        else:
+            self.open_key.pop(vertex_id, None)
+
+    def _calculate_key(self, vertex_id):
+        """ Private method that returns the open heap key of a vertex: f, then g to break ties
+        """
+        distance = min(self.g[vertex_id], self.rhs[vertex_id])
+        if distance == self.INFINITE:
+            return (self.INFINITE, self.INFINITE)
+        return (distance + self.h[vertex_id], distance)
+
+    def _get_path(self):
+        """ Private method that builds the path from the exit back to the start, moving each time to the
+            neighbour closest to the start
+
+            Returns:
+                list[tuple(int, int)]: Labels of the path from the start to the exit, or None if the
+                    exit was not reached
+        """
+        maze_graph = self.maze_graph
+        g = self.g
+        vertex_id = maze_graph.target_id
+        if g[vertex_id] == self.INFINITE:
+            return None
+        path = [maze_graph.get_vertex_label_by_id(vertex_id)]
+        while vertex_id != maze_graph.root_id:
+            vertex_id = min(maze_graph.get_vertex_adjacence_by_id(vertex_id), key=g.__getitem__)
+            path.append(maze_graph.get_vertex_label_by_id(vertex_id))
+        path.reverse()
+        return path
+
+    def _get_partial_path(self):
+        """ Private method that builds the result of a search stopped by its budget. Distances may be
+            halfway repaired, so the path is only followed while they strictly decrease.
+
+            Returns:
+                list[tuple(int, int)]: Labels of the path from the start, or None if there is none to follow
+        """
+        maze_graph = self.maze_graph
+        g = self.g
+        reached_ids = (vertex_id for vertex_id in range(len(g)) if g[vertex_id] != self.INFINITE)
+        vertex_id = min(reached_ids, key=self.h.__getitem__, default=None)
+        if vertex_id is None:
+            return None
+        path = [maze_graph.get_vertex_label_by_id(vertex_id)]
+        while vertex_id != maze_graph.root_id:
+            next_id = min(maze_graph.get_vertex_adjacence_by_id(vertex_id), key=g.__getitem__, default=None)
+            if next_id is None or g[next_id] >= g[vertex_id]:
+                return None
+            vertex_id = next_id
+            path.append(maze_graph.get_vertex_label_by_id(vertex_id))
+        path.reverse()
+        return path
@@ -0,0 +1,161 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from Search import *
+
+
+class ServiceBusyError(Exception):
+    """ Raised by MazeSolverService.solve when the request queue is full and the caller asked not to wait
+    """
+
+
+class MazeSolverService:
+    """ Class that serves (start, exit) queries over one shared maze graph from asyncio code. Requests wait
+    in a bounded queue, so callers are slowed down (or turned away) when the service falls behind, and a
+    fixed number of worker tasks run the searches on a thread pool, keeping the event loop free. The
+    graph is only read: each query runs on a MazeGraph.with_endpoints copy, and searchers keep their
+    state to themselves. Searches are pure Python, so threads overlap waiting, not computing. A request
+    with a timeout runs its search with a SearchBudget of the time it has left, so a request that times
+    out also frees its worker.
+
+    Usage:
+        async with MazeSolverService(maze_graph, AStarSearch, workers=4) as service:
+            path = await service.solve((1, 1), (20, 30), timeout=0.5)
+    """
+
+    def __init__(self, maze_graph, algorithm=AStarSearch, workers=4, queue_size=64, timeout=None):
+        """ Class constructor
+
+        Args:
+            maze_graph: The maze graph every query runs on
+            algorithm (type, optional): Searcher class returning paths. Defaults to AStarSearch.
+            workers (int, optional): Number of searches run at the same time. Defaults to 4.
+            queue_size (int, optional): Number of requests waiting for a worker before callers are held back.
+                Defaults to 64.
+            timeout (float, optional): Default seconds a request may take, waiting included. Defaults to None,
+                for no limit.
+        """
+        self.maze_graph = maze_graph
+        self.algorithm = algorithm
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.queue = None # Pending (start label, exit label, deadline, future) requests, created by 'start'
+        self.executor = None
+        self.worker_tasks = []
+        self.completed_count = 0
+        self.timed_out_count = 0
+        self.rejected_count = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    async def start(self):
+        """ Creates the request queue, the thread pool and the worker tasks, on the running event loop
+        """
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.worker_tasks = [asyncio.create_task(self._worker()) for worker in range(self.workers)]
+
+    async def stop(self):
+        """ Waits for the queued requests to be served, then stops the workers and the thread pool
+        """
+        await self.queue.join()
+        for task in self.worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        self.worker_tasks = []
+        self.executor.shutdown()
+
+    async def solve(self, start_label, target_label, timeout=None, wait=True):
+        """ Solves one query
+
+        Args:
+            start_label (tuple(int, int)): The starting position (row, column)
+            target_label (tuple(int, int)): The ending position (row, column)
+            timeout (float, optional): Seconds the request may take, waiting included. Defaults to the
+                service timeout.
+            wait (bool, optional): Wait for room in a full queue, instead of raising ServiceBusyError.
+                Defaults to True.
+
+        Returns:
+            list[tuple(int, int)]: The path returned by the searcher. Raises asyncio.TimeoutError when the
+                request takes too long, and KeyError if a position is not a free vertex.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        deadline = loop.time() + timeout if timeout is not None else None
+        request = (start_label, target_label, deadline, future)
+        if not wait:
+            try:
+                self.queue.put_nowait(request)
+            except asyncio.QueueFull:
+                self.rejected_count = self.rejected_count + 1
+                raise ServiceBusyError("{} requests are already waiting".format(self.queue_size))
+
+        try:
+            if wait:
+                return await asyncio.wait_for(self._enqueue_and_wait(request), timeout)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # The cancelled future tells the worker to skip the request, or to drop its result
+            self.timed_out_count = self.timed_out_count + 1
+            raise
+
+    async def _enqueue_and_wait(self, request):
+        """ Private method that waits for room in the queue, then for the request result
+        """
+        await self.queue.put(request)
+        return await request[3]
+
+    async def _worker(self):
+        """ Private method run by each worker task, serving queued requests one at a time
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            (start_label, target_label, deadline, future) = await self.queue.get()
+            try:
+                if future.done():
+                    continue # Timed out while queued
+                max_time = deadline - loop.time() if deadline is not None else None
+                try:
+                    (path, status) = await loop.run_in_executor(self.executor, self._search, start_label,
+                                                                target_label, max_time)
+                except Exception as error:
+                    if not future.done():
+                        future.set_exception(error)
+                else:
+                    if not future.done():
+                        if status == STATUS_BUDGET_EXHAUSTED:
+                            # The search ran out of time just before the request did: a partial path is no answer
+                            future.set_exception(asyncio.TimeoutError())
+                        else:
+                            future.set_result(path)
+                            self.completed_count = self.completed_count + 1
+            finally:
+                self.queue.task_done()
+
+    def _search(self, start_label, target_label, max_time=None):
+        """ Private method that runs one search, on a worker thread
+
+        Args:
+            start_label (tuple(int, int)): The starting position (row, column)
+            target_label (tuple(int, int)): The ending position (row, column)
+            max_time (float, optional): Seconds left to the request, given to the search as its budget.
+                Defaults to None, for no limit.
+
+        Returns:
+            tuple(list[tuple(int, int)], str): The path and the searcher status
+        """
+        maze_graph = self.maze_graph
+        query_graph = maze_graph.with_endpoints(maze_graph.get_vertex_id_by_label(start_label),
+                                                maze_graph.get_vertex_id_by_label(target_label))
+        budget = SearchBudget(max_time=max(max_time, 0)) if max_time is not None else None
+        searcher = self.algorithm(query_graph, budget=budget)
+        path = searcher.do_search()
+        return (path, searcher.status)
@@ -0,0 +1,70 @@
+import sys
+
+from Maze import *
+from Search import *
+
+
+# Searchers whose do_search returns the exploration trace, never a path from the start to the exit
+TRACE_ONLY_ALGORITHMS = (DepthFirstSearch,)
+
+
+def read_maze_graph(input_file="-", compact=False):
+    """ Reads one board into a maze graph
+
+        Args:
+            input_file (str or file, optional): The path to the input file, "-" for the standard input, or an
+                open text file. Defaults to "-".
+            compact (bool, optional): Build a CompactMazeGraph instead of a MazeGraph. Defaults to False.
+
+        Returns:
+            MazeGraph: The maze graph
+    """
+    reader = MazeReader()
+    if input_file == "-":
+        maze_board = reader.read_from_lines(sys.stdin)
+    elif isinstance(input_file, str):
+        maze_board = reader.read_from_file(input_file)
+    else:
+        maze_board = reader.read_from_lines(input_file)
+    graph_class = CompactMazeGraph if compact else MazeGraph
+    return graph_class(maze_board)
+
+
+def solve(maze_graph, algorithm=AStarSearch, start_label=None, target_label=None, **searcher_arguments):
+    """ Runs one search on a maze graph, once. Only the modules searching needs are loaded, so callers
+    solving a board per process start quickly. BreadthFirstSearch runs with 'shortest_path', so it
+    returns a path instead of its trace.
+
+        Args:
+            maze_graph: The maze graph, see 'read_maze_graph'
+            algorithm (type, optional): Searcher class returning a path, not one of TRACE_ONLY_ALGORITHMS.
+                Defaults to AStarSearch.
+            start_label (tuple(int, int), optional): Starting position (row, column). Defaults to the board start.
+            target_label (tuple(int, int), optional): Ending position (row, column). Defaults to the board exit.
+            **searcher_arguments: Passed on to the searcher, e.g. heuristic or budget
+
+        Returns:
+            tuple(list[tuple(int, int)], str): The path and the searcher status, one of the STATUS_* values.
+                Raises KeyError if a position is not free, and ValueError for a trace only searcher.
+    """
+    if algorithm in TRACE_ONLY_ALGORITHMS:
+        raise ValueError("{} returns its exploration trace, not a path".format(algorithm.__name__))
+    if algorithm is BreadthFirstSearch:
+        searcher_arguments['shortest_path'] = True
+    if start_label is not None or target_label is not None:
+        root_id = maze_graph.root_id if start_label is None else maze_graph.get_vertex_id_by_label(start_label)
+        target_id = maze_graph.target_id if target_label is None else maze_graph.get_vertex_id_by_label(target_label)
+        maze_graph = maze_graph.with_endpoints(root_id, target_id)
+    searcher = algorithm(maze_graph, **searcher_arguments)
+    path = searcher.do_search()
+    return (path, searcher.status)
+
+
+def write_path(path, output_file):
+    """ Writes a path as text, one 'row column' position per line
+
+        Args:
+            path (list[tuple(int, int)]): Labels of the path positions
+            output_file (file): The open text file
+    """
+    output_file.write("".join("{} {}\n".format(row, column) for (row, column) in path))
@@ -0,0 +1,60 @@
+import argparse
+import os
+import time
+
+from Maze import *
+from Search import AStarSearch, BidirectionalAStar, instrument_search
+
+
+def time_search(algorithm, maze_as_graph, repetitions, heuristic):
+    """ Returns the average seconds of a search
+    """
+    init = time.perf_counter()
+    for i in range(repetitions):
+        algorithm(maze_as_graph, heuristic=heuristic).do_search()
+    end = time.perf_counter()
+    return (end - init) / repetitions
+
+
+parser = argparse.ArgumentParser(description="Benchmark do A* bidirecional: vértices expandidos e tempo em relação ao A*")
+parser.add_argument('--repetitions', type=int, default=5, help="Número de buscas por arquivo e algoritmo")
+parser.add_argument('--heuristic', default='euclidean', choices=list(HEURISTICS), help="Heurística das duas buscas")
+parser.add_argument('--open', metavar='SIZE', type=int, default=300, help="Mede também um tabuleiro sem paredes de lado SIZE (0 para não medir)")
+parser.add_argument('--compact', action='store_true', help="Usa a representação compacta do grafo (CompactMazeGraph)")
+args = parser.parse_args()
+
+inputs_path = 'inputs'
+input_file_listage = sorted(os.path.join(inputs_path, name) for name in os.listdir(inputs_path))
+graph_class = CompactMazeGraph if args.compact else MazeGraph
+
+reader = MazeReader()
+boards = [(input_file, reader.read_from_file(input_file)) for input_file in input_file_listage]
+if args.open:
+    open_board = [['*'] * args.open for row in range(args.open)]
+    open_board[0][0] = '#'
+    open_board[-1][-1] = '$'
+    boards.append(("open {0}x{0}".format(args.open), open_board))
+
+for (name, maze_board) in boards:
+    maze_as_graph = graph_class(maze_board)
+    print("{} {}".format(name, (maze_as_graph.number_of_rows, maze_as_graph.number_of_columns)))
+    results = {}
+    for algorithm in (AStarSearch, BidirectionalAStar):
+        # The first search also fills the graph heuristic cache, so it is left out of the timing
+        (path, search_statistics) = instrument_search(algorithm, maze_as_graph, heuristic=args.heuristic)
+        avg_time = time_search(algorithm, maze_as_graph, args.repetitions, args.heuristic)
+        results[algorithm] = (search_statistics.expanded, avg_time, search_statistics.path_length)
+
+    # Both searches are optimal, so their paths must have the same length
+    if results[AStarSearch][2] != results[BidirectionalAStar][2]:
+        print("ERROR: bidirectional A* path differs from the A* path for {}".format(name))
+        exit(-1)
+    (expanded, avg_time) = results[AStarSearch][:2]
+    (bidirectional_expanded, bidirectional_avg_time) = results[BidirectionalAStar][:2]
+    if expanded is None:
+        print("    unreachable exit")
+        continue
+    print("    expanded A* {} BiAS {} (x{:.2f})".format(expanded, bidirectional_expanded,
+                                                        bidirectional_expanded / expanded if expanded else float('inf')))
+    print("    search A* {:.6f}s BiAS {:.6f}s (x{:.2f}, {} repetitions)".format(
+        avg_time, bidirectional_avg_time, bidirectional_avg_time / avg_time if avg_time > 0 else float('inf'), args.repetitions))
@@ -0,0 +1,48 @@
+import argparse
+import os
+import time
+
+from Maze import *
+
+
+class CellByCellMazeGraph(MazeGraph):
+    """ MazeGraph built by the reference cell by cell parser, used as the benchmark baseline.
+    """
+    _build_graph_from_text = MazeGraph._build_graph_from_text_cell_by_cell
+
+
+parser = argparse.ArgumentParser(description="Benchmark da construção do grafo a partir dos arquivos de entrada")
+parser.add_argument('--repetitions', type=int, default=20, help="Número de construções por arquivo e construtor")
+args = parser.parse_args()
+
+inputs_path = 'inputs'
+builders = {"cell_by_cell": CellByCellMazeGraph, "vectorized": MazeGraph, "compact": CompactMazeGraph}
+input_file_listage = sorted(os.path.join(inputs_path, name) for name in os.listdir(inputs_path))
+
+reader = MazeReader()
+
+for input_file in input_file_listage:
+    maze_as_lines = reader.read_from_file(input_file)
+    reference = None
+    times = {}
+    for builder_name, builder in builders.items():
+        init = time.perf_counter()
+        for i in range(args.repetitions):
+            maze_as_graph = builder(maze_as_lines)
+        end = time.perf_counter()
+        times[builder_name] = (end - init) / args.repetitions
+
+        # The vectorized builder must produce exactly the same graph as the reference one
+        if builder is CellByCellMazeGraph:
+            reference = [(vertex.get_label(), vertex.get_adjacence_list()) for vertex in maze_as_graph.vertexes_list]
+        elif builder is MazeGraph:
+            built = [(vertex.get_label(), vertex.get_adjacence_list()) for vertex in maze_as_graph.vertexes_list]
+            if built != reference:
+                print("ERROR: vectorized graph differs from the reference graph for {}".format(input_file))
+                exit(-1)
+
+    dim = (maze_as_graph.number_of_rows, maze_as_graph.number_of_columns)
+    print("{} {}".format(input_file, dim))
+    for builder_name, avg_time in times.items():
+        speedup = times["cell_by_cell"] / avg_time if avg_time > 0 else float('inf')
+        print("    {:<13} {:.6f}s (per build, {} repetitions) x{:.2f}".format(builder_name, avg_time, args.repetitions, speedup))
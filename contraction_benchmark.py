@@ -0,0 +1,59 @@
+import argparse
+import os
+import time
+
+from Maze import *
+from Search import AStarSearch, ContractedAStarSearch
+
+
+def time_search(algorithm, maze_as_graph, repetitions):
+    """ Returns the average seconds of a search and its path
+    """
+    init = time.perf_counter()
+    for i in range(repetitions):
+        path = algorithm(maze_as_graph).do_search()
+    end = time.perf_counter()
+    return ((end - init) / repetitions, path)
+
+
+parser = argparse.ArgumentParser(description="Benchmark da contração de corredores: redução de nós e ganho de tempo da busca")
+parser.add_argument('--repetitions', type=int, default=20, help="Número de construções e buscas por arquivo")
+parser.add_argument('--compact', action='store_true', help="Usa a representação compacta do grafo (CompactMazeGraph)")
+args = parser.parse_args()
+
+inputs_path = 'inputs'
+input_file_listage = sorted(os.path.join(inputs_path, name) for name in os.listdir(inputs_path))
+graph_class = CompactMazeGraph if args.compact else MazeGraph
+
+reader = MazeReader()
+
+for input_file in input_file_listage:
+    maze_as_graph = graph_class(reader.read_from_file(input_file))
+
+    init = time.perf_counter()
+    for i in range(args.repetitions):
+        contracted_graph = ContractedMazeGraph(maze_as_graph)
+    end = time.perf_counter()
+    contraction_time = (end - init) / args.repetitions
+    maze_as_graph.views["contracted"] = contracted_graph
+
+    # Heuristic values are cached by the graph, so they are computed before timing either search
+    maze_as_graph.get_heuristic_values()
+    (search_time, path) = time_search(AStarSearch, maze_as_graph, args.repetitions)
+    (contracted_search_time, contracted_path) = time_search(ContractedAStarSearch, maze_as_graph, args.repetitions)
+
+    # Both searches are optimal, so their paths must have the same length
+    if (path is None) != (contracted_path is None) or (path is not None and len(path) != len(contracted_path)):
+        print("ERROR: contracted search path differs from the A* path for {}".format(input_file))
+        exit(-1)
+
+    number_of_vertexes = maze_as_graph.get_number_of_vertexes()
+    number_of_nodes = contracted_graph.get_number_of_nodes()
+    dim = (maze_as_graph.number_of_rows, maze_as_graph.number_of_columns)
+    print("{} {}".format(input_file, dim))
+    print("    vertexes {} nodes {} corridors {} ({:.1f}% of the vertexes kept)".format(
+        number_of_vertexes, number_of_nodes, contracted_graph.get_number_of_corridors(),
+        100 * number_of_nodes / number_of_vertexes if number_of_vertexes > 0 else 0))
+    print("    contraction {:.6f}s (per build, {} repetitions)".format(contraction_time, args.repetitions))
+    speedup = search_time / contracted_search_time if contracted_search_time > 0 else float('inf')
+    print("    search A* {:.6f}s contracted {:.6f}s x{:.2f}".format(search_time, contracted_search_time, speedup))
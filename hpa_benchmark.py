@@ -0,0 +1,116 @@
+import argparse
+import os
+import random
+import time
+
+from Maze import *
+from Search import AStarSearch, HierarchicalAStarSearch
+from Generator import write_maze
+
+
+# Boards one cluster wide or one cluster tall, where the clusters of a column are numbered one after the
+# other: (rows, columns, cluster size)
+NARROW_BOARDS = [(60, 5, 16), (5, 60, 16), (41, 7, 3), (7, 41, 3), (10, 5, 3)]
+
+
+def compare_searches(maze_as_graph, cluster_size, number_of_queries, seed):
+    """ Runs random queries with A* and HPA*, checking that both reach the same exits
+
+        Returns:
+            tuple(float, float, list[float]): A* and HPA* seconds of all queries, and the HPA* path length
+                over the A* path length of each query solved. None if the searches disagree.
+    """
+    vertex_ids = list(maze_as_graph.get_vertex_ids())
+    generator = random.Random(seed)
+    queries = [maze_as_graph.with_endpoints(generator.choice(vertex_ids), generator.choice(vertex_ids))
+               for i in range(number_of_queries)]
+    search_time = 0
+    hierarchical_search_time = 0
+    path_ratios = []
+    for query_graph in queries:
+        # A* computes heuristic values for the whole board, HPA* only for the abstract nodes it reaches
+        init = time.perf_counter()
+        path = AStarSearch(query_graph).do_search()
+        end = time.perf_counter()
+        search_time = search_time + end - init
+
+        init = time.perf_counter()
+        hierarchical_path = HierarchicalAStarSearch(query_graph, cluster_size=cluster_size).do_search()
+        end = time.perf_counter()
+        hierarchical_search_time = hierarchical_search_time + end - init
+
+        if (path is None) != (hierarchical_path is None):
+            return None
+        if path is not None:
+            path_ratios.append(len(hierarchical_path) / len(path))
+    return (search_time, hierarchical_search_time, path_ratios)
+
+
+parser = argparse.ArgumentParser(description="Benchmark do HPA*: custo da abstração, tempo por consulta e qualidade dos caminhos em relação ao A*")
+parser.add_argument('--inputs', default='inputs', help="Pasta dos arquivos de entrada")
+parser.add_argument('--generate', metavar='SIZE', type=int, help="Mede também um tabuleiro gerado de lado SIZE (topologia rooms)")
+parser.add_argument('--cluster-size', type=int, default=16, help="Número de linhas e colunas de cada cluster")
+parser.add_argument('--queries', type=int, default=100, help="Número de consultas aleatórias por arquivo")
+parser.add_argument('--compact', action='store_true', help="Usa a representação compacta do grafo (CompactMazeGraph)")
+parser.add_argument('--seed', type=int, default=0, help="Semente das consultas aleatórias")
+args = parser.parse_args()
+
+input_file_listage = sorted(os.path.join(args.inputs, name) for name in os.listdir(args.inputs))
+if args.generate is not None:
+    generated_file = os.path.join('generated', 'rooms_{0}x{0}_{1}.txt'.format(args.generate, args.seed))
+    if not os.path.exists(generated_file):
+        os.makedirs('generated', exist_ok=True)
+        write_maze(generated_file, args.generate, args.generate, "rooms", args.seed)
+    input_file_listage.append(generated_file)
+graph_class = CompactMazeGraph if args.compact else MazeGraph
+
+reader = MazeReader()
+
+# Regression check: borders between clusters of a single column must get their entrances too
+os.makedirs('generated', exist_ok=True)
+for (number_of_rows, number_of_columns, cluster_size) in NARROW_BOARDS:
+    for topology in ("perfect", "rooms"):
+        narrow_file = os.path.join('generated', '{}_{}x{}_{}.txt'.format(topology, number_of_rows, number_of_columns, args.seed))
+        if not os.path.exists(narrow_file):
+            write_maze(narrow_file, number_of_rows, number_of_columns, topology, args.seed)
+        narrow_graph = graph_class(reader.read_from_file(narrow_file))
+        if compare_searches(narrow_graph, cluster_size, args.queries, args.seed) is None:
+            print("ERROR: HPA* and A* disagree on reaching the exit for {} (clusters of {})".format(narrow_file, cluster_size))
+            exit(-1)
+        # The abstraction built by the first query copy must be kept by the board graph, for every other query
+        if narrow_graph.views.get("hierarchical") is None:
+            print("ERROR: the queries on {} did not share the abstraction of its graph".format(narrow_file))
+            exit(-1)
+
+for input_file in input_file_listage:
+    maze_as_graph = graph_class(reader.read_from_file(input_file))
+    if maze_as_graph.get_number_of_vertexes() == 0:
+        continue
+
+    init = time.perf_counter()
+    hierarchical_graph = maze_as_graph.get_hierarchical_graph(args.cluster_size)
+    end = time.perf_counter()
+    abstraction_time = end - init
+
+    comparison = compare_searches(maze_as_graph, args.cluster_size, args.queries, args.seed)
+    if comparison is None:
+        print("ERROR: HPA* and A* disagree on reaching the exit for {}".format(input_file))
+        exit(-1)
+    (search_time, hierarchical_search_time, path_ratios) = comparison
+
+    number_of_vertexes = maze_as_graph.get_number_of_vertexes()
+    dim = (maze_as_graph.number_of_rows, maze_as_graph.number_of_columns)
+    print("{} {}".format(input_file, dim))
+    print("    vertexes {} abstract nodes {} ({} clusters of {}x{})".format(
+        number_of_vertexes, hierarchical_graph.get_number_of_nodes(), len(hierarchical_graph.cluster_nodes),
+        args.cluster_size, args.cluster_size))
+    print("    abstraction {:.6f}s".format(abstraction_time))
+    speedup = search_time / hierarchical_search_time if hierarchical_search_time > 0 else float('inf')
+    print("    query A* {:.6f}s HPA* {:.6f}s x{:.2f} ({} queries)".format(
+        search_time / args.queries, hierarchical_search_time / args.queries, speedup, args.queries))
+    # HPA* paths only cross cluster borders at entrances, so they may be longer than the A* ones
+    if path_ratios:
+        suboptimal = sum(1 for ratio in path_ratios if ratio > 1)
+        print("    suboptimality (HPA* / A* path length): mean {:.4f} max {:.4f}, {} of {} paths longer ({:.1f}%)".format(
+            sum(path_ratios) / len(path_ratios), max(path_ratios), suboptimal, len(path_ratios),
+            100 * suboptimal / len(path_ratios)))
@@ -1,60 +1,188 @@
 import argparse
-import time
+import glob
 import os
+import sys
+import time
 
 from Search import *
 from Maze import *
+# Benchmark (multiprocessing), Generator and Render are imported where they are used, so 'solve' starts quickly
 
-parser = argparse.ArgumentParser(description="Benchmarking e execução de algoritmos de busca em labirintos")
-parser.add_argument('--visualize', action='store_true', help="Executa visualização dos algoritmos de busca")
-args = parser.parse_args()
 
-
-inputs_path = 'inputs'
-algs = {"BFS": BreadthFirstSearch, "DFS": DepthFirstSearch, "AS": AStarSearch, "BestFS": BestFirstSearch}
+algs = {"BFS": BreadthFirstSearch, "DFS": DepthFirstSearch, "AS": AStarSearch, "BestFS": BestFirstSearch,
+        "BiBFS": BidirectionalBFS, "BiAS": BidirectionalAStar, "JPS": JumpPointSearch, "CAS": ContractedAStarSearch,
+        "Dijkstra": DijkstraSearch, "HPA": HierarchicalAStarSearch}
 # algs = {"BFS": BreadthFirstSearch, "DFS": DepthFirstSearch}
 
-input_file_listage = [os.path.join(inputs_path, name) for name in os.listdir(inputs_path)]
-
-reader = MazeReader()
-
-num_repetitions = 1000
-time_results = {alg_type: [] for alg_type in algs.keys()}
-maze_results = {alg_type: [] for alg_type in algs.keys()}
-
-
-for alg_type in algs.keys():
-    for input_file in input_file_listage:
-        maze_as_lines = reader.read_from_file(input_file)
-        maze_as_graph = MazeGraph(maze_as_lines)
-        
-        init = time.time()
-        for i in range(num_repetitions):
-            searcher = algs[alg_type](maze_as_graph)
-            path = searcher.do_search()
-            del searcher
-        end = time.time()
-
-        avg_time = (end - init) / num_repetitions
-        result_obj = {"dim": (maze_as_graph.number_of_rows, maze_as_graph.number_of_columns), "avg_time": avg_time}
-        time_results[alg_type].append(result_obj)
-
-        maze_as_graph.add_solution(path)
-        maze_solution_obj = {"dim": (maze_as_graph.number_of_rows, maze_as_graph.number_of_columns), "maze": maze_as_graph}
-        maze_results[alg_type].append(maze_solution_obj)
-
-for alg in time_results:
-    time_results[alg] = sorted(time_results[alg], key=lambda x : x['avg_time'])
-    print(alg)
-    for result in time_results[alg]:
-        print("{} (per execution, {} repetitions)".format(result, num_repetitions))
-
-
-if args.visualize:
-    for alg in maze_results:
-        maze_results[alg] = sorted(maze_results[alg], key=lambda x: x['dim'][1])
-        print("VISUALIZING SEARCH FOR {} ALGORITHM".format(alg))
-        time.sleep(3)
-        for result in maze_results[alg]:
-            if result['dim'][0] <= 80 and result['dim'][1] <= 80:
-                result['maze'].print_maze()
\ No newline at end of file
+
+def parse_label(text):
+    """ Parses a 'row,column' command line position
+    """
+    try:
+        (row, column) = (int(value) for value in text.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected 'row,column', not {!r}".format(text))
+    return (row, column)
+
+
+def run_solve(argv):
+    """ Runs the 'solve' command: reads one board, runs one algorithm once and prints or writes the path
+
+        Returns:
+            int: The exit status, 1 if the exit could not be reached
+    """
+    from Solver import TRACE_ONLY_ALGORITHMS, read_maze_graph, solve, write_path
+
+    parser = argparse.ArgumentParser(prog="main.py solve", description="Resolve um único labirinto com um algoritmo e imprime o caminho, uma posição 'linha coluna' por linha")
+    parser.add_argument('input', nargs='?', default='-', help="Arquivo de entrada do labirinto, ou - para a entrada padrão (padrão: -)")
+    path_algs = [alg_type for alg_type in algs if algs[alg_type] not in TRACE_ONLY_ALGORITHMS]
+    parser.add_argument('--algorithm', default='AS', choices=path_algs, help="Algoritmo de busca (padrão: AS; DFS não é aceito, pois retorna a ordem de visita, não um caminho)")
+    parser.add_argument('--compact', action='store_true', help="Usa a representação compacta do grafo (CompactMazeGraph)")
+    parser.add_argument('--start', type=parse_label, metavar='ROW,COL', help="Posição inicial, no lugar do '#' do tabuleiro")
+    parser.add_argument('--exit', type=parse_label, metavar='ROW,COL', help="Posição final, no lugar do '$' do tabuleiro")
+    parser.add_argument('--output', metavar='FILE', help="Salva o caminho em FILE: imagem se terminar em .png, .ppm ou .ans, senão texto (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    maze_as_graph = read_maze_graph(args.input, args.compact)
+    try:
+        (path, status) = solve(maze_as_graph, algs[args.algorithm], args.start, args.exit)
+    except KeyError as error:
+        print("Position {} is not a free position of the board".format(error.args[0]), file=sys.stderr)
+        return 2
+    if status != STATUS_FOUND:
+        print("The exit can not be reached", file=sys.stderr)
+        return 1
+
+    if args.output is None:
+        write_path(path, sys.stdout)
+    elif args.output.endswith(('.png', '.ppm', '.ans')):
+        from Render import export_solution
+        export_solution(maze_as_graph, args.output, path)
+    else:
+        with open(args.output, 'w') as output_file:
+            write_path(path, output_file)
+    return 0
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['solve']:
+        exit(run_solve(sys.argv[2:]))
+
+    from Benchmark import BenchmarkRunner, BenchmarkSettings, GraphLoader, compare_results, read_results, summarize_sweep, write_results, write_sweep_plot
+    from Generator import TOPOLOGIES, write_maze
+
+    parser = argparse.ArgumentParser(description="Benchmarking e execução de algoritmos de busca em labirintos")
+    parser.add_argument('--visualize', action='store_true', help="Executa visualização dos algoritmos de busca")
+    parser.add_argument('--fps', type=int, default=30, help="Quadros por segundo da visualização")
+    parser.add_argument('--render', metavar='DIR', help="Salva em DIR uma imagem PNG do caminho de cada algoritmo em cada entrada, sem terminal")
+    parser.add_argument('--compact', action='store_true', help="Usa a representação compacta do grafo (CompactMazeGraph)")
+    parser.add_argument('--mmap', action='store_true', help="Lê as entradas mapeando os arquivos em memória (MazeReader.map_file)")
+    parser.add_argument('--graph-cache', metavar='DIR', help="Salva o grafo de cada entrada em DIR na primeira execução e o recarrega nas seguintes")
+    parser.add_argument('--workers', type=int, help="Número de processos do benchmark, cada um fixo em um núcleo (padrão: todos os núcleos disponíveis)")
+    parser.add_argument('--algorithms', default=','.join(algs), help="Algoritmos a executar, separados por vírgula (padrão: todos)")
+    parser.add_argument('--inputs', default='inputs/*', help="Padrão glob dos arquivos de entrada (padrão: inputs/*)")
+    parser.add_argument('--repetitions', type=int, help="Número fixo de execuções medidas de cada algoritmo por entrada (padrão: adaptativo)")
+    parser.add_argument('--warmup', type=int, default=3, help="Execuções de aquecimento, não medidas, antes de cada medição")
+    parser.add_argument('--max-time', type=float, default=1.0, help="Tempo máximo, em segundos, da medição adaptativa de cada algoritmo por entrada")
+    parser.add_argument('--output', metavar='FILE', help="Salva os resultados em FILE (JSON, ou CSV se terminar em .csv)")
+    parser.add_argument('--compare', metavar='BASELINE', help="Compara os resultados com um arquivo JSON salvo por --output")
+    parser.add_argument('--statistics', action='store_true', help="Conta nós expandidos, gerados, duplicados e tamanhos máximos das listas em uma busca extra, não medida")
+    parser.add_argument('--trace-memory', action='store_true', help="Mede também o pico de memória (tracemalloc) da construção e da busca instrumentadas")
+    parser.add_argument('--sweep', metavar='SIZES', help="Mede tabuleiros quadrados gerados com os lados dados, separados por vírgula (ex.: 500,1000,2000), em vez das entradas")
+    parser.add_argument('--topology', default='perfect', choices=list(TOPOLOGIES), help="Topologia dos tabuleiros gerados por --sweep")
+    parser.add_argument('--seed', type=int, default=0, help="Semente dos tabuleiros gerados por --sweep")
+    parser.add_argument('--max-cost', type=int, default=1, help="Custo máximo do terreno dos tabuleiros gerados por --sweep (1 a 9, padrão: sem pesos)")
+    parser.add_argument('--sweep-dir', default='generated', metavar='DIR', help="Pasta dos tabuleiros gerados por --sweep, reaproveitados nas execuções seguintes")
+    parser.add_argument('--plot', metavar='FILE', help="Salva em FILE (SVG) o tempo e a memória da busca em função do número de células de --sweep")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Aumento relativo da mediana considerado regressão em --compare")
+    args = parser.parse_args()
+
+    selected_algs = {}
+    for alg_type in args.algorithms.split(','):
+        if alg_type not in algs:
+            print("Unknown algorithm {}. Available: {}".format(alg_type, ', '.join(algs)))
+            exit(-1)
+        selected_algs[alg_type] = algs[alg_type]
+
+    if args.sweep:
+        os.makedirs(args.sweep_dir, exist_ok=True)
+        input_file_listage = []
+        for size in (int(size) for size in args.sweep.split(',')):
+            input_file = os.path.join(args.sweep_dir, "{}_{}x{}_{}_{}.txt".format(args.topology, size, size, args.seed, args.max_cost))
+            if not os.path.exists(input_file):
+                write_maze(input_file, size, size, args.topology, args.seed, args.max_cost)
+            input_file_listage.append(input_file)
+    else:
+        input_file_listage = sorted(glob.glob(args.inputs))
+    if not input_file_listage:
+        print("No input file matches {}".format(args.inputs))
+        exit(-1)
+
+    graph_loader = GraphLoader(CompactMazeGraph if args.compact else MazeGraph, args.mmap, args.graph_cache)
+    settings = BenchmarkSettings(warmup=args.warmup, repetitions=args.repetitions, max_time=args.max_time,
+                                 statistics=args.statistics, trace_memory=args.trace_memory or bool(args.sweep))
+    runner = BenchmarkRunner(selected_algs, input_file_listage, graph_loader, settings, args.workers)
+    results = runner.run()
+
+    time_results = {alg_type: [] for alg_type in selected_algs.keys()}
+    maze_results = {alg_type: [] for alg_type in selected_algs.keys()}
+
+    for result in results:
+        result_obj = {"dim": result["dim"], "avg_time": result["avg_time"], "repetitions": result["repetitions"],
+                      "search": result["phases"]["search"], "statistics": result.get("statistics")}
+        time_results[result["alg"]].append(result_obj)
+        maze_solution_obj = {"dim": result["dim"], "input": result["input"], "path": result["path"]}
+        maze_results[result["alg"]].append(maze_solution_obj)
+
+    for alg in time_results:
+        time_results[alg] = sorted(time_results[alg], key=lambda x : x['avg_time'])
+        print(alg)
+        for result in time_results[alg]:
+            search = result["search"]
+            print("{} avg_time {:.9f}s (per execution, {} repetitions) search median {:.0f}ns p95 {:.0f}ns p99 {:.0f}ns stddev {:.0f}ns".format(
+                result["dim"], result["avg_time"], result["repetitions"], search["median"], search["p95"], search["p99"], search["stddev"]))
+            if result["statistics"] is not None:
+                print("    " + " ".join("{} {}".format(name, value) for name, value in result["statistics"].items() if value is not None))
+
+    if args.sweep:
+        print("SWEEP {} (seed {}, max cost {})".format(args.topology, args.seed, args.max_cost))
+        for (alg, points) in summarize_sweep(results).items():
+            for (number_of_cells, search_median, memory_peak) in points:
+                print("{:<8} {:>12} cells search median {:>14.0f}ns memory peak {}".format(
+                    alg, number_of_cells, search_median, "{}B".format(memory_peak) if memory_peak is not None else "-"))
+        if args.plot:
+            write_sweep_plot(results, args.plot)
+
+    if args.output:
+        write_results(results, args.output)
+
+    if args.compare:
+        comparison = compare_results(results, read_results(args.compare), args.threshold)
+        print("COMPARISON AGAINST {}".format(args.compare))
+        for entry in comparison:
+            print("{:<8} {:<28} {:<10} {:>14.0f}ns -> {:>14.0f}ns x{:.2f}{}".format(
+                entry["alg"], entry["input"], entry["phase"], entry["baseline_median"], entry["median"], entry["ratio"],
+                " REGRESSION" if entry["regression"] else ""))
+        if any(entry["regression"] for entry in comparison):
+            exit(1)
+
+
+    if args.render:
+        from Render import export_solution
+        os.makedirs(args.render, exist_ok=True)
+        for alg in maze_results:
+            for result in maze_results[alg]:
+                name = os.path.splitext(os.path.basename(result['input']))[0]
+                export_solution(graph_loader.load(result['input']), os.path.join(args.render, "{}_{}.png".format(name, alg)),
+                                result['path'], scale=4)
+
+    if args.visualize:
+        for alg in maze_results:
+            maze_results[alg] = sorted(maze_results[alg], key=lambda x: x['dim'][1])
+            print("VISUALIZING SEARCH FOR {} ALGORITHM".format(alg))
+            time.sleep(3)
+            for result in maze_results[alg]:
+                # Boards larger than the terminal are scrolled with the arrow keys
+                maze_as_graph = graph_loader.load(result['input'])
+                maze_as_graph.add_solution(result['path'])
+                maze_as_graph.print_maze(args.fps)
@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import random
+import time
+
+from Benchmark import summarize_samples
+from Maze import *
+from Service import MazeSolverService, ServiceBusyError
+from main import algs
+
+
+async def run_client(service, queries, latencies, failures):
+    """ Sends queries one after the other, as one user of the service would
+    """
+    for (start_label, target_label) in queries:
+        start = time.perf_counter_ns()
+        try:
+            await service.solve(start_label, target_label, wait=not args.no_wait)
+            latencies.append(time.perf_counter_ns() - start)
+        except (asyncio.TimeoutError, ServiceBusyError) as error:
+            failures[type(error).__name__] = failures.get(type(error).__name__, 0) + 1
+
+
+async def run_load(maze_as_graph, queries):
+    latencies = []
+    failures = {}
+    async with MazeSolverService(maze_as_graph, algs[args.algorithm], args.workers, args.queue_size, args.timeout) as service:
+        init = time.perf_counter()
+        clients = [run_client(service, queries[client::args.clients], latencies, failures) for client in range(args.clients)]
+        await asyncio.gather(*clients)
+        end = time.perf_counter()
+    return (latencies, failures, end - init)
+
+
+parser = argparse.ArgumentParser(description="Gerador de carga do serviço de consultas: vazão e latência de cauda")
+parser.add_argument('--input', default='inputs/entrada_6.txt', help="Arquivo de entrada do labirinto")
+parser.add_argument('--algorithm', default='AS', choices=list(algs), help="Algoritmo usado pelo serviço")
+parser.add_argument('--compact', action='store_true', help="Usa a representação compacta do grafo (CompactMazeGraph)")
+parser.add_argument('--requests', type=int, default=500, help="Número total de consultas")
+parser.add_argument('--clients', type=int, default=16, help="Número de clientes enviando consultas ao mesmo tempo")
+parser.add_argument('--workers', type=int, default=4, help="Número de buscas executadas ao mesmo tempo pelo serviço")
+parser.add_argument('--queue-size', type=int, default=64, help="Tamanho da fila de consultas do serviço")
+parser.add_argument('--timeout', type=float, help="Tempo máximo, em segundos, de cada consulta")
+parser.add_argument('--no-wait', action='store_true', help="Rejeita consultas com a fila cheia em vez de esperar")
+parser.add_argument('--seed', type=int, default=0, help="Semente das consultas aleatórias")
+args = parser.parse_args()
+
+graph_class = CompactMazeGraph if args.compact else MazeGraph
+maze_as_graph = graph_class(MazeReader().read_from_file(args.input))
+
+# Queries between random free positions, the same ones for a given seed
+vertex_labels = [maze_as_graph.get_vertex_label_by_id(vertex_id) for vertex_id in maze_as_graph.get_vertex_ids()]
+generator = random.Random(args.seed)
+queries = [(generator.choice(vertex_labels), generator.choice(vertex_labels)) for i in range(args.requests)]
+
+(latencies, failures, elapsed) = asyncio.run(run_load(maze_as_graph, queries))
+latency = summarize_samples(latencies)
+print("{} {} {} requests, {} clients, {} workers, queue {}".format(
+    args.input, args.algorithm, args.requests, args.clients, args.workers, args.queue_size))
+print("    throughput {:.1f} requests/s ({} served in {:.3f}s)".format(len(latencies) / elapsed, len(latencies), elapsed))
+if latencies:
+    print("    latency median {:.0f}ns p95 {:.0f}ns p99 {:.0f}ns max {:.0f}ns".format(
+        latency["median"], latency["p95"], latency["p99"], max(latencies)))
+for (name, count) in failures.items():
+    print("    {} {}".format(name, count))
@@ -0,0 +1,81 @@
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+# Modules the 'solve' command must not load: they only serve the benchmark, images or the terminal viewer
+HEAVY_MODULES = ["curses", "numpy", "multiprocessing", "concurrent.futures", "tracemalloc", "Benchmark", "Generator", "Render"]
+
+
+def time_command(command, repetitions, env=None):
+    """ Returns the median seconds of a command run in a new process
+    """
+    samples = []
+    for i in range(repetitions):
+        init = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, env=env)
+        end = time.perf_counter()
+        samples.append(end - init)
+    return statistics.median(samples)
+
+
+def import_times(module_names):
+    """ Returns the cumulative import microseconds of each module imported by a new process, as
+    reported by 'python -X importtime'
+    """
+    script = "; ".join("import {}".format(name) for name in module_names)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], check=True, capture_output=True, text=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        (self_time, cumulative, name) = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+parser = argparse.ArgumentParser(description="Benchmark do tempo de inicialização do comando solve e verificação dos módulos carregados")
+parser.add_argument('--input', default='inputs/entrada_1.txt', help="Arquivo de entrada resolvido a cada execução")
+parser.add_argument('--repetitions', type=int, default=20, help="Número de processos medidos por comando")
+parser.add_argument('--max-overhead', type=float, metavar='SECONDS', help="Falha se o solve levar mais que SECONDS além do interpretador vazio")
+args = parser.parse_args()
+
+# Modules loaded by a 'solve' run, listed by the process itself before it exits
+check = ("import sys; sys.argv = ['main.py', 'solve', {!r}]; import runpy, atexit; "
+         "atexit.register(lambda: print(' '.join(sorted(sys.modules)), file=sys.stderr)); "
+         "runpy.run_path('main.py', run_name='__main__')").format(args.input)
+result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True)
+loaded_modules = set(result.stderr.split())
+heavy_loaded = [name for name in HEAVY_MODULES if name in loaded_modules]
+if heavy_loaded:
+    print("ERROR: solve loads {}".format(", ".join(heavy_loaded)))
+    exit(-1)
+
+# Installed modules run from their bytecode cache, so it is written first. The uncached runs point the cache
+# to an empty folder and do not write it, so every process compiles the modules again
+compileall.compile_dir('.', maxlevels=0, quiet=1)
+with tempfile.TemporaryDirectory() as empty_cache:
+    uncached_env = dict(os.environ, PYTHONPYCACHEPREFIX=empty_cache, PYTHONDONTWRITEBYTECODE="1")
+    uncached_solve_time = time_command([sys.executable, "main.py", "solve", args.input], args.repetitions, uncached_env)
+interpreter_time = time_command([sys.executable, "-c", "pass"], args.repetitions)
+solve_time = time_command([sys.executable, "main.py", "solve", args.input], args.repetitions)
+benchmark_import_time = time_command([sys.executable, "-c", "import Benchmark, Generator, Render"], args.repetitions)
+
+print("{} ({} processes per command)".format(args.input, args.repetitions))
+print("    interpreter {:.6f}s solve {:.6f}s (overhead {:.6f}s)".format(interpreter_time, solve_time, solve_time - interpreter_time))
+print("    solve without bytecode cache {:.6f}s (overhead {:.6f}s)".format(uncached_solve_time, uncached_solve_time - interpreter_time))
+print("    interpreter with the benchmark modules {:.6f}s".format(benchmark_import_time))
+print("    modules loaded by solve: {}".format(len(loaded_modules)))
+times = import_times(["Maze", "Search", "Solver"])
+for name in ("Maze", "Search", "Solver", "re", "tracemalloc"):
+    if name in times:
+        print("    import {:<12} {:>8}us".format(name, times[name]))
+
+if args.max_overhead is not None and solve_time - interpreter_time > args.max_overhead:
+    print("ERROR: solve overhead {:.6f}s is above {:.6f}s".format(solve_time - interpreter_time, args.max_overhead))
+    exit(1)
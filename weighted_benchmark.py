@@ -0,0 +1,55 @@
+import argparse
+import os
+import time
+
+from Generator import add_terrain
+from Maze import *
+from Search import AStarSearch, DijkstraSearch, instrument_search
+
+
+def time_search(algorithm, maze_as_graph, repetitions):
+    """ Returns the average seconds of a search
+    """
+    init = time.perf_counter()
+    for i in range(repetitions):
+        algorithm(maze_as_graph).do_search()
+    end = time.perf_counter()
+    return (end - init) / repetitions
+
+
+parser = argparse.ArgumentParser(description="Benchmark de Dijkstra e A* nas versões com pesos das entradas")
+parser.add_argument('--repetitions', type=int, default=20, help="Número de buscas por arquivo e algoritmo")
+parser.add_argument('--max-cost', type=int, default=9, help="Custo máximo do terreno (2 a 9)")
+parser.add_argument('--seed', type=int, default=0, help="Semente dos custos aleatórios")
+parser.add_argument('--compact', action='store_true', help="Usa a representação compacta do grafo (CompactMazeGraph)")
+args = parser.parse_args()
+
+inputs_path = 'inputs'
+input_file_listage = sorted(os.path.join(inputs_path, name) for name in os.listdir(inputs_path))
+graph_class = CompactMazeGraph if args.compact else MazeGraph
+algorithms = {"AS": AStarSearch, "Dijkstra": DijkstraSearch}
+
+reader = MazeReader()
+
+for input_file in input_file_listage:
+    maze_as_lines = reader.read_from_file(input_file)
+    rows = (''.join(line_content).encode('latin-1') for line_content in maze_as_lines)
+    weighted_lines = [list(row.decode('latin-1')) for row in add_terrain(rows, args.max_cost, args.seed)]
+    graphs = {"unweighted": graph_class(maze_as_lines), "weighted": graph_class(weighted_lines)}
+
+    print("{} {}".format(input_file, (graphs["weighted"].number_of_rows, graphs["weighted"].number_of_columns)))
+    for (board, maze_as_graph) in graphs.items():
+        costs = {}
+        for (alg_type, algorithm) in algorithms.items():
+            # The first search also fills the graph heuristic cache, so it is left out of the timing
+            (path, search_statistics) = instrument_search(algorithm, maze_as_graph)
+            avg_time = time_search(algorithm, maze_as_graph, args.repetitions)
+            costs[alg_type] = search_statistics.path_cost
+            print("    {:<10} {:<8} {:.6f}s (per search, {} repetitions) expanded {} path length {} cost {}".format(
+                board, alg_type, avg_time, args.repetitions, search_statistics.expanded,
+                search_statistics.path_length, search_statistics.path_cost))
+
+        # Both searches are optimal, so their paths must cost the same
+        if len(set(costs.values())) != 1:
+            print("ERROR: A* and Dijkstra path costs differ for the {} board of {}".format(board, input_file))
+            exit(-1)